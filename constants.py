@@ -1,10 +1,6 @@
 # constants.py
-import pygame
-import pygame.font # Import the font module
-
-# --- Initialize Pygame Modules ---
-pygame.init() # Initialize all pygame modules
-pygame.font.init() # Initialize the font module specifically
+# Plain values only: importing this module must not start pygame or load files, so the
+# game logic can run headless (see engine.py). pygame is initialised by "MAIN - RUN ME.py".
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 MIN_WIDTH = 800  # Minimum dimensions if resizing
@@ -25,23 +21,30 @@ INITIAL_SCREEN_WIDTH = 800
 INITIAL_SCREEN_HEIGHT = 600
 FPS_LIMIT = 45 # Define FPS limit as a constant
 DEFAULT_MINING_TIME = 5.0 # Default time in seconds if specific speed is missing
+MAX_PARALLEL_MINING_JOBS = 3 # Mining jobs that run at the same time
+MAX_WAITING_MINING_JOBS = 10 # Extra mining jobs that can wait for a free slot
+MAX_MINING_QUANTITY = 999999 # Largest amount one mining job can ask for (limits the input to 6 digits)
 CURSOR_BLINK_RATE = 500 # Milliseconds for cursor blink cycle (on/off)
+UNDO_HISTORY_LIMIT = 100 # Max inventory/crafting actions kept for undo (Ctrl+Z) / redo (Ctrl+Y)
+MAX_SEARCH_LENGTH = 32 # Max characters in the item search box
 MAX_SAVE_SLOTS = 5 # Define the number of save slots
 PADDING = 20 
+INVENTORY_SORT_KEY = "name" # Default order for the inventory "Sort" button: "id", "name" or "count"
+USE_COMPACT_INVENTORY = False # Use the array-backed inventory (see inventory_store.py) for very large inventories
+STORAGE_CONTAINER_COUNT = 3 # Storage chests per world
+STORAGE_CONTAINER_SLOTS = 2700 # Slots per chest
+STORAGE_PAGE_SLOTS = 27 # Slots shown (and saved) per page: 3 rows of 9, so 100 pages per chest
+RESOURCE_MAP_CHUNKS = 8 # Chunks per side of a world's resource map (see resource_map.py)
+RESOURCE_CHUNK_SIZE = 64 # Cells per side of a chunk
+RESOURCE_MEAN_PER_CELL = 4 # Average blocks per cell, so about 1 million of each block per world
+RESOURCE_MAX_OPEN_CHUNKS = 32 # Unchanged chunks kept in memory before the least recently used are dropped
 
 # --- Font ---
 # Define the path to the font file relative to this constants.py file
 # Using the static regular version for broad compatibility
 FONT_PATH = 'Font/static/OpenSans-Regular.ttf'
 DEFAULT_FONT_SIZE = 24 # A standard size for UI elements
-
-# Load the default font object - you can create others with different sizes as needed
-try:
-    DEFAULT_FONT = pygame.font.Font(FONT_PATH, DEFAULT_FONT_SIZE)
-except pygame.error as e:
-    print(f"Error loading font '{FONT_PATH}': {e}")
-    # Fallback to default pygame font if custom font fails
-    DEFAULT_FONT = pygame.font.Font(None, DEFAULT_FONT_SIZE)
+# The default font object itself is loaded on first use by ui_manager.fonts.get_default_font()
 
 
 # --- Game States ---
@@ -49,14 +52,25 @@ SELECT_WORLD = 'select_world' # New screen state
 MAIN_MENU = 'main_menu'
 MINING_MENU = 'mining_menu'
 ASK_QUANTITY = 'ask_quantity'
-MINING_INPROGRESS = 'mining_inprogress'
+MINING_INPROGRESS = 'mining_inprogress' # Mining jobs overview (progress of every running/waiting job)
 INVENTORY_SCREEN = 'inventory_screen'
 CRAFTING_SCREEN = 'crafting_screen'
+STORAGE_SCREEN = 'storage_screen'
 ERROR_STATE = 'error_state'
+SEARCHABLE_SCREENS = (INVENTORY_SCREEN, MINING_MENU) # Screens with a type-to-filter item search box
+SLOT_SCREENS = (CRAFTING_SCREEN, INVENTORY_SCREEN, STORAGE_SCREEN) # Screens where item slots can be clicked / items held
 # SELECT_WORLD = 'select_world' # Duplicate removed
 
 # --- Asset Paths ---
 TEXTURES_DIR = "textures"
+ITEM_CATALOG_DIR = "catalogs" # Extra items as .jsonl/.csv files (see item_catalog.py)
+MAX_REPORTED_CATALOG_ERRORS = 50 # Bad catalog records listed by name; the rest are only counted
+HOT_RELOAD_DATA = False # Development: apply changes to the item data files while running (see hot_reload.py)
+HOT_RELOAD_INTERVAL = 1.0 # Seconds between checks of the item data files
+
+# --- Logging (see game_log.py) ---
+LOG_LEVEL = "INFO" # DEBUG shows every click/mining job/texture, OFF is silent; BUTTONS_LOG_LEVEL overrides it
+LOG_ASYNC = True # Write log messages on a background thread (the game loop never waits for the terminal)
 
 # --- UI Constants ---
 ITEM_TEXTURE_SIZE = (48,48) # Size for loading/scaling textures initially
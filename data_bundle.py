@@ -0,0 +1,126 @@
+# data_bundle.py
+# Compiled data bundle: every table data_loader.load_mining_data() derives from
+# mine_speeds.py, tool_stats.py and the item catalogs (name/ID maps, item_data, mine_list,
+# the mining time matrix, the item registry and the search index), stored in one binary file.
+#
+# The bundle is keyed by a SHA-256 hash of the source files, so it is rebuilt automatically
+# whenever the item data (or the code that derives the tables) changes. When nothing has
+# changed, startup is a single file read and unpickle instead of rebuilding every table.
+#
+# File layout: MAGIC (8 bytes) | format version (4 bytes, little endian) | source hash
+# (32 bytes) | pickle of the tables. The bundle is a local cache written by the game itself;
+# deleting it is always safe.
+#
+# Run "python data_bundle.py" to compile the bundle ahead of time (e.g. after editing
+# mine_speeds.py); otherwise the first launch after a change writes it.
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import sys
+import constants
+import item_catalog
+import game_log
+
+BUNDLE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_FILENAME = "data_bundle.bin"
+BUNDLE_MAGIC = b"MCBUNDLE"
+BUNDLE_FORMAT_VERSION = 1 # Bump when the tables stored in the bundle change shape
+_HEADER = struct.Struct("<8sI32s")
+
+logger = logging.getLogger(__name__)
+
+# Files the bundled tables are derived from; a change to any of them invalidates the bundle
+# (plus every catalog file in constants.ITEM_CATALOG_DIR)
+SOURCE_FILES = ["mine_speeds.py", "tool_stats.py", "data_loader.py", "item_registry.py", "item_search.py", "item_catalog.py"]
+
+
+def bundle_path() -> str:
+    return os.path.join(BUNDLE_DIR, BUNDLE_FILENAME)
+
+
+def source_hash() -> bytes:
+    """SHA-256 over the source files and the settings that change the derived tables."""
+    digest = hashlib.sha256()
+    digest.update(struct.pack("<I", BUNDLE_FORMAT_VERSION))
+    # The matrix is a NumPy array or a list depending on whether NumPy is installed
+    digest.update(repr((constants.DEFAULT_MINING_TIME, _numpy_available())).encode("utf-8"))
+    paths = [os.path.join(BUNDLE_DIR, filename) for filename in SOURCE_FILES] + item_catalog.catalog_paths()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        try:
+            with open(path, "rb") as source_file:
+                for block in iter(lambda: source_file.read(1024 * 1024), b""): # Catalogs can be large
+                    digest.update(block)
+        except IOError:
+            digest.update(b"<missing>")
+    return digest.digest()
+
+
+def read_bundle(expected_hash: bytes):
+    """
+    Returns the tables stored in the bundle, or None if there is no bundle or it was built
+    from different source data (or is damaged).
+    """
+    path = bundle_path()
+    try:
+        with open(path, "rb") as bundle_file:
+            data = bundle_file.read()
+    except FileNotFoundError:
+        return None
+    except IOError as e:
+        logger.warning(f"Could not read data bundle '{BUNDLE_FILENAME}': {e}")
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, stored_hash = _HEADER.unpack_from(data)
+    if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT_VERSION or stored_hash != expected_hash:
+        logger.info(f"Data bundle '{BUNDLE_FILENAME}' is out of date. Rebuilding the game data.")
+        return None
+    try:
+        tables = pickle.loads(memoryview(data)[_HEADER.size:])
+    except Exception as e: # Any unpickling problem just means the bundle is rebuilt
+        logger.warning(f"Data bundle '{BUNDLE_FILENAME}' is damaged ({e}). Rebuilding the game data.")
+        return None
+    return tables if isinstance(tables, dict) else None
+
+
+def write_bundle(hash_value: bytes, tables: dict) -> bool:
+    """Writes the tables to the bundle file (through a temporary file). Returns False on errors."""
+    path = bundle_path()
+    temp_path = f"{path}.{os.getpid()}.tmp" # Several processes (economy_sim workers) may write at once
+    try:
+        with open(temp_path, "wb") as bundle_file:
+            bundle_file.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, hash_value))
+            pickle.dump(tables, bundle_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return True
+    except (IOError, pickle.PicklingError) as e:
+        logger.warning(f"Could not write data bundle '{BUNDLE_FILENAME}': {e}")
+        return False
+
+
+def _numpy_available() -> bool:
+    try:
+        import numpy # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def main() -> int:
+    """Compiles the bundle from the source files (even if an up-to-date bundle exists)."""
+    import data_loader
+    game_log.setup_logging(use_async=False) # Short-lived tool: no game loop to keep responsive
+    if os.path.exists(bundle_path()):
+        os.remove(bundle_path())
+    if not data_loader.load_mining_data():
+        return 1
+    logger.info(f"Data bundle written to {bundle_path()} ({os.path.getsize(bundle_path()):,} bytes).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,41 +1,120 @@
 import os
+import sys
+import importlib
+import logging
 import pygame
 import game_state
 import constants
+import item_search
+import item_registry
+import data_bundle
+import item_catalog
+import item_ids
 
-# Import the data structures directly from mine_speeds.py
+# NumPy is optional - the mining time matrix is a plain list of lists without it
 try:
-    # Assuming mine_speeds.py defines MINING_DATA and TOOL_HEADERS
-    from mine_speeds import MINING_DATA, TOOL_HEADERS
+    import numpy as np
 except ImportError:
-    # Handle the case where mine_speeds.py is missing or has errors during import
-    MINING_DATA = None
-    TOOL_HEADERS = None
-    print("Error: Could not import data structures from 'mine_speeds.py'. File missing or contains errors.")
+    np = None
 
-# Import tool stats (optional, but good practice if needed during loading)
-try:
-    # Assuming tool_stats.py defines TOOL_STATS
-    from tool_stats import TOOL_STATS
-except ImportError:
-    TOOL_STATS = None # Handle missing tool_stats.py gracefully if needed
-    print("Warning: Could not import TOOL_STATS from 'tool_stats.py'. Tool information might be unavailable.")
+logger = logging.getLogger(__name__)
+
+# Tables stored in the compiled data bundle (see data_bundle.py): game_state attributes
+BUNDLED_GAME_STATE = [
+    "item_data", "mine_speeds", "mine_list", "item_name_to_id", "item_id_to_name",
+    "tool_headers", "tool_stats", "tool_name_to_id", "mining_times",
+]
+
+
+def _import_source_data(reload_modules=False):
+    """
+    Imports the data structures from mine_speeds.py and tool_stats.py.
+    Only needed when the compiled data bundle is missing or out of date, or for a hot reload
+    ('reload_modules' re-reads files that were already imported).
+    Returns (MINING_DATA, TOOL_HEADERS, TOOL_STATS), with None for anything that failed.
+    """
+    if reload_modules:
+        for module_name in ("mine_speeds", "tool_stats"):
+            if module_name in sys.modules:
+                try:
+                    importlib.reload(sys.modules[module_name])
+                except Exception as e: # e.g. a syntax error while the file is being edited
+                    logger.error(f"Could not reload '{module_name}.py': {e}")
+                    return None, None, None
+    try:
+        # Assuming mine_speeds.py defines MINING_DATA and TOOL_HEADERS
+        from mine_speeds import MINING_DATA, TOOL_HEADERS
+    except ImportError:
+        # Handle the case where mine_speeds.py is missing or has errors during import
+        MINING_DATA = None
+        TOOL_HEADERS = None
+        logger.error("Could not import data structures from 'mine_speeds.py'. File missing or contains errors.")
+
+    # Import tool stats (optional, but good practice if needed during loading)
+    try:
+        # Assuming tool_stats.py defines TOOL_STATS
+        from tool_stats import TOOL_STATS
+    except ImportError:
+        TOOL_STATS = None # Handle missing tool_stats.py gracefully if needed
+        logger.warning("Could not import TOOL_STATS from 'tool_stats.py'. Tool information might be unavailable.")
+    return MINING_DATA, TOOL_HEADERS, TOOL_STATS
 
 
 def load_mining_data():
     """
-    Loads mining speed data from the MINING_DATA dictionary,
+    Loads the item, mining speed and tool data. Uses the compiled data bundle when it was
+    built from the current source files, otherwise builds everything from mine_speeds.py
+    and tool_stats.py and writes a new bundle for the next start.
+    """
+    hash_value = data_bundle.source_hash()
+    tables = data_bundle.read_bundle(hash_value)
+    # The bundle's IDs are only valid for the item ID registry version it was built with
+    if tables is not None and tables.get("item_ids_version") == item_ids.version() and _apply_bundle(tables):
+        logger.info(f"Mining/Item data loaded from {data_bundle.BUNDLE_FILENAME} "
+                    f"({len(game_state.item_id_to_name)} items, {len(game_state.mine_list) - 1} mineable).")
+        return True
+
+    if not _build_from_source():
+        return False
+    data_bundle.write_bundle(hash_value, _collect_bundle())
+    return True
+
+
+def _collect_bundle() -> dict:
+    """Gathers every derived table for the data bundle."""
+    tables = {name: getattr(game_state, name) for name in BUNDLED_GAME_STATE}
+    tables["item_registry"] = item_registry.export_tables()
+    tables["item_search"] = item_search.export_index()
+    tables["item_ids_version"] = item_ids.version()
+    return tables
+
+
+def _apply_bundle(tables) -> bool:
+    """Puts the tables from a data bundle in place. Returns False if the bundle is incomplete."""
+    if any(name not in tables for name in BUNDLED_GAME_STATE + ["item_registry", "item_search"]):
+        logger.warning(f"Data bundle '{data_bundle.BUNDLE_FILENAME}' is incomplete. Rebuilding the game data.")
+        return False
+    for name in BUNDLED_GAME_STATE:
+        setattr(game_state, name, tables[name])
+    item_registry.import_tables(tables["item_registry"])
+    item_search.import_index(tables["item_search"])
+    return True
+
+
+def _build_from_source():
+    """
+    Loads mining speed data from the MINING_DATA dictionary (plus any item catalogs),
     creates the *mineable* block list for the mining menu using consistent global IDs,
-    creates name/ID mappings, populates item_data, and initializes inventory structure for *all* items.
+    creates name/ID mappings and populates item_data for *all* items.
     Also loads tool statistics.
     """
-    print("Attempting to load data from mine_speeds.py and tool_stats.py...")
+    logger.info("Attempting to load data from mine_speeds.py and tool_stats.py...")
+    MINING_DATA, TOOL_HEADERS, TOOL_STATS = _import_source_data()
 
     # --- Reset State Variables ---
     game_state.item_data = {} # Reset item data
     game_state.mine_speeds = {}
     game_state.mine_list = {0: "Back"} # Reset, 0 is always back
-    game_state.inventory = {}
     game_state.item_name_to_id = {}
     game_state.item_id_to_name = {}
     game_state.tool_headers = []
@@ -44,22 +123,28 @@ def load_mining_data():
     # --- Check if Data Was Imported ---
     if MINING_DATA is None:
         error_msg = "Error: MINING_DATA could not be loaded from mine_speeds.py."
-        print(error_msg)
-        game_state.status_message = error_msg
+        logger.error(error_msg)
+        game_state.error_message = error_msg
         game_state.current_screen = constants.ERROR_STATE
         return False
 
     if TOOL_HEADERS is None:
         error_msg = "Error: TOOL_HEADERS could not be loaded from mine_speeds.py."
-        print(error_msg)
-        game_state.status_message = error_msg
+        logger.error(error_msg)
+        game_state.error_message = error_msg
         game_state.current_screen = constants.ERROR_STATE
         return False
 
     if TOOL_STATS is None:
-        print("Warning: TOOL_STATS could not be loaded. Tool functionality might be limited.")
+        logger.warning("TOOL_STATS could not be loaded. Tool functionality might be limited.")
 
     try:
+        # --- Add Items From External Catalogs ---
+        # Streamed record by record; bad records are skipped and reported together
+        MINING_DATA = dict(MINING_DATA)
+        catalog_report = item_catalog.load_catalogs(MINING_DATA, TOOL_HEADERS)
+        catalog_report.log_summary()
+
         # --- Assign Full Data ---
         # Note: mine_speeds might be redundant if all data is in item_data
         game_state.mine_speeds = MINING_DATA
@@ -67,66 +152,27 @@ def load_mining_data():
         game_state.tool_stats = TOOL_STATS if TOOL_STATS is not None else {}
 
         # --- Create Global ID Mappings for ALL Items FIRST ---
-        # Sort all item names alphabetically for consistent ID assignment
-        all_item_names_sorted = sorted(MINING_DATA.keys())
-        # Assign IDs sequentially to ALL items for internal use (inventory, crafting)
-        # Start IDs from 1, as 0 is reserved for "Back"
-        game_state.item_name_to_id = {name: i + 1 for i, name in enumerate(all_item_names_sorted)}
+        # IDs come from the persistent registry (item_ids.json): items keep the ID they were
+        # first given, new items get the next free IDs. 0 is reserved for "Back".
+        game_state.item_name_to_id = item_ids.assign_ids(sorted(MINING_DATA.keys()))
         game_state.item_id_to_name = {v: k for k, v in game_state.item_name_to_id.items()}
-        print(f"Global Item IDs (Name->ID): {game_state.item_name_to_id}") # Debug print
-        print(f"Global Item IDs (ID->Name): {game_state.item_id_to_name}") # Debug print
+        logger.info(f"Assigned global item IDs to {len(game_state.item_name_to_id)} items.")
 
         # --- *** Populate game_state.item_data *** ---
         # This is the crucial dictionary for item details accessed by ID
         game_state.item_data = {}
         for item_id, item_name in game_state.item_id_to_name.items():
             # Get the original data from MINING_DATA using the name
-            original_data = MINING_DATA.get(item_name, {})
-            # Create the entry in item_data, ensuring 'name' is included
-            game_state.item_data[item_id] = {
-                'name': item_name,
-                # Add other relevant properties from original_data
-                'mine_time': original_data.get('base_time'), # Example: map base_time
-                'is_mineable': original_data.get('is_mineable', False),
-                # Add any other properties you need (e.g., stack_size, tool_required)
-                # 'tool_required': original_data.get('tool_required'),
-                # 'stack_size': original_data.get('stack_size', 64) # Default stack size
-            }
-            # You might want to copy all keys, but be explicit for clarity:
-            # game_state.item_data[item_id] = original_data.copy()
-            # game_state.item_data[item_id]['name'] = item_name # Ensure name is present
-
-        print(f"Populated item_data: {game_state.item_data}") # Debug print
-
-        # --- Create Inventory Structure based on Global IDs ---
-        fresh_inventory = {item_id: 0 for item_id in game_state.item_id_to_name.keys()}
-        game_state.inventory = fresh_inventory
-        # print(f"Initial Inventory Structure: {game_state.inventory}") # Optional debug print
+            game_state.item_data[item_id] = _item_data_entry(item_name, MINING_DATA.get(item_name, {}))
 
-        # --- Create Mineable List for Mining Menu using GLOBAL IDs ---
-        game_state.mine_list = {0: "Back"} # Start with Back button
-        # Filter items based on the 'is_mineable' flag in the newly created item_data
-        mineable_items_data = {
-            item_id: data for item_id, data in game_state.item_data.items()
-            if data.get("is_mineable", False)
-        }
-        # Sort mineable item names alphabetically for consistent *menu order*
-        # Get names using item_id_to_name for sorting
-        sorted_mineable_ids = sorted(
-            mineable_items_data.keys(),
-            key=lambda item_id: game_state.item_id_to_name.get(item_id, "")
-        )
-
-        # Populate mine_list using the GLOBAL ID and name
-        for item_id in sorted_mineable_ids:
-            item_name = game_state.item_id_to_name.get(item_id)
-            if item_name:
-                # The key in mine_list is the GLOBAL ID, the value is the name
-                game_state.mine_list[item_id] = item_name
-            else:
-                # This should not happen if the item is in item_data
-                print(f"Warning: Could not find name for mineable item ID '{item_id}' during mine_list creation.")
+        # --- Build the item registry (dense per-ID property tables + shared ItemTypes) ---
+        item_registry.build_registry(game_state.item_id_to_name, MINING_DATA)
 
+        # --- Precompute mining times for every block/tool pair ---
+        build_mining_time_matrix()
+
+        # --- Create Mineable List for Mining Menu using GLOBAL IDs ---
+        mineable_items_data = _build_mine_list()
 
         # --- Basic Validation ---
         if not game_state.item_data: # Check the newly populated item_data
@@ -139,53 +185,216 @@ def load_mining_data():
              raise ValueError("Failed to create item_name_to_id mapping for all items.")
         if not game_state.item_id_to_name:
              raise ValueError("Failed to create item_id_to_name mapping.")
-        if not game_state.inventory:
-             raise ValueError("Failed to initialize inventory structure.")
 
 
-        print("Mining/Item data loaded successfully.") # Simplified message
-        # Adjust debug print for mine_list structure change (ID -> Name)
-        print(f"Mineable items (for menu - ID: Name): { {k:v for k,v in game_state.mine_list.items() if k != 0} }")
-        # print(f"Loaded Tool Stats: {game_state.tool_stats}") # Optional debug print
+        # --- Build the prefix index used by the item search boxes ---
+        item_search.build_search_index()
+
+        logger.info(f"Mining/Item data loaded successfully ({len(game_state.item_data)} items, {len(game_state.mine_list) - 1} mineable).")
         return True
 
     except KeyError as e:
         error_msg = f"Error accessing data: Missing key '{e}' in data structures."
-        print(error_msg)
-        game_state.status_message = error_msg
+        logger.error(error_msg)
+        game_state.error_message = error_msg
         game_state.current_screen = constants.ERROR_STATE
         return False
     except Exception as e:
         error_msg = f"Error processing game data: {e}"
-        print(error_msg)
-        game_state.status_message = error_msg
+        logger.error(error_msg)
+        game_state.error_message = error_msg
         game_state.current_screen = constants.ERROR_STATE
         # Ensure game_state structures are reset/empty on error
         game_state.item_data = {}
         game_state.mine_speeds = {}
         game_state.mine_list = {0: "Back"}
         game_state.tool_headers = []
-        game_state.inventory = {}
         game_state.item_name_to_id = {}
         game_state.item_id_to_name = {}
         game_state.tool_stats = {}
+        game_state.tool_name_to_id = {}
+        game_state.mining_times = []
+        item_registry.clear_registry()
         return False
 
 
-def load_textures():
+def build_mining_time_matrix():
+    """
+    Compiles mine_speeds (MINING_DATA) and tool_stats (TOOL_STATS) into
+    game_state.mining_times[block_id][tool_id] = seconds to mine one block.
+    Tool ID 0 is "no tool"; the other IDs are in game_state.tool_name_to_id.
+    All fallbacks are resolved here, so looking up a mining time never needs them:
+      - blocks without speed data use constants.DEFAULT_MINING_TIME
+      - a block's "default" speed is used without a tool, with the wrong tool type,
+        or when the tool's tier has no speed listed (None)
+      - times are at least 0.1 seconds
+    """
+    tool_names = sorted(game_state.tool_stats)
+    game_state.tool_name_to_id = {name: i + 1 for i, name in enumerate(tool_names)}
+    tool_columns = _tool_columns()
+
+    row_count = max(game_state.item_id_to_name, default=0) + 1
+    matrix = [[constants.DEFAULT_MINING_TIME] * len(tool_columns) for _ in range(row_count)]
+    for block_id, block_name in game_state.item_id_to_name.items():
+        matrix[block_id] = _mining_time_row(block_name, tool_columns)
+
+    game_state.mining_times = np.array(matrix, dtype=float) if np is not None else matrix
+    logger.info(f"Mining time matrix built ({row_count - 1} blocks x {len(tool_columns)} tool columns).")
+
+
+def _tool_columns() -> list:
+    """(tool type, tier) for each mining_times column, in tool ID order; column 0 is bare hands."""
+    tool_names = sorted(game_state.tool_name_to_id, key=game_state.tool_name_to_id.get)
+    return [(None, None)] + [
+        (game_state.tool_stats[name].get("type"), game_state.tool_stats[name].get("tier")) for name in tool_names
+    ]
+
+
+def _mining_time_row(block_name, tool_columns) -> list:
+    """Seconds to mine one block of an item with each tool column (see build_mining_time_matrix)."""
+    mine_speed_data = game_state.mine_speeds.get(block_name)
+    if not mine_speed_data:
+        return [constants.DEFAULT_MINING_TIME] * len(tool_columns) # Keep the global default
+    speeds = mine_speed_data.get("speeds", {})
+    required_tool_type = mine_speed_data.get("tool")
+    default_speed = speeds.get("default")
+    if default_speed is None:
+        logger.warning(f"Block '{block_name}' is missing a 'default' speed in mine_speeds.py. Using global default.")
+        default_speed = constants.DEFAULT_MINING_TIME
+
+    row = []
+    for tool_type, tier in tool_columns:
+        speed = default_speed
+        if tool_type is not None and tool_type == required_tool_type and speeds.get(tier) is not None:
+            speed = speeds[tier]
+        row.append(max(speed, 0.1)) # Ensure speed is positive
+    return row
+
+
+def _item_data_entry(item_name, original_data) -> dict:
+    """The game_state.item_data entry of an item, from its MINING_DATA entry."""
+    return {
+        'name': item_name,
+        # Add other relevant properties from original_data
+        'mine_time': original_data.get('base_time'), # Example: map base_time
+        'is_mineable': original_data.get('is_mineable', False),
+        # Add any other properties you need (e.g., stack_size, tool_required)
+        # 'tool_required': original_data.get('tool_required'),
+        # 'stack_size': original_data.get('stack_size', 64) # Default stack size
+    }
+
+
+def _build_mine_list() -> dict:
+    """
+    Rebuilds game_state.mine_list (Back + every mineable item, in name order) from item_data.
+    Returns {item_id: item_data entry} of the mineable items.
+    """
+    game_state.mine_list = {0: "Back"} # Start with Back button
+    # Filter items based on the 'is_mineable' flag in item_data
+    mineable_items_data = {
+        item_id: data for item_id, data in game_state.item_data.items()
+        if data.get("is_mineable", False)
+    }
+    # Sort mineable item names alphabetically for consistent *menu order*
+    for item_id in sorted(mineable_items_data, key=lambda item_id: game_state.item_id_to_name.get(item_id, "")):
+        # The key in mine_list is the GLOBAL ID, the value is the name
+        game_state.mine_list[item_id] = game_state.item_id_to_name[item_id]
+    return mineable_items_data
+
+
+# --- Hot Reload ---
+def reload_item_data():
+    """
+    Re-reads mine_speeds.py, tool_stats.py and the item catalogs and applies only what changed
+    (used by hot_reload.py while the game runs). Existing item IDs never change, so inventories,
+    chests and mining jobs stay valid: new items get IDs from the item ID registry, and items
+    that were removed from the data keep their ID but can no longer be mined.
+    Returns {"added": [ids], "changed": [ids], "tools_changed": bool}, or None if the data could
+    not be read (the current data is kept).
+    """
+    MINING_DATA, TOOL_HEADERS, TOOL_STATS = _import_source_data(reload_modules=True)
+    if MINING_DATA is None or TOOL_HEADERS is None:
+        return None
+    item_properties = dict(MINING_DATA)
+    item_catalog.load_catalogs(item_properties, TOOL_HEADERS).log_summary()
+    tool_stats = TOOL_STATS if TOOL_STATS is not None else {}
+
+    old_properties = game_state.mine_speeds
+    for name, old_entry in old_properties.items():
+        if name not in item_properties:
+            item_properties[name] = dict(old_entry, is_mineable=False) # Removed: keep the item, stop mining it
+    added_names = sorted(name for name in item_properties if name not in game_state.item_name_to_id)
+    changed_names = [name for name in old_properties if item_properties[name] != old_properties[name]]
+    tools_changed = tool_stats != game_state.tool_stats or TOOL_HEADERS != game_state.tool_headers
+
+    try:
+        new_ids = item_ids.assign_ids(added_names)
+    except ValueError as e:
+        logger.error("%s", e)
+        return None
+
+    game_state.mine_speeds = item_properties
+    game_state.tool_headers = TOOL_HEADERS
+    game_state.tool_stats = tool_stats
+    for name, item_id in new_ids.items():
+        game_state.item_name_to_id[name] = item_id
+        game_state.item_id_to_name[item_id] = name
+    added_ids = [game_state.item_name_to_id[name] for name in added_names]
+    changed_ids = [game_state.item_name_to_id[name] for name in changed_names]
+    if not (added_ids or changed_ids or tools_changed):
+        return {"added": [], "changed": [], "tools_changed": False}
+
+    updated = {item_id: game_state.item_id_to_name[item_id] for item_id in changed_ids + added_ids}
+    for item_id, name in updated.items():
+        game_state.item_data[item_id] = _item_data_entry(name, item_properties[name])
+    item_registry.update_items(updated, item_properties)
+    if added_names:
+        item_search.add_items({name: game_state.item_name_to_id[name] for name in added_names})
+
+    if tools_changed:
+        build_mining_time_matrix() # Tool columns may have moved: rebuild every row
+    elif updated:
+        _update_mining_time_rows(updated)
+    _build_mine_list()
+    return {"added": added_ids, "changed": changed_ids, "tools_changed": tools_changed}
+
+
+def _update_mining_time_rows(updated):
+    """Recomputes the mining_times rows of the given {item_id: name}, growing the matrix for new IDs."""
+    tool_columns = _tool_columns()
+    row_count = max(game_state.item_id_to_name, default=0) + 1
+    mining_times = game_state.mining_times
+    if np is not None and isinstance(mining_times, np.ndarray):
+        if row_count > len(mining_times):
+            extra = np.full((row_count - len(mining_times), len(tool_columns)), constants.DEFAULT_MINING_TIME)
+            mining_times = np.vstack([mining_times, extra])
+        else:
+            mining_times = mining_times.copy() # Never change an array someone else may hold (e.g. economy_sim)
+        for item_id, name in updated.items():
+            mining_times[item_id] = _mining_time_row(name, tool_columns)
+    else:
+        mining_times = [list(row) for row in mining_times]
+        mining_times.extend([constants.DEFAULT_MINING_TIME] * len(tool_columns) for _ in range(row_count - len(mining_times)))
+        for item_id, name in updated.items():
+            mining_times[item_id] = _mining_time_row(name, tool_columns)
+    game_state.mining_times = mining_times
+
+
+def load_textures(only_ids=None):
     """
     Loads item textures from the TEXTURES_DIR, resizes them,
     and stores them in game_state.item_textures using the item ID as the key.
+    'only_ids' limits this to some items (hot reload); default is every item.
     Texture filenames are expected to match the item name (e.g., 'stone.png').
     Assumes game_state.item_data and game_state.item_id_to_name are populated.
     """
-    print("Loading textures by item name...")
+    logger.info("Loading textures by item name...")
     # --- Check if item_data and mappings are populated ---
     if not game_state.item_data:
-        print("Error: Item data (game_state.item_data) not loaded before trying to load textures.")
+        logger.error("Item data (game_state.item_data) not loaded before trying to load textures.")
         return False
     if not game_state.item_id_to_name:
-        print("Error: Item ID to Name mapping (game_state.item_id_to_name) not loaded.")
+        logger.error("Item ID to Name mapping (game_state.item_id_to_name) not loaded.")
         return False
 
     loaded_count = 0
@@ -195,12 +404,12 @@ def load_textures():
 
     # --- Iterate through item_data using item IDs ---
     # We still iterate by ID because game_state.item_textures uses ID as the key
-    for item_id in game_state.item_data.keys():
+    for item_id in (game_state.item_data.keys() if only_ids is None else only_ids):
         # Get the item name using the ID
         item_name = game_state.item_id_to_name.get(item_id)
 
         if not item_name:
-            print(f"Warning: Could not find name for item ID {item_id}. Skipping texture load for this item.")
+            logger.warning(f"Could not find name for item ID {item_id}. Skipping texture load for this item.")
             error_count += 1 # Treat this as an error or inconsistency
             continue # Skip to the next item
 
@@ -221,6 +430,7 @@ def load_textures():
                 resized_texture = pygame.transform.scale(texture, constants.ITEM_TEXTURE_SIZE)
                 # Store it using the integer item_id as the key
                 game_state.item_textures[item_id] = resized_texture
+                item_registry.set_texture(item_id, resized_texture)
                 loaded_count += 1
             else:
                 # Record the missing texture name for a summary warning
@@ -229,30 +439,28 @@ def load_textures():
                 # Optional: Load a default "missing texture" image here
                 # game_state.item_textures[item_id] = load_missing_texture_placeholder()
         except pygame.error as e:
-            print(f"Pygame Error loading/resizing texture for item ID {item_id} ('{texture_filename}'): {e}")
+            logger.error(f"Pygame Error loading/resizing texture for item ID {item_id} ('{texture_filename}'): {e}")
             error_count += 1
         except Exception as e:
-            print(f"Unexpected error processing texture for item ID {item_id} ('{texture_filename}'): {e}")
+            logger.error(f"Unexpected error processing texture for item ID {item_id} ('{texture_filename}'): {e}")
             error_count += 1
 
-    print(f"Texture loading complete. Loaded: {loaded_count}, Missing: {missing_count}, Errors: {error_count}")
+    logger.info(f"Texture loading complete. Loaded: {loaded_count}, Missing: {missing_count}, Errors: {error_count}")
 
     # Report missing textures if any
     if missing_count > 0:
-        print(f"Warning: {missing_count} item textures were not found in '{constants.TEXTURES_DIR}':")
-        # Print first few missing ones to help debugging
-        for i, missing_name in enumerate(missing_textures):
-            if i < 10: # Limit the output
-                 print(f"  - {missing_name}")
-            elif i == 10:
-                 print("  - ... (and potentially more)")
-                 break
+        logger.warning(f"{missing_count} item textures were not found in '{constants.TEXTURES_DIR}' "
+                       f"(set LOG_LEVEL to DEBUG to list them).")
+        # One line per missing texture only at debug level (large catalogs can miss thousands)
+        if logger.isEnabledFor(logging.DEBUG):
+            for missing_name in missing_textures:
+                logger.debug("  - %s", missing_name)
 
 
     # Decide if missing/error counts constitute a failure
     if error_count > 0:
         # Optionally set status message for critical errors
-        # game_state.status_message = "Error loading essential textures."
+        # game_state.error_message = "Error loading essential textures."
         return False # Treat errors as failure
 
     # If only missing textures is acceptable, return True even if missing_count > 0
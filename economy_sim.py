@@ -0,0 +1,319 @@
+# economy_sim.py
+# Economy simulator for balancing mine speeds (mine_speeds.MINING_DATA) and recipe yields.
+#
+# Runs synthetic player strategies through the headless engine (SteppedClock, no window)
+# in a process pool and writes one CSV row per run with items per hour:
+#   - a strategy mines one block with one tool (or bare hands), keeping every mining slot
+#     busy, and optionally crafts the blocks along a recipe chain (e.g. Oak log -> Oak Planks -> Stick)
+#   - every strategy is run for each point of the parameter grid:
+#     speed scale (multiplies every mining time) x yield scale (multiplies every recipe result)
+# Next to the simulated numbers, each row has the expected rate computed for the whole
+# grid at once with NumPy (falls back to plain Python without it).
+# The player crafts and banks often enough that a step's blocks (and what they are crafted
+# into) fit in the inventory. A run that still lost blocks to a full inventory is marked
+# valid=False and left out of the summary, since its rates measure the inventory, not the balance.
+#
+# Usage: python economy_sim.py [output.csv] [hours per run]
+import csv
+import itertools
+import logging
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import constants
+import game_state
+import game_logic
+import inventory_store
+import item_registry
+import engine
+import game_log
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_OUTPUT = "economy_sim.csv"
+DEFAULT_HOURS = 8.0
+STEP_SECONDS = 60.0 # Longest simulated time between the "player" crafting and banking what was mined
+MIN_STEP_SECONDS = 0.5 # Shortest step (very fast mining with big yields)
+STEP_INVENTORY_SHARE = 0.5 # Part of the inventory one step's items may fill
+SPEED_SCALES = (0.5, 0.75, 1.0, 1.5, 2.0)
+YIELD_SCALES = (0.5, 1.0, 1.5, 2.0)
+MAX_CHAIN_LENGTH = 3 # Crafting steps followed from a mined block
+
+CSV_FIELDS = [
+    "strategy", "block", "tool", "tool_tier", "speed_scale", "yield_scale", "hours",
+    "blocks_mined", "blocks_lost", "valid", "final_item", "final_items",
+    "blocks_per_hour", "items_per_hour", "expected_blocks_per_hour", "expected_items_per_hour",
+]
+
+# Base data of a worker process, copied once so each run can apply its own scales
+_base_mining_times = None
+_base_recipes = None
+
+
+# --- Strategies ---
+def crafting_chains(block_id) -> list:
+    """
+    Returns every recipe chain that starts from a block, as lists of result item IDs.
+    Only recipes with a single ingredient type are followed (the player crafts from one stack).
+    """
+    chains = []
+
+    def follow(item_id, chain):
+        if len(chain) >= MAX_CHAIN_LENGTH:
+            return
+        seen = set()
+        for recipe in game_logic.RECIPES_2x2:
+            result_id = recipe['result']['item_id']
+            if result_id in seen or result_id in chain or result_id == block_id:
+                continue
+            if set(game_logic.recipe_ingredients(recipe)) == {item_id}:
+                seen.add(result_id) # Shaped variations (mirrored patterns) make the same item
+                chains.append(chain + [result_id])
+                follow(result_id, chain + [result_id])
+
+    follow(block_id, [])
+    return chains
+
+
+def build_strategies() -> list:
+    """Every mineable block x every tool (and bare hands) x no crafting / every crafting chain."""
+    tool_names = [None] + sorted(game_state.tool_name_to_id, key=game_state.tool_name_to_id.get)
+    strategies = []
+    for block_id in sorted(game_state.mine_list):
+        if block_id == 0: # "Back" button
+            continue
+        for tool_name, chain in itertools.product(tool_names, [[]] + crafting_chains(block_id)):
+            names = [game_state.item_id_to_name.get(item_id, f"ID:{item_id}") for item_id in [block_id] + chain]
+            strategies.append({
+                "name": " -> ".join(names) + f" ({tool_name or 'hand'})",
+                "block_id": block_id,
+                "tool": tool_name,
+                "chain": chain,
+            })
+    return strategies
+
+
+def tool_tier(tool_name) -> str:
+    if tool_name is None:
+        return "hand"
+    return game_state.tool_stats.get(tool_name, {}).get("tier", "unknown")
+
+
+# --- Expected Rates (whole grid at once) ---
+def expected_rates(strategies, speed_scales, yield_scales) -> dict:
+    """
+    Returns {(strategy index, speed scale, yield scale): (blocks/hour, items/hour)} assuming
+    every mining slot is always busy and crafting loses nothing to rounding.
+    """
+    tool_ids = [game_state.tool_name_to_id.get(s["tool"], 0) if s["tool"] else 0 for s in strategies]
+    block_ids = [s["block_id"] for s in strategies]
+    # Items made per mined block along each chain, at yield scale 1 (scaled per chain step below)
+    chain_ratios, chain_lengths = [], []
+    for strategy in strategies:
+        ratio, item_id = 1.0, strategy["block_id"]
+        for result_id in strategy["chain"]:
+            recipe = game_logic.find_recipe_for(result_id)
+            ratio *= recipe['result']['quantity'] / game_logic.recipe_ingredients(recipe)[item_id]
+            item_id = result_id
+        chain_ratios.append(ratio)
+        chain_lengths.append(len(strategy["chain"]))
+
+    slots = constants.MAX_PARALLEL_MINING_JOBS
+    if np is not None:
+        seconds = np.asarray(game_state.mining_times, dtype=float)[block_ids, tool_ids]   # (strategies,)
+        speeds = np.asarray(speed_scales, dtype=float)[:, None]                             # (speed, 1)
+        blocks = 3600.0 * slots / (seconds[None, :] * speeds)                               # (speed, strategies)
+        yields = np.asarray(yield_scales, dtype=float)[:, None] ** np.asarray(chain_lengths)[None, :] # (yield, strategies)
+        items = blocks[:, None, :] * (yields * np.asarray(chain_ratios))[None, :, :]        # (speed, yield, strategies)
+        blocks = np.broadcast_to(blocks[:, None, :], items.shape)
+    else:
+        blocks = [[[3600.0 * slots / (float(game_state.mining_times[b][t]) * speed) for b, t in zip(block_ids, tool_ids)]
+                   for _ in yield_scales] for speed in speed_scales]
+        items = [[[blocks[i][j][k] * chain_ratios[k] * yield_scale ** chain_lengths[k] for k in range(len(strategies))]
+                  for j, yield_scale in enumerate(yield_scales)] for i in range(len(speed_scales))]
+
+    rates = {}
+    for (i, speed), (j, yield_scale) in itertools.product(enumerate(speed_scales), enumerate(yield_scales)):
+        for k in range(len(strategies)):
+            rates[(k, speed, yield_scale)] = (float(blocks[i][j][k]), float(items[i][j][k]))
+    return rates
+
+
+# --- Worker Process ---
+def _init_worker():
+    """Loads the game data once per process (each worker, and the parent for the strategies)."""
+    global _base_mining_times, _base_recipes
+    eng = engine.Engine()
+    if not eng.load_data():
+        raise RuntimeError(f"Could not load game data: {game_state.error_message}")
+    _base_mining_times = game_state.mining_times
+    _base_recipes = game_logic.RECIPES_2x2
+
+
+def _init_pool_worker():
+    """Pool initializer: only warnings and errors from the game in worker processes."""
+    logging.disable(logging.INFO) # Every worker would repeat the parent's data loading messages
+    _init_worker()
+
+
+def _apply_scales(speed_scale, yield_scale):
+    """Replaces the shared mining times and recipes with scaled copies (base data is kept)."""
+    if np is not None and isinstance(_base_mining_times, np.ndarray):
+        game_state.mining_times = _base_mining_times * speed_scale
+    else:
+        game_state.mining_times = [[seconds * speed_scale for seconds in row] for row in _base_mining_times]
+    game_logic.RECIPES_2x2 = [
+        dict(recipe, result=dict(recipe['result'], quantity=max(1, round(recipe['result']['quantity'] * yield_scale))))
+        for recipe in _base_recipes
+    ]
+
+
+def _craft_all(eng, sim_world, item_id, result_id) -> None:
+    """Crafts as many of result_id from the item_id in the inventory as possible."""
+    recipe = game_logic.find_recipe_for(result_id)
+    per_craft = game_logic.recipe_ingredients(recipe)[item_id]
+    times = eng.item_count(sim_world, item_id) // per_craft
+    while times > 0 and not eng.craft(sim_world, result_id, times):
+        times //= 2 # Result did not fit: craft in smaller batches
+
+
+def _step_seconds(sim_world, block_id, chain, seconds_per_block) -> float:
+    """
+    Simulated time per step, short enough that the blocks mined in one step fit in
+    STEP_INVENTORY_SHARE of the inventory at every stage of the crafting chain.
+    """
+    blocks_per_second = constants.MAX_PARALLEL_MINING_JOBS / seconds_per_block
+    # Items per mined block at each stage (recipe results may multiply the count) and the smallest stack
+    multiplier = peak_multiplier = 1.0
+    min_stack = item_registry.max_stack(block_id)
+    item_id = block_id
+    for result_id in chain:
+        recipe = game_logic.find_recipe_for(result_id)
+        multiplier *= recipe['result']['quantity'] / game_logic.recipe_ingredients(recipe)[item_id]
+        peak_multiplier = max(peak_multiplier, multiplier)
+        min_stack = min(min_stack, item_registry.max_stack(result_id))
+        item_id = result_id
+    capacity = len(sim_world.inventory) * min_stack * STEP_INVENTORY_SHARE
+    return max(MIN_STEP_SECONDS, min(STEP_SECONDS, capacity / (blocks_per_second * peak_multiplier)))
+
+
+def run_strategy(task) -> dict:
+    """Simulates one strategy at one grid point and returns its CSV row (without expected rates)."""
+    strategy, speed_scale, yield_scale, hours = task
+    _apply_scales(speed_scale, yield_scale)
+    eng = engine.Engine() # New SteppedClock starting at 0
+    sim_world = eng.new_world()
+    block_id, chain = strategy["block_id"], strategy["chain"]
+    final_id = chain[-1] if chain else block_id
+    duration = hours * 3600.0
+
+    # One job per mining slot, each long enough to keep the slot busy for the whole run
+    seconds = game_logic.calculate_mining_time(block_id, strategy["tool"], sim_world)
+    quantity = min(constants.MAX_MINING_QUANTITY, math.ceil(duration / seconds))
+    for _ in range(constants.MAX_PARALLEL_MINING_JOBS):
+        eng.mine(sim_world, block_id, quantity, strategy["tool"])
+    jobs = sim_world.mining_jobs.running_jobs()
+    step_seconds = _step_seconds(sim_world, block_id, chain, seconds)
+
+    banked = 0
+    elapsed = 0.0
+    while elapsed < duration:
+        step = min(step_seconds, duration - elapsed)
+        eng.advance(step, [sim_world])
+        elapsed += step
+        item_id = block_id
+        for result_id in chain:
+            _craft_all(eng, sim_world, item_id, result_id)
+            item_id = result_id
+        # Bank the final product so the inventory never fills up
+        count = eng.item_count(sim_world, final_id)
+        if count and inventory_store.withdraw_items(sim_world.inventory, {final_id: count}):
+            banked += count
+
+    blocks_mined = sum(job.delivered for job in jobs)
+    blocks_lost = sum(job.lost for job in jobs)
+    return {
+        "strategy": strategy["name"],
+        "block": game_state.item_id_to_name.get(block_id, f"ID:{block_id}"),
+        "tool": strategy["tool"] or "",
+        "tool_tier": tool_tier(strategy["tool"]),
+        "speed_scale": speed_scale,
+        "yield_scale": yield_scale,
+        "hours": hours,
+        "blocks_mined": blocks_mined,
+        "blocks_lost": blocks_lost,
+        "valid": blocks_lost == 0,
+        "final_item": game_state.item_id_to_name.get(final_id, f"ID:{final_id}"),
+        "final_items": banked,
+        "blocks_per_hour": round((blocks_mined - blocks_lost) / hours, 2), # Blocks that reached the inventory
+        "items_per_hour": round(banked / hours, 2),
+    }
+
+
+# --- Sweep ---
+def run_sweep(hours=DEFAULT_HOURS, speed_scales=SPEED_SCALES, yield_scales=YIELD_SCALES, workers=None) -> list:
+    """Runs every strategy at every grid point across a process pool. Returns the CSV rows."""
+    _init_worker() # The parent also needs the data to build the strategies
+    strategies = build_strategies()
+    expected = expected_rates(strategies, speed_scales, yield_scales)
+    tasks = [(strategy, speed, yield_scale, hours) for strategy in strategies for speed in speed_scales for yield_scale in yield_scales]
+    keys = [(k, speed, yield_scale) for k in range(len(strategies)) for speed in speed_scales for yield_scale in yield_scales]
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Economy sim: {len(tasks)} runs ({len(strategies)} strategies x {len(speed_scales)} speeds x "
+          f"{len(yield_scales)} yields, {hours}h each) on {workers} process(es)...")
+    if workers == 1:
+        rows = [run_strategy(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker) as pool:
+            rows = list(pool.map(run_strategy, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    for row, key in zip(rows, keys):
+        expected_blocks, expected_items = expected[key]
+        row["expected_blocks_per_hour"] = round(expected_blocks, 2)
+        row["expected_items_per_hour"] = round(expected_items, 2)
+    return rows
+
+
+def write_csv(rows, path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_tier_summary(rows) -> None:
+    """Prints the best items per hour of each tool tier and final item at the current balance (scales 1.0)."""
+    best = {}
+    for row in rows:
+        if row["valid"] and row["speed_scale"] == 1.0 and row["yield_scale"] == 1.0:
+            key = (row["tool_tier"], row["final_item"])
+            best[key] = max(best.get(key, 0.0), row["items_per_hour"])
+    for (tier, final_item), per_hour in sorted(best.items()):
+        print(f"  {tier:<10} {final_item:<16} {per_hour:>12,.1f} /h")
+
+
+def main(argv) -> int:
+    output = argv[1] if len(argv) > 1 else DEFAULT_OUTPUT
+    hours = float(argv[2]) if len(argv) > 2 else DEFAULT_HOURS
+    game_log.setup_logging(use_async=False) # Short-lived tool: no game loop to keep responsive
+    try:
+        rows = run_sweep(hours)
+    except RuntimeError as e:
+        print(f"Economy sim: {e}")
+        return 1
+    write_csv(rows, output)
+    print(f"Economy sim: wrote {len(rows)} rows to {output}")
+    invalid = sum(1 for row in rows if not row["valid"])
+    if invalid:
+        print(f"Economy sim: {invalid} run(s) lost blocks to a full inventory (valid=False); their rates are not balance data.")
+    print_tier_summary(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,116 @@
+# engine.py
+# Headless entry point: runs the game logic (items, recipes, saves, mining, crafting)
+# without a window, fonts or textures. Used for scripted runs, benchmarks and CI.
+#
+#   eng = Engine()                   # SteppedClock: time only moves with eng.advance()
+#   eng.load_data()
+#   w = eng.new_world()
+#   eng.mine(w, "Oak log", 100)
+#   eng.advance(3600, [w])           # One hour of mining in one call
+#   eng.craft(w, "Oak Planks", 10)
+#
+# Run "python engine.py [cycles]" for a small mine/craft benchmark.
+import logging
+import sys
+import time
+import game_state
+import data_loader
+import game_logic
+import save_manager
+import storage
+import world
+import game_clock
+import game_log
+
+logger = logging.getLogger(__name__)
+
+
+class Engine:
+    """Drives any number of World objects through the game logic, with no display."""
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else game_clock.SteppedClock()
+        game_clock.set_clock(self.clock)
+
+    # --- Setup ---
+    def load_data(self) -> bool:
+        """Loads items, mining times and recipes. Returns False if the game data is broken."""
+        if not data_loader.load_mining_data():
+            logger.error(f"Engine: could not load game data: {game_state.error_message}")
+            return False
+        game_logic.initialize_recipes()
+        return True
+
+    def new_world(self, world_id=None):
+        """Creates an empty world (not saved anywhere unless world_id is a save slot)."""
+        new_world = world.World(world_id)
+        new_world.storage_containers = storage.create_containers()
+        return new_world
+
+    def load_world(self, slot_id):
+        """Loads a save slot into a new World. Returns None if the save could not be read."""
+        loaded_world = world.World(slot_id)
+        return loaded_world if save_manager.load_game(slot_id, loaded_world) else None
+
+    def save_world(self, target_world) -> bool:
+        return save_manager.save_game(target_world.world_id, target_world)
+
+    # --- Actions ---
+    def item_id(self, item) -> int:
+        """Accepts an item name or ID and returns the ID (KeyError for unknown names)."""
+        if isinstance(item, int):
+            return item
+        return game_state.item_name_to_id[item]
+
+    def mine(self, target_world, block, quantity, tool_name=None) -> bool:
+        """Queues a mining job in a world. Returns False if it was refused (see world.status_message)."""
+        return game_logic.start_mining(self.item_id(block), quantity, tool_name, target_world)
+
+    def craft(self, target_world, item, times=1) -> int:
+        """Crafts an item from the world's inventory. Returns the number of items made."""
+        return game_logic.craft_from_inventory(self.item_id(item), times, target_world)
+
+    def item_count(self, target_world, item) -> int:
+        return game_logic.get_item_count(self.item_id(item), target_world)
+
+    def inventory_totals(self, target_world) -> dict:
+        """Returns {item_id: total quantity} for the world's inventory."""
+        return game_logic.get_inventory_totals(target_world)
+
+    # --- Time ---
+    def update(self, worlds) -> list:
+        """Delivers everything mined up to the clock's current time. Returns the finished jobs."""
+        now = self.clock.now()
+        finished = []
+        for target_world in worlds:
+            finished.extend(game_logic.update_mining(now, target_world))
+        return finished
+
+    def advance(self, seconds, worlds) -> list:
+        """Moves a SteppedClock forward, then updates the worlds (closed form, no per-frame steps)."""
+        self.clock.advance(seconds)
+        return self.update(worlds)
+
+
+def main(cycles=1000):
+    """Mines and crafts in a loop and prints how many operations per second were run."""
+    game_log.setup_logging(use_async=False) # Short-lived tool: no game loop to keep responsive
+    eng = Engine()
+    if not eng.load_data():
+        return 1
+    test_world = eng.new_world()
+    operations = 0
+    start = time.perf_counter()
+    for _ in range(cycles):
+        eng.mine(test_world, "Oak log", 4)
+        eng.advance(60, [test_world])
+        eng.craft(test_world, "Oak Planks", 4)
+        eng.craft(test_world, "Stick", 2)
+        operations += 5
+    elapsed = time.perf_counter() - start
+    print(f"Engine: {operations} operations in {elapsed:.3f}s ({operations / elapsed:,.0f} ops/s).")
+    print(f"  Oak Planks: {eng.item_count(test_world, 'Oak Planks')}, Stick: {eng.item_count(test_world, 'Stick')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
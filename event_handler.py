@@ -2,6 +2,7 @@
 import pygame
 import sys
 import math # Needed for ceil in right-click split
+import logging
 import game_state
 import constants
 # --- CORRECTED IMPORT ---
@@ -9,6 +10,11 @@ from ui_manager import update_layout # Import update_layout directly
 # --- END CORRECTION ---
 import game_logic # Import game_logic
 import save_manager
+import transactions
+import storage
+import world
+
+logger = logging.getLogger(__name__)
 
 # --- Helper Functions ---
 
@@ -19,25 +25,44 @@ def _handle_quantity_confirmation():
             quantity = int(game_state.accumulated_input)
             # Use game_logic.start_mining
             if game_logic.start_mining(game_state.selected_block_for_mining, quantity):
-                pass # Success, screen change handled by start_mining
+                # Back to the mining menu, free to queue more or leave
+                game_state.selected_block_for_mining = None
+                game_state.current_screen = constants.MINING_MENU
             else:
                 # Error message set by start_mining, stay on quantity screen
                 game_state.accumulated_input = "" # Clear input on error
         else:
-            game_state.status_message = f"Please enter a quantity (1-64)."
+            game_state.world.status_message = f"Please enter a quantity (1-{constants.MAX_MINING_QUANTITY})."
     except ValueError:
-        game_state.status_message = f"Invalid number: {game_state.accumulated_input}. Enter 1-64."
+        game_state.world.status_message = f"Invalid number: {game_state.accumulated_input}. Enter 1-{constants.MAX_MINING_QUANTITY}."
         game_state.accumulated_input = ""
     except Exception as e:
-         game_state.status_message = f"An error occurred: {e}"
-         print(f"Error during quantity confirmation: {e}")
+         game_state.world.status_message = f"An error occurred: {e}"
+         logger.error(f"Error during quantity confirmation: {e}")
          game_state.accumulated_input = ""
 
 
 # --- Crafting Interaction Helpers ---
 
 def _handle_crafting_click(mouse_pos, event):
-    """Handles clicks within the crafting screen UI (Grid, Inventory, Result)."""
+    """
+    Handles clicks within the crafting screen UI (Grid, Inventory, Result).
+    The click runs as one transaction: if anything fails part way, every slot
+    (grid, inventory, held item) it touched is put back the way it was.
+    A successful click that changed something becomes one undo step (Ctrl+Z).
+    """
+    try:
+        with transactions.transaction(history=True):
+            return _apply_crafting_click(mouse_pos, event)
+    except Exception as e:
+        logger.error(f"Error handling crafting click, changes rolled back: {e}")
+        game_state.world.status_message = "Something went wrong - action undone."
+        game_logic.update_crafting_result()
+        return True # Consume the click
+
+
+def _apply_crafting_click(mouse_pos, event):
+    """Applies a crafting screen click. Called inside a transaction by _handle_crafting_click."""
     button_type = event.button # 1 for left, 3 for right
     keys_pressed = pygame.key.get_pressed()
     shift_pressed = keys_pressed[pygame.K_LSHIFT] or keys_pressed[pygame.K_RSHIFT]
@@ -49,20 +74,23 @@ def _handle_crafting_click(mouse_pos, event):
             if r < len(game_state.crafting_grid_rects) and c < len(game_state.crafting_grid_rects[r]):
                 rect = game_state.crafting_grid_rects[r][c]
                 if rect and rect.collidepoint(mouse_pos):
-                    slot_item = game_state.crafting_grid[r][c] # ItemStack or None
-                    held = game_state.held_item # ItemStack or None
+                    slot_item = game_state.world.crafting_grid[r][c] # ItemStack or None
+                    held = game_state.world.held_item # ItemStack or None
                     grid_changed = False
+                    # Journal the two slots this click can change
+                    transactions.record(game_state.world.crafting_grid[r], c)
+                    transactions.record(transactions.held_slot(), None)
 
                     if button_type == 1: # Left Click
                         if held is None and slot_item is not None:
                             # Pick up whole stack from grid
-                            game_state.held_item = slot_item
-                            game_state.crafting_grid[r][c] = None
+                            game_state.world.held_item = slot_item
+                            game_state.world.crafting_grid[r][c] = None
                             grid_changed = True
                         elif held is not None and slot_item is None:
                             # Place whole held stack into empty grid slot
-                            game_state.crafting_grid[r][c] = held
-                            game_state.held_item = None
+                            game_state.world.crafting_grid[r][c] = held
+                            game_state.world.held_item = None
                             grid_changed = True
                         elif held is not None and slot_item is not None:
                             if held.item_id == slot_item.item_id:
@@ -72,12 +100,12 @@ def _handle_crafting_click(mouse_pos, event):
                                     added_now = slot_item.add(can_add_qty) # Use return value
                                     held.quantity -= added_now # Decrease held by amount added
                                     if held.quantity <= 0:
-                                        game_state.held_item = None
+                                        game_state.world.held_item = None
                                     grid_changed = True
                             else:
                                 # Swap items
-                                game_state.crafting_grid[r][c] = held
-                                game_state.held_item = slot_item
+                                game_state.world.crafting_grid[r][c] = held
+                                game_state.world.held_item = slot_item
                                 grid_changed = True
 
                     elif button_type == 3: # Right Click
@@ -86,24 +114,24 @@ def _handle_crafting_click(mouse_pos, event):
                             take_qty = math.ceil(slot_item.quantity / 2) # Round up
                             if take_qty > 0:
                                 try:
-                                    game_state.held_item = game_state.ItemStack(slot_item.item_id, take_qty)
+                                    game_state.world.held_item = game_state.ItemStack(slot_item.item_id, take_qty)
                                     slot_item.quantity -= take_qty
                                     if slot_item.quantity <= 0:
-                                        game_state.crafting_grid[r][c] = None
+                                        game_state.world.crafting_grid[r][c] = None
                                     grid_changed = True
                                 except ValueError as e:
-                                    print(f"Error creating ItemStack on right-click pickup: {e}")
+                                    logger.error(f"Error creating ItemStack on right-click pickup: {e}")
 
                         elif held is not None:
                             # Place one item into grid slot
                             if slot_item is None:
                                 # Place one into empty slot
                                 try:
-                                    game_state.crafting_grid[r][c] = game_state.ItemStack(held.item_id, 1)
+                                    game_state.world.crafting_grid[r][c] = game_state.ItemStack(held.item_id, 1)
                                     held.quantity -= 1
                                     grid_changed = True
                                 except ValueError as e:
-                                     print(f"Error creating ItemStack on right-click place: {e}")
+                                     logger.error(f"Error creating ItemStack on right-click place: {e}")
                             elif slot_item.item_id == held.item_id:
                                 # Place one onto existing stack (if space)
                                 if slot_item.can_add(1) > 0:
@@ -115,7 +143,7 @@ def _handle_crafting_click(mouse_pos, event):
 
                             # If held stack is now empty, clear it
                             if held.quantity <= 0:
-                                game_state.held_item = None
+                                game_state.world.held_item = None
 
                     # Update crafting result if the grid changed
                     if grid_changed:
@@ -124,27 +152,46 @@ def _handle_crafting_click(mouse_pos, event):
 
     # --- Check Inventory Slots ---
     # inventory_display_rects now contains {'rect': rect, 'inv_index': i}
+    # (plus 'container' for storage chest slots, which otherwise work like inventory slots)
     for slot_info in game_state.inventory_display_rects:
         rect = slot_info["rect"]
         inv_index = slot_info["inv_index"]
+        container = slot_info.get("container", game_state.world.inventory)
 
         if rect and rect.collidepoint(mouse_pos):
             # Ensure index is valid before accessing inventory
-            if 0 <= inv_index < len(game_state.inventory):
-                slot_item = game_state.inventory[inv_index] # ItemStack or None
-                held = game_state.held_item # ItemStack or None
+            if 0 <= inv_index < len(container):
+                slot_item = container[inv_index] # ItemStack or None
+                held = game_state.world.held_item # ItemStack or None
                 inventory_changed = False # Flag not strictly needed here, but can be useful
-
-                if button_type == 1: # Left Click
+                # Journal the two slots this click can change
+                transactions.record(container, inv_index)
+                transactions.record(transactions.held_slot(), None)
+
+                if button_type == 1 and shift_pressed and held is None and slot_item is not None and \
+                   game_state.current_screen == constants.STORAGE_SCREEN:
+                    # Shift-click: move the whole stack between the chest and the inventory
+                    chest = storage.current_container()
+                    if chest is not None:
+                        stack_quantity = slot_item.quantity # The stack keeps only the leftover after a partial move
+                        if container is game_state.world.inventory:
+                            moved = storage.store_slot(chest, inv_index)
+                            if moved < stack_quantity:
+                                game_state.world.status_message = "Chest full!"
+                        else:
+                            moved = storage.take_slot(chest, inv_index)
+                            if moved < stack_quantity:
+                                game_state.world.status_message = "Inventory full!"
+                elif button_type == 1: # Left Click
                     if held is None and slot_item is not None:
                         # Pick up whole stack from inventory
-                        game_state.held_item = slot_item
-                        game_state.inventory[inv_index] = None
+                        game_state.world.held_item = slot_item
+                        container[inv_index] = None
                         # inventory_changed = True
                     elif held is not None and slot_item is None:
                         # Place whole held stack into empty inventory slot
-                        game_state.inventory[inv_index] = held
-                        game_state.held_item = None
+                        container[inv_index] = held
+                        game_state.world.held_item = None
                         # inventory_changed = True
                     elif held is not None and slot_item is not None:
                         if held.item_id == slot_item.item_id:
@@ -154,12 +201,12 @@ def _handle_crafting_click(mouse_pos, event):
                                 added_now = slot_item.add(can_add_qty) # Use return value
                                 held.quantity -= added_now # Decrease held by amount added
                                 if held.quantity <= 0:
-                                    game_state.held_item = None
+                                    game_state.world.held_item = None
                                 # inventory_changed = True # Quantity changed
                         else:
                             # Swap items between held and inventory slot
-                            game_state.inventory[inv_index] = held
-                            game_state.held_item = slot_item
+                            container[inv_index] = held
+                            game_state.world.held_item = slot_item
                             # inventory_changed = True
 
                 elif button_type == 3: # Right Click
@@ -168,24 +215,24 @@ def _handle_crafting_click(mouse_pos, event):
                         take_qty = math.ceil(slot_item.quantity / 2) # Round up
                         if take_qty > 0:
                             try:
-                                game_state.held_item = game_state.ItemStack(slot_item.item_id, take_qty)
+                                game_state.world.held_item = game_state.ItemStack(slot_item.item_id, take_qty)
                                 slot_item.quantity -= take_qty
                                 if slot_item.quantity <= 0:
-                                    game_state.inventory[inv_index] = None
+                                    container[inv_index] = None
                                 # inventory_changed = True
                             except ValueError as e:
-                                print(f"Error creating ItemStack on inventory right-click pickup: {e}")
+                                logger.error(f"Error creating ItemStack on inventory right-click pickup: {e}")
 
                     elif held is not None:
                         # Place one item into inventory slot
                         if slot_item is None:
                             # Place one into empty slot
                             try:
-                                game_state.inventory[inv_index] = game_state.ItemStack(held.item_id, 1)
+                                container[inv_index] = game_state.ItemStack(held.item_id, 1)
                                 held.quantity -= 1
                                 # inventory_changed = True
                             except ValueError as e:
-                                print(f"Error creating ItemStack on inventory right-click place: {e}")
+                                logger.error(f"Error creating ItemStack on inventory right-click place: {e}")
                         elif slot_item.item_id == held.item_id:
                             # Place one onto existing stack (if space)
                             if slot_item.can_add(1) > 0:
@@ -197,23 +244,23 @@ def _handle_crafting_click(mouse_pos, event):
 
                         # If held stack is now empty, clear it
                         if held.quantity <= 0:
-                            game_state.held_item = None
+                            game_state.world.held_item = None
 
                 # No need to update layout immediately, drawing handles current state
                 return True # Click was handled by an inventory slot
             else:
-                print(f"Warning: Clicked inventory rect corresponds to invalid index {inv_index}")
+                logger.warning(f"Clicked inventory rect corresponds to invalid index {inv_index}")
                 return True # Consume click anyway
 
     # --- Check Result Slot ---
     rect = game_state.crafting_result_rect
     if rect and rect.collidepoint(mouse_pos):
-        result_item_template = game_state.crafting_result_slot # The potential result ItemStack
-        held = game_state.held_item
+        result_item_template = game_state.world.crafting_result_slot # The potential result ItemStack
+        held = game_state.world.held_item
 
         if result_item_template is not None: # Can only interact if there's a result
             # Find the recipe that produced this result *again* to ensure consistency
-            matched_recipe = game_logic.find_matching_recipe(game_state.crafting_grid)
+            matched_recipe = game_logic.find_matching_recipe(game_state.world.crafting_grid)
 
             # Check if the current result slot *still* matches the recipe's output
             if matched_recipe and matched_recipe['result']['item_id'] == result_item_template.item_id:
@@ -221,7 +268,7 @@ def _handle_crafting_click(mouse_pos, event):
                 qty_per_craft = matched_recipe['result']['quantity']
 
                 # Calculate how many times we *can* craft this recipe
-                max_possible_crafts = game_logic.calculate_max_crafts(matched_recipe, game_state.crafting_grid)
+                max_possible_crafts = game_logic.calculate_max_crafts(matched_recipe, game_state.world.crafting_grid)
 
                 if max_possible_crafts > 0:
                     if button_type == 1: # Left Click (Craft/Take)
@@ -244,81 +291,85 @@ def _handle_crafting_click(mouse_pos, event):
                                 # Not enough space in held stack for all, try adding to inventory instead
                                 can_pickup = True
                                 pickup_destination = "inventory"
-                                print(f"Not enough space in held stack ({space_in_held}) for {total_qty_to_receive}. Will add to inventory.")
+                                logger.debug("Not enough space in held stack (%d) for %d. Will add to inventory.", space_in_held, total_qty_to_receive)
                         else:
                             # Holding different item, cannot pick up result directly
-                            print(f"Cannot pick up result: Held item mismatch ({held.name} vs {result_item_template.name}).")
+                            logger.debug("Cannot pick up result: Held item mismatch (%s vs %s).", held.name, result_item_template.name)
                             can_pickup = False
 
 
                         if can_pickup:
-                            print(f"Attempting to craft {craft_multiplier}x ({total_qty_to_receive} total) {result_item_template.name}...")
+                            logger.debug("Attempting to craft %dx (%d total) %s...", craft_multiplier, total_qty_to_receive, result_item_template.name)
 
                             # --- Crafting Execution ---
+                            # Grid slots are journaled by consume_crafting_ingredients and
+                            # inventory slots by add_items_to_inventory; journal the held stack here
+                            transactions.record(transactions.held_slot(), None)
                             # 1. Consume ingredients (using the calculated multiplier)
                             if game_logic.consume_crafting_ingredients(matched_recipe, craft_multiplier):
-                                print(f"Ingredients consumed for {craft_multiplier} crafts.")
+                                logger.debug("Ingredients consumed for %d crafts.", craft_multiplier)
 
                                 # 2. Give result to player
                                 if pickup_destination == "held":
                                     added_now = held.add(total_qty_to_receive) # Use return value
                                     if added_now != total_qty_to_receive: # Should not happen if space check was correct
-                                        print(f"Warning: Added {added_now}/{total_qty_to_receive} to held stack.")
-                                    print(f"Added crafted items to held stack, new qty: {held.quantity}")
+                                        logger.debug("Added %d/%d to held stack.", added_now, total_qty_to_receive)
+                                    logger.debug("Added crafted items to held stack, new qty: %d", held.quantity)
                                 elif pickup_destination == "inventory":
                                     items_lost = game_logic.add_items_to_inventory(result_item_id, total_qty_to_receive)
                                     if items_lost > 0:
-                                        print(f"Warning: Inventory full after crafting. {items_lost} items lost.")
-                                        game_state.status_message = f"Inventory full! {items_lost} {result_item_template.name}(s) lost."
+                                        logger.warning(f"Inventory full after crafting. {items_lost} items lost.")
+                                        game_state.world.status_message = f"Inventory full! {items_lost} {result_item_template.name}(s) lost."
                                     else:
-                                        print(f"Added {total_qty_to_receive} {result_item_template.name} to inventory.")
+                                        logger.debug("Added %d %s to inventory.", total_qty_to_receive, result_item_template.name)
 
                                 # 3. IMPORTANT: Update grid/result *after* successful craft
                                 game_logic.update_crafting_result() # Check if another craft is possible
-                                print(f"Result slot updated after crafting. New result: {game_state.crafting_result_slot}")
+                                logger.debug("Result slot updated after crafting. New result: %s", game_state.world.crafting_result_slot)
 
                             else:
-                                print(f"Failed to consume ingredients for {craft_multiplier} crafts. Crafting aborted.")
+                                logger.error(f"Failed to consume ingredients for {craft_multiplier} crafts. Crafting aborted.")
                                 # If consumption failed, the grid wasn't changed, result slot remains.
 
                     elif button_type == 3: # Right click on result slot
-                         print("Right-click on result slot - no action defined.")
+                         logger.debug("Right-click on result slot - no action defined.")
 
                 else: # max_possible_crafts == 0
-                    print("Cannot craft: Not enough ingredients available.")
+                    logger.debug("Cannot craft: Not enough ingredients available.")
 
                 return True # Handled click on result slot (even if crafting failed)
 
             else:
                 # Mismatch between displayed result and current recipe match. Re-evaluate.
-                print("Result slot/Recipe mismatch detected. Re-evaluating result.")
+                logger.debug("Result slot/Recipe mismatch detected. Re-evaluating result.")
                 game_logic.update_crafting_result()
                 return True # Consume the click even if the result changed
 
     # --- Click outside interactive areas ---
     # If holding an item and clicked empty space, drop it back into inventory
     # Check button type 1 (left click) to avoid triggering on right-click release etc.
-    if game_state.held_item is not None and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+    if game_state.world.held_item is not None and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
          # Check if the click was *not* handled by any UI element above
          # This requires the function to return False if no element was hit
          # (The current structure already does this)
 
-         held = game_state.held_item
-         print(f"Clicked outside UI with {held.name}. Returning to inventory.")
+         held = game_state.world.held_item
+         transactions.record(transactions.held_slot(), None)
+         logger.debug("Clicked outside UI with %s. Returning to inventory.", held.name)
          # Use the proper inventory adding function
          items_lost = game_logic.add_items_to_inventory(held.item_id, held.quantity)
          if items_lost == 0:
-             print(f"Returned {held.quantity} {held.name} to inventory.")
-             game_state.held_item = None # Clear held item only if successfully returned
+             logger.debug("Returned %d %s to inventory.", held.quantity, held.name)
+             game_state.world.held_item = None # Clear held item only if successfully returned
          elif items_lost < held.quantity:
              # Partially returned
              returned_qty = held.quantity - items_lost
-             print(f"Partially returned {returned_qty} {held.name} to inventory. {items_lost} remain held (inventory full).")
+             logger.debug("Partially returned %d %s to inventory. %d remain held (inventory full).", returned_qty, held.name, items_lost)
              held.quantity = items_lost # Update held item quantity
-             game_state.status_message = f"Inventory full! Could only return {returned_qty}."
+             game_state.world.status_message = f"Inventory full! Could only return {returned_qty}."
          else: # items_lost == held.quantity
-             print(f"Could not return {held.name} to inventory (full). Item remains held.")
-             game_state.status_message = f"Inventory full! Cannot drop item."
+             logger.debug("Could not return %s to inventory (full). Item remains held.", held.name)
+             game_state.world.status_message = f"Inventory full! Cannot drop item."
          # No layout update needed, drawing handles current state
          return True # Handled click (by attempting to drop item)
 
@@ -346,11 +397,12 @@ def process_events():
                 game_state.screen = pygame.display.set_mode((new_width, new_height), pygame.RESIZABLE)
                 needs_layout_update = True
             except pygame.error as e:
-                print(f"Error resizing window: {e}")
+                logger.error(f"Error resizing window: {e}")
 
 
         elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_f: # Fullscreen toggle
+            # 'F' types into the search box on searchable screens, F11 always toggles fullscreen
+            if event.key == pygame.K_F11 or (event.key == pygame.K_f and game_state.current_screen not in constants.SEARCHABLE_SCREENS): # Fullscreen toggle
                 game_state.fullscreen = not game_state.fullscreen
                 if game_state.fullscreen:
                     game_state.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
@@ -360,6 +412,17 @@ def process_events():
                     game_state.screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), pygame.RESIZABLE)
                 needs_layout_update = True
 
+            elif game_state.current_screen in constants.SLOT_SCREENS and \
+                 (event.mod & pygame.KMOD_CTRL) and event.key in (pygame.K_z, pygame.K_y):
+                # Undo (Ctrl+Z) / Redo (Ctrl+Y or Ctrl+Shift+Z) of slot/held item changes
+                if event.key == pygame.K_y or (event.mod & pygame.KMOD_SHIFT):
+                    changed = transactions.redo()
+                else:
+                    changed = transactions.undo()
+                if changed:
+                    game_logic.update_crafting_result()
+                    needs_layout_update = True # Search filter may show different slots now
+
             elif game_state.current_screen == constants.ASK_QUANTITY:
                 if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
                     _handle_quantity_confirmation()
@@ -370,12 +433,12 @@ def process_events():
                     game_state.accumulated_input = game_state.accumulated_input[:-1]
                 elif event.unicode.isdigit():
                     # Limit input length and potential value
-                    if len(game_state.accumulated_input) < 2: # Max 2 digits for 1-64
+                    if len(game_state.accumulated_input) < len(str(constants.MAX_MINING_QUANTITY)):
                          temp_input = game_state.accumulated_input + event.unicode
                          try:
-                            # Prevent entering numbers > 64 or leading zeros like "05"
+                            # Prevent entering numbers > MAX_MINING_QUANTITY or leading zeros like "05"
                             parsed_num = int(temp_input)
-                            if parsed_num <= 64:
+                            if parsed_num <= constants.MAX_MINING_QUANTITY:
                                 # Allow single '0' but not multi-digit numbers starting with '0'
                                 if len(temp_input) > 1 and temp_input.startswith('0'):
                                      pass # Don't update if it's like "05"
@@ -383,13 +446,25 @@ def process_events():
                                      game_state.accumulated_input = temp_input
                          except ValueError: pass # Should not happen if isdigit() passed
 
+            elif game_state.current_screen in constants.SEARCHABLE_SCREENS:
+                # Type-to-filter: each key narrows the visible slots/buttons via the prefix index
+                previous_search = game_state.search_text
+                if event.key == pygame.K_BACKSPACE:
+                    game_state.search_text = game_state.search_text[:-1]
+                elif event.key == pygame.K_ESCAPE:
+                    game_state.search_text = ""
+                elif event.unicode and event.unicode.isprintable() and len(game_state.search_text) < constants.MAX_SEARCH_LENGTH:
+                    game_state.search_text += event.unicode
+                if game_state.search_text != previous_search:
+                    needs_layout_update = True
+
 
         elif event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = pygame.mouse.get_pos()
             click_handled_by_ui = False # Flag to track if UI element handled the click
 
             # --- Handle Crafting/Inventory Screen Clicks Separately ---
-            if game_state.current_screen in [constants.CRAFTING_SCREEN, constants.INVENTORY_SCREEN]:
+            if game_state.current_screen in constants.SLOT_SCREENS:
                  # Let the helper handle interactions with slots/inventory/result
                  # Note: _handle_crafting_click also handles inventory clicks on crafting screen
                  if _handle_crafting_click(mouse_pos, event):
@@ -413,7 +488,7 @@ def process_events():
 
             # --- Handle dropping held item if click was NOT on UI ---
             # This logic was moved inside _handle_crafting_click, but let's ensure it works
-            # if game_state.held_item is not None and event.button == 1 and not click_handled_by_ui:
+            # if game_state.world.held_item is not None and event.button == 1 and not click_handled_by_ui:
             #      # This case should now be covered by the last part of _handle_crafting_click
             #      # If _handle_crafting_click returns False, it means no UI element was hit
             #      # and it will attempt to drop the item.
@@ -432,38 +507,35 @@ def process_events():
                     if button.get("pressed") and button.get("rect") and button["rect"].collidepoint(mouse_pos):
                         clicked_button_action = button["action"]
                         clicked_button_data = button["data"]
-                        print(f"Button clicked: {button['text']} (Action: {clicked_button_action}, Data: {clicked_button_data})") # Debug
+                        logger.debug("Button clicked: %s (Action: %s, Data: %s)", button['text'], clicked_button_action, clicked_button_data)
                     button["pressed"] = False # Reset pressed state regardless
 
                 # --- Handle Button Actions ---
                 if clicked_button_action:
-                    game_state.status_message = "" # Clear status on most actions
+                    game_state.world.status_message = "" # Clear status on most actions
 
                     if clicked_button_action == "quit_game":
                         game_state.running = False
                     elif clicked_button_action == "save_and_exit_to_select":
-                        if game_state.current_world_id is not None:
+                        if game_state.world.world_id is not None:
                             # --- Clear crafting/held state when exiting world ---
-                            if game_state.held_item: # Return held item first
-                                items_lost = game_logic.add_items_to_inventory(game_state.held_item.item_id, game_state.held_item.quantity)
-                                if items_lost > 0: print(f"Warning: {items_lost} held items lost on exit (inventory full).")
-                                game_state.held_item = None
-                            game_state.crafting_grid = [[None for _ in range(game_state.CRAFTING_GRID_SIZE)] for _ in range(game_state.CRAFTING_GRID_SIZE)]
-                            game_state.crafting_result_slot = None
+                            if game_state.world.held_item: # Return held item first
+                                items_lost = game_logic.add_items_to_inventory(game_state.world.held_item.item_id, game_state.world.held_item.quantity)
+                                if items_lost > 0: logger.warning(f"{items_lost} held items lost on exit (inventory full).")
+                                game_state.world.held_item = None
+                            game_state.world.clear_crafting()
                             # ---
-                            save_manager.save_game(game_state.current_world_id) # Save game
-                            game_state.current_world_id = None
+                            save_manager.save_game(game_state.world.world_id) # Save game (including unfinished mining jobs)
+                            # Unfinished mining jobs continue from the save when the world is loaded again
+                            game_state.world = world.World() # Comes with an empty undo history
                             game_state.current_screen = constants.SELECT_WORLD
                             needs_layout_update = True
                     elif clicked_button_action == "select_world":
                         selected_slot = clicked_button_data
-                        # --- Clear crafting/held state when loading world ---
-                        game_state.held_item = None # Discard any held item from previous state
-                        game_state.crafting_grid = [[None for _ in range(game_state.CRAFTING_GRID_SIZE)] for _ in range(game_state.CRAFTING_GRID_SIZE)]
-                        game_state.crafting_result_slot = None
-                        # ---
-                        if save_manager.load_game(selected_slot):
-                            game_state.current_world_id = selected_slot
+                        # Load into a fresh World (nothing carries over from the previous one)
+                        loaded_world = world.World(selected_slot)
+                        if save_manager.load_game(selected_slot, loaded_world):
+                            game_state.world = loaded_world # Undo history is per world, nothing carries over
                             game_state.current_screen = constants.MAIN_MENU
                             needs_layout_update = True
                         else:
@@ -471,23 +543,46 @@ def process_events():
                             pass
                     elif clicked_button_action == "goto_main":
                         # --- Clear crafting state when leaving crafting screen ---
-                        if previous_screen == constants.CRAFTING_SCREEN or previous_screen == constants.INVENTORY_SCREEN:
-                             if game_state.held_item: # Return held item to inventory
-                                 items_lost = game_logic.add_items_to_inventory(game_state.held_item.item_id, game_state.held_item.quantity)
+                        if previous_screen in constants.SLOT_SCREENS:
+                             if game_state.world.held_item: # Return held item to inventory
+                                 items_lost = game_logic.add_items_to_inventory(game_state.world.held_item.item_id, game_state.world.held_item.quantity)
                                  if items_lost > 0:
-                                     game_state.status_message = f"Inv full! {items_lost} {game_state.held_item.name}(s) lost."
-                                     print(f"Warning: Discarding held item {game_state.held_item} as inventory is full on screen change.")
-                                 game_state.held_item = None
+                                     game_state.world.status_message = f"Inv full! {items_lost} {game_state.world.held_item.name}(s) lost."
+                                     logger.warning(f"Discarding held item {game_state.world.held_item} as inventory is full on screen change.")
+                                 game_state.world.held_item = None
                              # Only clear crafting grid if coming from crafting screen
                              if previous_screen == constants.CRAFTING_SCREEN:
-                                 game_state.crafting_grid = [[None for _ in range(game_state.CRAFTING_GRID_SIZE)] for _ in range(game_state.CRAFTING_GRID_SIZE)]
-                                 game_state.crafting_result_slot = None
+                                 game_state.world.clear_crafting()
                         # ---
                         game_state.current_screen = constants.MAIN_MENU
                     elif clicked_button_action == "goto_mining":
                         game_state.current_screen = constants.MINING_MENU
                     elif clicked_button_action == "goto_inventory":
                         game_state.current_screen = constants.INVENTORY_SCREEN
+                    elif clicked_button_action == "goto_mining_jobs":
+                        game_state.current_screen = constants.MINING_INPROGRESS
+                    elif clicked_button_action == "goto_storage":
+                        if storage.current_container() is not None:
+                            game_state.current_screen = constants.STORAGE_SCREEN
+                    elif clicked_button_action in ("storage_prev_page", "storage_next_page"):
+                        container = storage.current_container()
+                        if container is not None:
+                            step = -1 if clicked_button_action == "storage_prev_page" else 1
+                            game_state.storage_page = (game_state.storage_page + step) % container.page_count()
+                            needs_layout_update = True # Slots now show a different page
+                    elif clicked_button_action == "cycle_container":
+                        if game_state.world.storage_containers:
+                            game_state.current_container = (game_state.current_container + 1) % len(game_state.world.storage_containers)
+                            game_state.storage_page = 0
+                            needs_layout_update = True
+                    elif clicked_button_action == "storage_store_all":
+                        container = storage.current_container()
+                        if container is not None:
+                            with transactions.transaction(history=True): # One undo step for the whole move
+                                moved = storage.store_all(container)
+                            game_state.world.status_message = f"Stored {moved} item(s)." if moved else "Nothing stored."
+                            if any(stack is not None for stack in game_state.world.inventory):
+                                game_state.world.status_message += " Chest full!"
                     elif clicked_button_action == "goto_crafting":
                         game_state.current_screen = constants.CRAFTING_SCREEN
                         # Initial recipe check when entering screen
@@ -499,6 +594,15 @@ def process_events():
                     elif clicked_button_action == "confirm_quantity":
                          _handle_quantity_confirmation()
                          # Layout update handled below based on screen change
+                    elif clicked_button_action == "sort_inventory":
+                        with transactions.transaction(history=True): # Sorting can be undone in one step
+                            game_logic.sort_and_compact_inventory(game_state.inventory_sort_key)
+                    elif clicked_button_action == "cycle_sort_key":
+                        sort_keys = game_logic.INVENTORY_SORT_KEYS
+                        current_index = sort_keys.index(game_state.inventory_sort_key) if game_state.inventory_sort_key in sort_keys else -1
+                        game_state.inventory_sort_key = sort_keys[(current_index + 1) % len(sort_keys)]
+                        game_state.world.status_message = f"Sort order: {game_state.inventory_sort_key}"
+                        needs_layout_update = True # Re-render the button text
 
                     # Check if screen change requires layout update
                     if game_state.current_screen != previous_screen:
@@ -509,6 +613,14 @@ def process_events():
             # No specific action needed here for inventory/grid clicks on MOUSEBUTTONUP
 
 
+    # Search box text only applies to the screen it was typed on
+    if game_state.current_screen != previous_screen:
+        game_state.search_text = ""
+        # Undo history only covers the crafting/inventory visit it was made in
+        # (leaving returns the held item and may replace the crafting grid rows)
+        if previous_screen in constants.SLOT_SCREENS:
+            transactions.clear_history()
+
     # Update layout if flagged by resize, screen change, or specific actions
     if needs_layout_update:
         current_width, current_height = game_state.screen.get_size()
@@ -0,0 +1,100 @@
+# game_clock.py
+# The clock that game logic reads the time from (mining jobs, saves).
+#
+# Game code calls game_clock.now() (seconds of game time) and game_clock.wall_time()
+# (a time.time()-style timestamp, used for saved start times) instead of calling
+# pygame.time.get_ticks() or time.time() directly. The active clock can be swapped with
+# set_clock(), so the logic does not need pygame and tests/benchmarks can run faster
+# than real time:
+#   RealClock    - real time (the default)
+#   ScaledClock  - another clock sped up or slowed down by a factor
+#   SteppedClock - only moves when advance() is called (fast-forward hours in one call)
+import time
+
+
+class RealClock:
+    """Real time. now() counts seconds since the clock was created."""
+    def __init__(self):
+        self._origin = time.monotonic()
+
+    def now(self) -> float:
+        return time.monotonic() - self._origin
+
+    def wall_time(self) -> float:
+        return time.time()
+
+
+class ScaledClock:
+    """Runs 'scale' times faster than 'base' (a RealClock by default). The scale can be changed while running."""
+    def __init__(self, scale: float = 1.0, base=None):
+        self._base = base if base is not None else RealClock()
+        self._scale = scale
+        self._base_origin = self._base.now()
+        self._scaled_origin = 0.0 # Scaled time at _base_origin
+        self._wall_offset = 0.0   # Extra wall-clock seconds gained by running faster
+
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale: float):
+        # Restart the scaled segment from the current time so time does not jump
+        now = self.now()
+        self._wall_offset = self.wall_time() - self._base.wall_time()
+        self._base_origin = self._base.now()
+        self._scaled_origin = now
+        self._scale = scale
+
+    def now(self) -> float:
+        return self._scaled_origin + (self._base.now() - self._base_origin) * self._scale
+
+    def wall_time(self) -> float:
+        # Wall time moves at the same (scaled) speed, so saved start times stay consistent
+        elapsed = self._base.now() - self._base_origin
+        return self._base.wall_time() + self._wall_offset + elapsed * (self._scale - 1.0)
+
+
+class SteppedClock:
+    """Manual clock: time only moves when advance() is called."""
+    def __init__(self, start: float = 0.0, wall_start: float = None):
+        self._now = start
+        self._wall_origin = (time.time() if wall_start is None else wall_start) - start
+
+    def advance(self, seconds: float) -> float:
+        """Moves the clock forward. Returns the new time."""
+        if seconds < 0:
+            raise ValueError("SteppedClock cannot go backwards.")
+        self._now += seconds
+        return self._now
+
+    def now(self) -> float:
+        return self._now
+
+    def wall_time(self) -> float:
+        return self._wall_origin + self._now
+
+
+# --- Active Clock ---
+_clock = RealClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """Makes 'clock' the clock read by now()/wall_time(). Returns the previous clock."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+def now() -> float:
+    """Current game time in seconds."""
+    return _clock.now()
+
+
+def wall_time() -> float:
+    """Current wall-clock timestamp (seconds since the epoch) of the active clock."""
+    return _clock.wall_time()
@@ -0,0 +1,101 @@
+# game_log.py
+# Logging setup for the game, the headless engine, the game server and the tools.
+#
+# Every module logs through its own logger ("logger = logging.getLogger(__name__)") instead of
+# print(), with a level per message:
+#   DEBUG   - per-action chatter (button clicks, every mining job, every texture)
+#   INFO    - progress of loading/saving
+#   WARNING - something was skipped or repaired
+#   ERROR   - something failed
+# Messages below the configured level are dropped before they are formatted, so the debug
+# lines in hot code paths cost one level check when they are off. Hot paths pass their
+# values as arguments ("logger.debug('Mining %s', name)") rather than building an f-string.
+#
+# The level comes from constants.LOG_LEVEL, or the BUTTONS_LOG_LEVEL environment variable
+# when it is set (DEBUG, INFO, WARNING, ERROR, CRITICAL or OFF), so a build can run silent
+# ("BUTTONS_LOG_LEVEL=OFF") without code changes. With constants.LOG_ASYNC (or
+# BUTTONS_LOG_ASYNC=1) messages are handed to a background thread through a queue and
+# written there, so a slow terminal or pipe never blocks the game loop.
+#
+# Only entry points (the game, engine.py, game_server.py, economy_sim.py, data_bundle.py)
+# call setup_logging(); modules imported by something else leave the logging setup alone.
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import constants
+
+LEVEL_ENV_VAR = "BUTTONS_LOG_LEVEL"
+ASYNC_ENV_VAR = "BUTTONS_LOG_ASYNC"
+LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+OFF = logging.CRITICAL + 10 # Above every level: nothing is logged
+
+_listener = None # QueueListener of the asynchronous handler, if one is running
+
+
+def _parse_level(value):
+    """Level number for a name like 'info' or 'OFF' (or a number). None if it is not a level."""
+    text = str(value).strip().upper()
+    if text == "OFF":
+        return OFF
+    if text.isdigit():
+        return int(text)
+    level = logging.getLevelName(text)
+    return level if isinstance(level, int) else None
+
+
+def configured_level() -> int:
+    """The level from the environment variable, or else constants.LOG_LEVEL."""
+    for value in (os.environ.get(LEVEL_ENV_VAR), constants.LOG_LEVEL):
+        if value:
+            level = _parse_level(value)
+            if level is not None:
+                return level
+    return logging.INFO
+
+
+def setup_logging(level=None, use_async=None, stream=None) -> None:
+    """
+    Configures the root logger (replacing an earlier setup_logging call). 'level' and
+    'use_async' default to the environment variables / constants; 'stream' defaults to stdout.
+    """
+    global _listener
+    if level is None:
+        level = configured_level()
+    elif isinstance(level, str):
+        level = _parse_level(level) or logging.INFO
+    if use_async is None:
+        env_async = os.environ.get(ASYNC_ENV_VAR)
+        use_async = constants.LOG_ASYNC if env_async is None else env_async.strip().lower() in ("1", "true", "yes")
+
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if use_async:
+        # The game thread only puts records on the queue; the listener thread formats and writes them
+        log_queue = queue.SimpleQueue()
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root.addHandler(stream_handler)
+    root.setLevel(level)
+    logging.disable(logging.NOTSET if level < OFF else logging.CRITICAL)
+
+
+def shutdown_logging() -> None:
+    """Writes out the messages still in the queue and stops the background thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -1,12 +1,19 @@
 # /Users/newenoch/Documents/Visual Studio Code/Minecraft (Buttons)/1.0.1/game_logic.py
-import pygame
+import logging
 import time
 import game_state
 import constants
-import mine_speeds
-# Correct import path for display_manager inside ui_manager folder
-# Assuming main.py is in 1.0.1/ and ui_manager is a subfolder
-from ui_manager import display_manager # Adjusted import
+import inventory_store
+import transactions
+import game_clock
+
+# NumPy is optional - used for whole-catalog mining time queries when available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
 
 # --- Recipe Data ---
 # Store recipes after item IDs are known. Use a function to initialize.
@@ -19,7 +26,7 @@ def initialize_recipes():
     """
     global RECIPES_2x2
     RECIPES_2x2 = [] # Clear previous recipes if any
-    print("Initializing crafting recipes...")
+    logger.info("Initializing crafting recipes...")
 
     # Get item IDs safely using the name-to-ID map
     item_ids = {name: id for name, id in game_state.item_name_to_id.items()}
@@ -32,7 +39,7 @@ def initialize_recipes():
     required_items = {"Oak log": oak_log_id, "Oak Planks": oak_planks_id, "Stick": stick_id, "Crafting Table": crafting_table_id}
     if not all(required_items.values()):
         missing = [name for name, id_val in required_items.items() if id_val is None]
-        print(f"ERROR: Missing essential item IDs for recipe initialization: {missing}. Crafting may be disabled or broken.")
+        logger.error(f"Missing essential item IDs for recipe initialization: {missing}. Crafting may be disabled or broken.")
         return # Stop initialization if core items are missing
 
     # --- Define Recipes (Ensure IDs are valid before adding) ---
@@ -79,197 +86,204 @@ def initialize_recipes():
             'result': {'item_id': crafting_table_id, 'quantity': 1}
         })
 
-    print(f"Initialized {len(RECIPES_2x2)} crafting recipes.")
+    logger.info(f"Initialized {len(RECIPES_2x2)} crafting recipes.")
 
 
 # --- Mining Logic ---
 
-def calculate_mining_time(block_id):
+def calculate_mining_time(block_id, tool_name=None, world=None):
     """
-    Calculates mining time based on block data and the currently equipped tool.
-    Assumes game_state.equipped_tool_name and game_state.tool_stats are populated.
+    Returns the seconds needed to mine one block with a tool (default: the world's equipped tool).
+    This is a single lookup in the matrix precompiled by data_loader.build_mining_time_matrix(),
+    which already resolved missing speeds, wrong tool types and tiers without a speed.
     """
-    # Use item_id_to_name for lookup now
-    block_name = game_state.item_id_to_name.get(block_id)
-    if not block_name:
-        print(f"Warning: Unknown block ID {block_id} requested for mining time.")
+    if tool_name is None:
+        tool_name = (world or game_state.world).equipped_tool_name
+    tool_id = game_state.tool_name_to_id.get(tool_name, 0) if tool_name else 0 # Unknown tool -> bare hands
+    mining_times = game_state.mining_times
+    if not 0 < block_id < len(mining_times):
+        logger.warning(f"Unknown block ID {block_id} requested for mining time.")
         return constants.DEFAULT_MINING_TIME
+    return float(mining_times[block_id][tool_id]) # Speed in seconds
+
+
+def fastest_tools() -> dict:
+    """
+    Returns {block_id: (tool_name or None, seconds)} with the fastest tool for every mineable block.
+    Uses one vectorised argmin over the whole matrix when NumPy is available.
+    """
+    tool_names = [None] + sorted(game_state.tool_name_to_id, key=game_state.tool_name_to_id.get)
+    mining_times = game_state.mining_times
+    if np is not None and isinstance(mining_times, np.ndarray) and mining_times.size:
+        best_columns = mining_times.argmin(axis=1)
+        best_times = mining_times[np.arange(len(mining_times)), best_columns]
+    else:
+        best_columns = [min(range(len(row)), key=row.__getitem__) for row in mining_times]
+        best_times = [row[column] for row, column in zip(mining_times, best_columns)]
+    return {
+        block_id: (tool_names[best_columns[block_id]], float(best_times[block_id]))
+        for block_id in game_state.mine_list if 0 < block_id < len(mining_times)
+    }
 
-    # Use item_data which is keyed by ID
-    block_data = game_state.item_data.get(block_id)
-    if not block_data:
-        print(f"Warning: No mining data found for block '{block_name}' (ID: {block_id}).")
-        return constants.DEFAULT_MINING_TIME
 
-    # Get base time from item_data (assuming it's stored there now)
-    # Need to adjust this based on how mine_speeds.py data is stored in item_data
-    # For now, let's assume 'mine_time' exists in item_data[block_id]
-    # OR we still need to access mine_speeds using the name
-    # Let's revert to using mine_speeds for the detailed speed info for now
-    mine_speed_data = game_state.mine_speeds.get(block_name)
-    if not mine_speed_data:
-         print(f"Warning: No detailed speed data in game_state.mine_speeds for '{block_name}'. Using default.")
-         return constants.DEFAULT_MINING_TIME
-
-    speeds = mine_speed_data.get("speeds", {})
-    required_tool_type = mine_speed_data.get("tool") # e.g., "axe", "pickaxe", None
-    default_speed = speeds.get("default") # Get the block's specific default speed
-
-    # Fallback if the block's default speed is missing for some reason
-    if default_speed is None:
-        print(f"Warning: Block '{block_name}' is missing a 'default' speed in mine_speeds.py. Using global default.")
-        default_speed = constants.DEFAULT_MINING_TIME
-
-    # --- Tool Logic ---
-    final_speed = default_speed # Start with the block's default speed
-    equipped_tool_name = getattr(game_state, 'equipped_tool_name', None) # Safely get equipped tool name
-    tool_stats_data = getattr(game_state, 'tool_stats', {}) # Safely get tool stats
-
-    if equipped_tool_name and tool_stats_data:
-        tool_info = tool_stats_data.get(equipped_tool_name)
-        if tool_info:
-            equipped_tool_type = tool_info.get("type")
-            equipped_tool_tier = tool_info.get("tier") # e.g., "wooden", "stone"
-
-            # Check if the equipped tool is the correct type for the block
-            if equipped_tool_type == required_tool_type:
-                # Get the speed for this specific tool tier
-                tier_speed = speeds.get(equipped_tool_tier)
-
-                if tier_speed is not None:
-                    # Use the specific tool tier speed if defined
-                    final_speed = tier_speed
-                    # print(f"Using {equipped_tool_tier} {equipped_tool_type} speed for {block_name}: {final_speed}s") # Debug
-                else: # If tier_speed is None, it means this tool tier can't break it efficiently or at all
-                    # We already initialized final_speed to default_speed, so we keep that.
-                    # print(f"Tool tier '{equipped_tool_tier}' not listed for {block_name}, using default speed: {final_speed}s") # Debug
-                    pass # Keep default speed
-
-            else: #Tool type is wrong, use the default speed (already set)
-                # print(f"Equipped tool type '{equipped_tool_type}' is wrong for {block_name} (needs '{required_tool_type}'). Using default speed: {final_speed}s") # Debug
-                pass # Keep default speed
-
-        else: #Equipped tool name exists, but no stats found (shouldn't happen if loaded correctly)
-            print(f"Warning: Stats not found for equipped tool '{equipped_tool_name}'. Using default speed.") # Debug
-
-    else: #No tool equipped or tool stats not loaded
-        # print(f"No tool equipped or stats unavailable. Using default speed for {block_name}: {final_speed}s") # Debug
-        pass # Keep default speed
-
-
-    # Handle cases where the calculated speed might still be None (e.g., shears/sword only blocks with no default)
-    if final_speed is None:
-         print(f"Warning: Could not determine a valid mining speed for {block_name} even with defaults. Using fallback.")
-         # Use the global default * 2 as a penalty/indicator
-         final_speed = constants.DEFAULT_MINING_TIME * 2
-
-    # Ensure speed is positive
-    if final_speed <= 0:
-        print(f"Warning: Calculated mining speed for {block_name} is zero or negative ({final_speed}). Setting to a small positive value.")
-        final_speed = 0.1 # Set a minimum time
-
-    return final_speed # Speed in seconds
-
-
-def start_mining(block_id, quantity):
-    """Initiates the mining process for a selected block and quantity."""
-    if not isinstance(quantity, int) or not 1 <= quantity <= 64:
-        game_state.status_message = f"Invalid quantity: {quantity}. Must be 1-64."
+def start_mining(block_id, quantity, tool_name=None, world=None):
+    """
+    Queues a mining job for a selected block and quantity (using the equipped tool by default).
+    The job runs in the background (see mining_jobs.py). Screen changes are left to the
+    caller (event_handler), so headless worlds never touch the UI state.
+    """
+    world = world or game_state.world
+    if not isinstance(quantity, int) or not 1 <= quantity <= constants.MAX_MINING_QUANTITY:
+        world.status_message = f"Invalid quantity: {quantity}. Must be 1-{constants.MAX_MINING_QUANTITY}."
         return False
 
     # Use item_id_to_name for lookup
     block_name = game_state.item_id_to_name.get(block_id)
     if not block_name or block_id == 0: # Ensure it's not "Back" and ID is valid
-        game_state.status_message = "Invalid block selected."
+        world.status_message = "Invalid block selected."
         return False
 
+    if tool_name is None:
+        tool_name = world.equipped_tool_name
+
     try:
-        single_block_time = calculate_mining_time(block_id)
-        total_duration = single_block_time * quantity
-
-        game_state.mining_quantity = quantity
-        game_state.selected_block_for_mining = block_id # Store ID
-        game_state.mining_start_time = pygame.time.get_ticks() / 1000.0 # Store start time in seconds
-        game_state.mining_duration = total_duration
-        game_state.mining_progress_text = f"Mining {quantity} {block_name}..."
-        game_state.current_screen = constants.MINING_INPROGRESS
-        game_state.status_message = "" # Clear previous status
-        print(f"Starting mining: {quantity} x {block_name} (ID: {block_id}), Duration: {total_duration:.2f}s")
+        if world.mining_jobs.is_full():
+            world.status_message = "Too many mining jobs! Wait for one to finish."
+            return False
+        asked = quantity
+        if world.resource_map is not None:
+            # The blocks are taken out of the world when the job is queued
+            quantity = world.resource_map.take(block_id, quantity)
+            if quantity == 0:
+                world.status_message = f"No {block_name} left to mine in this world."
+                return False
+
+        single_block_time = calculate_mining_time(block_id, tool_name, world)
+        now = game_clock.now() # Current game time in seconds
+        job = world.mining_jobs.add_job(block_id, quantity, single_block_time, tool_name, now)
+
+        if job.start_time is None:
+            world.status_message = f"Queued: {quantity} {block_name}(s) (waiting for a free slot)."
+        else:
+            world.status_message = f"Mining {quantity} {block_name}(s)... ({job.duration:.1f}s)"
+        if quantity < asked:
+            world.status_message += f" Only {quantity} left in this world."
+        logger.debug("Mining job %d: %d x %s (ID: %d), Duration: %.2fs", job.job_id, quantity, block_name, block_id, job.duration)
         return True
 
     except Exception as e:
-        game_state.status_message = f"Error starting mining: {e}"
-        print(f"Error in start_mining: {e}")
-        # Reset mining state
-        game_state.mining_quantity = 0
-        game_state.selected_block_for_mining = None
-        game_state.mining_start_time = 0
-        game_state.mining_duration = 0
-        game_state.mining_progress_text = ""
-        game_state.current_screen = constants.MINING_MENU # Go back to selection
+        world.status_message = f"Error starting mining: {e}"
+        logger.error(f"Error in start_mining: {e}")
         return False
 
 
+def update_mining(now, world=None) -> list:
+    """
+    Delivers the blocks mined by time 'now' (seconds) into the inventory, a few at a time
+    as each block's mining time passes. Called every frame by the main loop.
+    Returns the jobs that finished during this call.
+    """
+    world = world or game_state.world
+    finished = []
+    # Only looks at the earliest next-block time when nothing is due
+    for job, count in world.mining_jobs.collect_due_blocks(now):
+        # Deposited as whole stacks (full stacks + remainder), however many blocks are due.
+        # Overflow is only counted here and reported once when the job finishes.
+        job.lost += inventory_store.deposit_items(world.inventory, {job.block_id: count}).get(job.block_id, 0)
+        if job.delivered == job.quantity:
+            finished.append(job)
+            block_name = game_state.item_id_to_name.get(job.block_id, f"ID {job.block_id}")
+            items_gained = job.quantity - job.lost
+            if items_gained > 0:
+                world.status_message = f"Mined {items_gained} {block_name}(s)."
+                if job.lost > 0:
+                    world.status_message += f" (Inventory full, {job.lost} lost)"
+            else:
+                world.status_message = f"Inventory full! {job.lost} {block_name}(s) lost."
+            logger.debug("Mining job %d finished: %s", job.job_id, world.status_message)
+    return finished
+
+
 # --- Inventory Management ---
 
-def find_first_empty_slot():
+def find_first_empty_slot(world=None):
     """Finds the index of the first empty (None) slot in the inventory."""
-    for i, slot in enumerate(game_state.inventory):
-        if slot is None:
-            return i
-    return -1 # No empty slots found
+    # Works for both the list inventory and the compact array inventory
+    return inventory_store.find_first_empty((world or game_state.world).inventory) # -1 if no empty slots found
+
+def get_item_count(item_id: int, world=None) -> int:
+    """Returns how many of an item the player has in their inventory.
+    The inventory keeps running totals, so this is a single lookup."""
+    return inventory_store.item_count((world or game_state.world).inventory, item_id)
+
+def get_inventory_totals(world=None) -> dict:
+    """Returns {item_id: total quantity} for everything in the player's inventory."""
+    return inventory_store.inventory_totals((world or game_state.world).inventory)
+
+def add_items_batch(items: dict, world=None) -> dict:
+    """Adds several item types to the player's inventory in one pass over the slots.
+    'items' is {item_id: quantity}.
+    Returns {item_id: number of items that could NOT be added} for each requested item.
+    Sets a single combined status message if anything was lost."""
+    world = world or game_state.world
+    overflow = inventory_store.deposit_items(world.inventory, items)
+
+    lost_parts = [
+        f"{lost} {game_state.item_id_to_name.get(item_id, f'ID:{item_id}')}(s)"
+        for item_id, lost in overflow.items() if lost > 0
+    ]
+    if lost_parts:
+        world.status_message = f"Inventory full! {', '.join(lost_parts)} lost."
+
+    return overflow # Amounts that couldn't be added
 
-def add_items_to_inventory(item_id: int, quantity: int) -> int:
+
+def add_items_to_inventory(item_id: int, quantity: int, world=None) -> int:
     """Adds items to the player's inventory, stacking correctly.
     Returns the number of items that could NOT be added (due to full inventory)."""
     if quantity <=0 or item_id <=0:
         return 0 #Nothing to add
-    remaining_quantity = quantity
-    item_name = game_state.item_id_to_name.get(item_id, f"ID:{item_id}")
-    # print(f"Attempting to add {quantity} x {item_name} (ID: {item_id}) to inventory.") # Less verbose
-
-    # --- Phase 1: Add to existing, non-full stacks ---
-    for i, stack in enumerate(game_state.inventory):
-        if remaining_quantity <= 0: break # All items placed
-
-        if stack and stack.item_id == item_id and stack.quantity < stack.max_stack_size:
-            can_add_now = stack.can_add(remaining_quantity)
-            if can_add_now > 0:
-                added_now = stack.add(can_add_now)
-                remaining_quantity -= added_now
-                # print(f"  Added {added_now} to existing stack in slot {i}. Remaining: {remaining_quantity}") # Less verbose
-
-    # --- Phase 2: Add to new stacks in empty slots ---
-    while remaining_quantity > 0:
-        empty_slot_index = find_first_empty_slot()
-        if empty_slot_index == -1:
-            # print(f"  Inventory full. Could not add remaining {remaining_quantity} items.") # Less verbose
-            break # No empty slots left
-
-        # Determine quantity for the new stack
-        # TODO: Use item-specific max stack size from item_data if available
-        max_stack_for_item = game_state.ItemStack.DEFAULT_MAX_STACK # Default for now
-        qty_for_new_stack = min(remaining_quantity, max_stack_for_item)
+    return add_items_batch({item_id: quantity}, world).get(item_id, 0) # Return amount that couldn't be added
+
 
-        try:
-            new_stack = game_state.ItemStack(item_id, qty_for_new_stack)
-            game_state.inventory[empty_slot_index] = new_stack
-            remaining_quantity -= qty_for_new_stack
-            # print(f"  Created new stack with {qty_for_new_stack} in slot {empty_slot_index}. Remaining: {remaining_quantity}") # Less verbose
-        except ValueError as e:
-            print(f"Error creating ItemStack for inventory: {e}")
-            # Prevent infinite loop if ItemStack creation fails
-            break
-        except IndexError:
-             print(f"Error: Invalid empty slot index {empty_slot_index} returned.")
-             break
 
+# Keys accepted by sort_and_compact_inventory, in the order the UI cycles through them
+INVENTORY_SORT_KEYS = ("id", "name", "count")
 
-    if remaining_quantity > 0:
-        game_state.status_message = f"Inventory full! {remaining_quantity} {item_name}(s) lost."
+def sort_and_compact_inventory(sort_key="id", world=None):
+    """
+    Merges all partial stacks of each item into full stacks (plus one remainder stack)
+    and orders them by 'id', 'name' or 'count' (largest total first).
+    Uses the inventory's running totals, so the cost is one sort over the distinct
+    item types plus one pass to write the slots.
+    Returns the number of slots freed.
+    """
+    if sort_key not in INVENTORY_SORT_KEYS:
+        logger.warning(f"Unknown inventory sort key '{sort_key}'. Using 'id'.")
+        sort_key = "id"
+
+    world = world or game_state.world
+    inventory = world.inventory
+    totals = inventory_store.inventory_totals(inventory)
+    used_before = inventory_store.used_slot_count(inventory)
+
+    if sort_key == "name":
+        order_key = lambda entry: (game_state.item_id_to_name.get(entry[0], "").lower(), entry[0])
+    elif sort_key == "count":
+        order_key = lambda entry: (-entry[1], entry[0])
+    else:
+        order_key = lambda entry: entry[0]
+    ordered_totals = sorted(totals.items(), key=order_key)
 
-    return remaining_quantity # Return amount that couldn't be added
+    with transactions.transaction(): # All-or-nothing rewrite of the slots
+        lost = inventory_store.rebuild_inventory(inventory, ordered_totals)
+    if lost > 0: # Should never happen - compacting never needs more slots
+        logger.warning(f"{lost} items did not fit while compacting the inventory.")
 
+    used_after = inventory_store.used_slot_count(inventory)
+    freed = max(0, used_before - used_after)
+    world.status_message = f"Inventory sorted by {sort_key}. {freed} slot(s) freed."
+    return freed
 
 
 # --- Crafting Logic Helpers ---
@@ -392,32 +406,33 @@ def find_matching_recipe(grid):
     return None # No match found
 
 
-def update_crafting_result():
+def update_crafting_result(world=None):
     """Updates the crafting result slot based on the current grid contents."""
-    matched_recipe = find_matching_recipe(game_state.crafting_grid)
+    world = world or game_state.world
+    matched_recipe = find_matching_recipe(world.crafting_grid)
 
     if matched_recipe:
         result_info = matched_recipe['result']
         try:
             # Create a new ItemStack for the result each time
             new_result_stack = game_state.ItemStack(result_info['item_id'], result_info['quantity'])
-            current_result = game_state.crafting_result_slot
+            current_result = world.crafting_result_slot
             # Update only if the result item or quantity changes
             if not current_result or \
                current_result.item_id != new_result_stack.item_id or \
                current_result.quantity != new_result_stack.quantity:
-                 game_state.crafting_result_slot = new_result_stack
-                 # print(f"Setting crafting result: {game_state.crafting_result_slot}") # Debug
+                 world.crafting_result_slot = new_result_stack
+                 # print(f"Setting crafting result: {world.crafting_result_slot}") # Debug
         except ValueError as e:
-            print(f"Error creating result ItemStack: {e}")
-            game_state.crafting_result_slot = None
+            logger.error(f"Error creating result ItemStack: {e}")
+            world.crafting_result_slot = None
         except AttributeError:
-             print("Error: ItemStack class not found in game_state.")
-             game_state.crafting_result_slot = None
+             logger.error("ItemStack class not found in game_state.")
+             world.crafting_result_slot = None
     else:
-        if game_state.crafting_result_slot is not None:
+        if world.crafting_result_slot is not None:
              # print("Clearing crafting result slot.") # Debug
-             game_state.crafting_result_slot = None
+             world.crafting_result_slot = None
 
 
 def calculate_max_crafts(recipe, grid):
@@ -468,119 +483,125 @@ def calculate_max_crafts(recipe, grid):
     return max_crafts if max_crafts != float('inf') else 0
 
 
-def consume_crafting_ingredients(recipe, multiplier=1):
+def consume_crafting_ingredients(recipe, multiplier=1, world=None):
     """
     Decrements items in the crafting grid based on the matched recipe,
     multiplied by the number of crafts.
-    Returns True if consumption was successful, False otherwise.
+    Runs as a single optimistic pass inside a transaction: if any ingredient turns out
+    to be missing, every grid change made so far is rolled back.
+    Returns True if consumption was successful, False otherwise (grid unchanged).
     """
     if recipe is None:
-        print("Error: consume_crafting_ingredients called with None recipe.")
+        logger.error("consume_crafting_ingredients called with None recipe.")
         return False
     if multiplier <= 0:
-        print("Error: consume_crafting_ingredients called with zero or negative multiplier.")
+        logger.error("consume_crafting_ingredients called with zero or negative multiplier.")
         return False
 
-    grid = game_state.crafting_grid
+    grid = (world or game_state.world).crafting_grid
     grid_size = game_state.CRAFTING_GRID_SIZE
 
-    # --- Pre-Check: Verify enough ingredients exist BEFORE consuming ---
-    # This check is crucial to prevent partial consumption on failure
-    can_consume = True
-    if recipe['type'] == 'shaped':
-        pattern = recipe['pattern']
-        for r in range(grid_size):
-            for c in range(grid_size):
-                if pattern[r][c] is not None:
-                    stack = grid[r][c]
-                    # Need stack and quantity >= multiplier (since each craft takes 1 from the slot)
-                    if not stack or stack.quantity < multiplier:
-                        can_consume = False
-                        # print(f"Pre-check failed (shaped): Not enough items at grid[{r}][{c}]. Need {multiplier}, have {stack.quantity if stack else 0}.") # Debug
-                        break
-            if not can_consume: break
-    elif recipe['type'] == 'shapeless':
-        # Also check slot count for shapeless pre-check
+    # Shapeless recipes need one occupied slot per ingredient (checked without touching the grid)
+    if recipe['type'] == 'shapeless':
         occupied_slot_count = _get_occupied_slot_count(grid)
         if occupied_slot_count != len(recipe['ingredients']):
-             print(f"Pre-check failed (shapeless): Slot count mismatch ({occupied_slot_count} vs {len(recipe['ingredients'])}).")
-             can_consume = False
-        else:
-            ingredients_to_consume = recipe['ingredients']
-            grid_counts = {item['item_id']: item['quantity'] for item in _get_grid_ingredients_list(grid)}
-            for req_item in ingredients_to_consume:
-                req_id = req_item['item_id']
-                needed_total = req_item['quantity'] * multiplier
-                available = grid_counts.get(req_id, 0)
-                if available < needed_total:
-                    can_consume = False
-                    item_name = game_state.item_id_to_name.get(req_id, f"ID:{req_id}")
-                    # print(f"Pre-check failed (shapeless): Not enough {item_name}. Need {needed_total}, have {available}.") # Debug
-                    break
-
-    if not can_consume:
-        # print("Consumption aborted due to insufficient ingredients (pre-check).") # Debug
-        return False
-    # --- End Pre-Check ---
-
+            logger.debug("Consumption failed (shapeless): Slot count mismatch (%d vs %d).", occupied_slot_count, len(recipe['ingredients']))
+            return False
 
-    # --- Actual Consumption ---
     consumed_something = False
     try:
-        if recipe['type'] == 'shaped':
-            pattern = recipe['pattern']
-            for r in range(grid_size):
-                for c in range(grid_size):
-                    if pattern[r][c] is not None:
-                        stack = grid[r][c]
-                        if stack and stack.quantity >= multiplier: # Double check quantity
+        with transactions.transaction() as txn:
+            if recipe['type'] == 'shaped':
+                pattern = recipe['pattern']
+                for r in range(grid_size):
+                    for c in range(grid_size):
+                        if pattern[r][c] is not None:
+                            stack = grid[r][c]
+                            # Need stack and quantity >= multiplier (since each craft takes 1 from the slot)
+                            if not stack or stack.quantity < multiplier:
+                                # print(f"Not enough items at grid[{r}][{c}]. Need {multiplier}, have {stack.quantity if stack else 0}.") # Debug
+                                txn.rollback() # Undo slots consumed earlier in this pass
+                                return False
+                            txn.record(grid[r], c)
                             stack.quantity -= multiplier # Consume 'multiplier' items
                             consumed_something = True
-                            # print(f"Consumed {multiplier} from shaped grid[{r}][{c}], remaining: {stack.quantity}") # Debug
                             if stack.quantity <= 0:
                                 grid[r][c] = None # Remove empty stack
-                        else:
-                            # This *shouldn't* happen if pre-check passed, but is a safeguard
-                            print(f"CRITICAL Error during shaped consumption: Mismatch at grid[{r}][{c}]. Expected >= {multiplier}, found {stack}. ABORTING.")
-                            # NOTE: Reverting changes here is complex as some might have succeeded.
-                            # The pre-check aims to prevent this state.
-                            return False # Indicate failure
-
-        elif recipe['type'] == 'shapeless':
-            ingredients_to_consume = recipe['ingredients']
-            # Create a mutable dictionary of total counts needed
-            needed_counts = {item['item_id']: item['quantity'] * multiplier for item in ingredients_to_consume}
-
-            # Iterate through the grid and consume required amounts
-            items_consumed_this_pass = {} # Track consumption per item ID
-
-            for r in range(grid_size):
-                for c in range(grid_size):
-                    stack = grid[r][c]
-                    # Check if this stack's item is needed and we still need some
-                    if stack and stack.item_id in needed_counts and needed_counts[stack.item_id] > 0:
-                        # How much to take from *this* stack?
-                        take_amount = min(stack.quantity, needed_counts[stack.item_id])
-
-                        stack.quantity -= take_amount
-                        needed_counts[stack.item_id] -= take_amount
-                        items_consumed_this_pass[stack.item_id] = items_consumed_this_pass.get(stack.item_id, 0) + take_amount
-                        consumed_something = True
-                        # print(f"Consumed {take_amount} of {stack.name} from grid[{r}][{c}], remaining: {stack.quantity}") # Debug
-                        if stack.quantity <= 0:
-                            grid[r][c] = None
-
-            # Verify all required items were consumed (all counts in needed_counts should be 0)
-            if any(count > 0 for count in needed_counts.values()):
-                 # This *shouldn't* happen if pre-check passed
-                print(f"CRITICAL Error during shapeless consumption: Could not consume all required. Remaining needed: {needed_counts}. ABORTING.")
-                # NOTE: Reverting changes is complex. Pre-check aims to prevent this.
-                return False
 
-        # If we reach here, consumption was successful
+            elif recipe['type'] == 'shapeless':
+                # Create a mutable dictionary of total counts needed
+                needed_counts = {item['item_id']: item['quantity'] * multiplier for item in recipe['ingredients']}
+
+                # Iterate through the grid and consume required amounts
+                for r in range(grid_size):
+                    for c in range(grid_size):
+                        stack = grid[r][c]
+                        # Check if this stack's item is needed and we still need some
+                        if stack and needed_counts.get(stack.item_id, 0) > 0:
+                            # How much to take from *this* stack?
+                            take_amount = min(stack.quantity, needed_counts[stack.item_id])
+                            txn.record(grid[r], c)
+                            stack.quantity -= take_amount
+                            needed_counts[stack.item_id] -= take_amount
+                            consumed_something = True
+                            if stack.quantity <= 0:
+                                grid[r][c] = None
+
+                # Verify all required items were consumed (all counts in needed_counts should be 0)
+                if any(count > 0 for count in needed_counts.values()):
+                    # print(f"Not enough ingredients. Remaining needed: {needed_counts}.") # Debug
+                    txn.rollback()
+                    return False
+
+        # If we reach here, consumption was successful (transaction committed)
         return consumed_something
 
     except Exception as e:
-        print(f"Exception during ingredient consumption: {e}")
-        # NOTE: Reverting changes is complex. Pre-check aims to prevent this.
+        # The transaction already restored the grid
+        logger.error(f"Exception during ingredient consumption (changes rolled back): {e}")
         return False
+
+
+def find_recipe_for(result_item_id: int):
+    """Returns the first recipe that makes an item, or None."""
+    return next((r for r in RECIPES_2x2 if r['result']['item_id'] == result_item_id), None)
+
+
+def recipe_ingredients(recipe, times=1) -> dict:
+    """Returns {item_id: quantity} needed to craft a recipe 'times' times (one item per filled shaped slot)."""
+    needed = {}
+    if recipe['type'] == 'shaped':
+        for row in recipe['pattern']:
+            for item_id in row:
+                if item_id is not None:
+                    needed[item_id] = needed.get(item_id, 0) + times
+    else:
+        for ingredient in recipe['ingredients']:
+            needed[ingredient['item_id']] = needed.get(ingredient['item_id'], 0) + ingredient['quantity'] * times
+    return needed
+
+
+def craft_from_inventory(result_item_id: int, times=1, world=None) -> int:
+    """
+    Crafts an item 'times' times straight from the inventory, without using the crafting grid
+    (used by the headless engine). Uses the first recipe that makes the item.
+    Returns the number of result items added to the inventory (0 if not enough ingredients).
+    """
+    world = world or game_state.world
+    recipe = find_recipe_for(result_item_id)
+    if recipe is None or times <= 0:
+        world.status_message = "No recipe for that item."
+        return 0
+
+    needed = recipe_ingredients(recipe, times)
+    result_quantity = recipe['result']['quantity'] * times
+    with transactions.transaction() as txn:
+        if not inventory_store.withdraw_items(world.inventory, needed):
+            world.status_message = "Not enough ingredients."
+            return 0
+        leftover = inventory_store.deposit_items(world.inventory, {result_item_id: result_quantity}).get(result_item_id, 0)
+        if leftover > 0:
+            txn.rollback() # Keep the ingredients rather than losing the result
+            world.status_message = "Not enough inventory space for the result."
+            return 0
+    return result_quantity
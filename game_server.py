@@ -0,0 +1,269 @@
+# game_server.py
+# Local game server: runs worlds without the pygame UI and lets other programs
+# (bots, dashboards) drive them over a TCP or Unix socket.
+#
+# Protocol: newline-delimited JSON. Each line is one command object, or a JSON array of
+# command objects (a batch, answered with one array line). Clients may also send many
+# lines without waiting for the answers (pipelining); answers come back in order.
+#   -> {"id": 1, "cmd": "mine", "world": 1, "block": "Oak log", "quantity": 100}
+#   <- {"id": 1, "ok": true, "result": {"job_id": 1, "seconds": 300.0}, "message": "Mining 100 Oak log(s)... (300.0s)"}
+#
+# Commands (every command except "ping" needs "world", a save slot number):
+#   ping                                  -> "pong"
+#   load                                  -> {"jobs": ...}   (worlds are also loaded on first use)
+#   unload                                -> saves the world and drops it from memory (kept if the save fails)
+#   mine      block, quantity[, tool]     -> {"job_id": ..., "seconds": ...}
+#   craft     item[, times]               -> number of items made
+#   count     item                        -> quantity in the inventory
+#   inventory                             -> {item name: quantity}
+#   jobs                                  -> running and waiting mining jobs
+#   save      [wait]                      -> queues a save (done by the background flush task)
+#
+# Saves are written in a worker thread by a background task every SAVE_INTERVAL seconds
+# (only worlds changed since their last save), so commands never wait for the disk.
+#
+# Usage: python game_server.py [port | unix socket path]
+import asyncio
+import json
+import logging
+import sys
+import game_state
+import game_clock
+import engine
+import constants
+import hot_reload
+import game_log
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SAVE_INTERVAL = 30.0   # Seconds between background saves of changed worlds
+UPDATE_INTERVAL = 1.0  # Seconds between mining updates of every loaded world
+MAX_LINE_BYTES = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class CommandError(Exception):
+    """A command could not be run; the message is sent back to the client."""
+
+
+class GameServer:
+    """Holds the loaded worlds and answers commands for them."""
+    def __init__(self, eng=None):
+        self.engine = eng if eng is not None else engine.Engine(game_clock.RealClock())
+        self.worlds = {}  # slot_id -> World
+        self.locks = {}   # slot_id -> asyncio.Lock, held while a world is changed or saved
+        self.dirty = set() # slot_ids changed since their last save
+
+    # --- Worlds ---
+    def _get_world(self, request):
+        slot_id = request.get("world")
+        if not isinstance(slot_id, int):
+            raise CommandError("Missing or invalid 'world' (save slot number).")
+        loaded_world = self.worlds.get(slot_id)
+        if loaded_world is None:
+            loaded_world = self.engine.load_world(slot_id)
+            if loaded_world is None:
+                raise CommandError(f"Could not load world {slot_id}.")
+            self.worlds[slot_id] = loaded_world
+            self.locks[slot_id] = asyncio.Lock()
+        return loaded_world
+
+    def _item(self, request, key):
+        item = request.get(key)
+        try:
+            return self.engine.item_id(item)
+        except (KeyError, TypeError):
+            raise CommandError(f"Unknown item: {item!r}")
+
+    def _count(self, request, key, default=None) -> int:
+        """A whole number of 1 or more from the request (e.g. a quantity)."""
+        value = request.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise CommandError(f"'{key}' must be a whole number of 1 or more, not {value!r}.")
+        return value
+
+    async def save_world(self, slot_id) -> bool:
+        """Saves one world in a worker thread (the world is locked meanwhile)."""
+        target_world = self.worlds.get(slot_id)
+        if target_world is None:
+            return False
+        async with self.locks[slot_id]:
+            self.dirty.discard(slot_id)
+            saved = await asyncio.get_running_loop().run_in_executor(None, self.engine.save_world, target_world)
+        if not saved:
+            self.dirty.add(slot_id) # Try again on the next flush
+        return saved
+
+    async def flush(self):
+        """Saves every world changed since its last save."""
+        for slot_id in sorted(self.dirty):
+            await self.save_world(slot_id)
+
+    # --- Commands ---
+    async def run_command(self, request) -> dict:
+        """Runs one command and returns its answer (errors are answered, not raised)."""
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "A command must be a JSON object."}
+        request_id = request.get("id")
+        cmd = request.get("cmd")
+        try:
+            if cmd == "ping":
+                return {"id": request_id, "ok": True, "result": "pong"}
+            if cmd == "save":
+                target_world = self._get_world(request)
+                self.dirty.add(target_world.world_id)
+                result = {"queued": True}
+                if request.get("wait"):
+                    result = {"saved": await self.save_world(target_world.world_id)}
+                return {"id": request_id, "ok": True, "result": result}
+            if cmd == "unload":
+                target_world = self._get_world(request)
+                if not await self.save_world(target_world.world_id):
+                    raise CommandError(f"Could not save world {target_world.world_id}; it stays loaded.")
+                self.worlds.pop(target_world.world_id, None)
+                self.locks.pop(target_world.world_id, None)
+                return {"id": request_id, "ok": True, "result": {"saved": True}}
+
+            target_world = self._get_world(request)
+            async with self.locks[target_world.world_id]:
+                target_world.status_message = ""
+                self.engine.update([target_world]) # Deliver blocks mined up to now first
+                result = self._run_world_command(cmd, request, target_world)
+            return {"id": request_id, "ok": True, "result": result, "message": target_world.status_message}
+        except CommandError as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Server: error in command {cmd!r}: {e}")
+            return {"id": request_id, "ok": False, "error": f"Internal error: {e}"}
+
+    def _run_world_command(self, cmd, request, target_world):
+        if cmd == "load":
+            return {"jobs": target_world.mining_jobs.job_count()}
+        if cmd == "mine":
+            block_id = self._item(request, "block")
+            quantity = self._count(request, "quantity")
+            if not self.engine.mine(target_world, block_id, quantity, request.get("tool")):
+                raise CommandError(target_world.status_message or "Mining refused.")
+            self.dirty.add(target_world.world_id)
+            jobs = target_world.mining_jobs.running_jobs() + target_world.mining_jobs.waiting_jobs()
+            job = max(jobs, key=lambda j: j.job_id)
+            return {"job_id": job.job_id, "seconds": job.duration}
+        if cmd == "craft":
+            made = self.engine.craft(target_world, self._item(request, "item"), self._count(request, "times", 1))
+            if made:
+                self.dirty.add(target_world.world_id)
+            return made
+        if cmd == "count":
+            return self.engine.item_count(target_world, self._item(request, "item"))
+        if cmd == "inventory":
+            totals = self.engine.inventory_totals(target_world)
+            return {game_state.item_id_to_name.get(item_id, f"ID:{item_id}"): quantity for item_id, quantity in totals.items()}
+        if cmd == "jobs":
+            now = self.engine.clock.now()
+            return {
+                "running": [_job_info(job, now) for job in target_world.mining_jobs.running_jobs()],
+                "waiting": [_job_info(job, now) for job in target_world.mining_jobs.waiting_jobs()],
+            }
+        raise CommandError(f"Unknown command: {cmd!r}")
+
+    # --- Connections ---
+    async def handle_client(self, reader, writer):
+        """Answers each line (command or batch) in order until the client disconnects."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    answer = {"id": None, "ok": False, "error": f"Invalid JSON: {e}"}
+                else:
+                    if isinstance(request, list): # Batch
+                        answer = [await self.run_command(item) for item in request]
+                    else:
+                        answer = await self.run_command(request)
+                writer.write(json.dumps(answer).encode('utf-8') + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            logger.info(f"Server: client connection closed: {e}")
+        finally:
+            writer.close()
+
+    async def _background(self):
+        """Keeps mining progressing in every loaded world and flushes saves periodically."""
+        next_flush = self.engine.clock.now() + SAVE_INTERVAL
+        data_watcher = hot_reload.DataWatcher() if constants.HOT_RELOAD_DATA else None
+        while True:
+            await asyncio.sleep(UPDATE_INTERVAL)
+            try:
+                if data_watcher is not None:
+                    data_watcher.poll(self.engine.clock.wall_time())
+                for slot_id, target_world in list(self.worlds.items()):
+                    lock = self.locks.get(slot_id)
+                    if lock is None:
+                        continue # Unloaded while an earlier world was updated
+                    async with lock:
+                        if self.worlds.get(slot_id) is not target_world:
+                            continue
+                        if self.engine.update([target_world]):
+                            self.dirty.add(slot_id)
+                if self.engine.clock.now() >= next_flush:
+                    await self.flush()
+                    next_flush = self.engine.clock.now() + SAVE_INTERVAL
+            except Exception:
+                # Nobody awaits this task: log the error and keep mining and saving going
+                logger.exception("Server: error in the background update")
+
+    async def serve(self, port=DEFAULT_PORT, unix_path=None):
+        """Runs the server until it is cancelled, then saves every changed world."""
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, unix_path, limit=MAX_LINE_BYTES)
+            logger.info(f"Game server listening on {unix_path}")
+        else:
+            server = await asyncio.start_server(self.handle_client, DEFAULT_HOST, port, limit=MAX_LINE_BYTES)
+            logger.info(f"Game server listening on {DEFAULT_HOST}:{port}")
+        background = asyncio.create_task(self._background())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            background.cancel()
+            await self.flush()
+            logger.info("Game server stopped, worlds saved.")
+
+
+def _job_info(job, now) -> dict:
+    return {
+        "job_id": job.job_id,
+        "block": game_state.item_id_to_name.get(job.block_id, f"ID:{job.block_id}"),
+        "quantity": job.quantity,
+        "delivered": job.delivered,
+        "seconds_left": None if job.deadline is None else max(0.0, job.deadline - now),
+    }
+
+
+def main(argv) -> int:
+    game_log.setup_logging()
+    game_server = GameServer()
+    if not game_server.engine.load_data():
+        return 1
+    port, unix_path = DEFAULT_PORT, None
+    if len(argv) > 1:
+        if argv[1].isdigit():
+            port = int(argv[1])
+        else:
+            unix_path = argv[1]
+    try:
+        asyncio.run(game_server.serve(port, unix_path))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,5 +1,5 @@
-import pygame
 import constants # Import constants for initial state if needed
+import item_registry # Shared per-item properties (ItemType flyweights)
 
 # --- Core Game Data Dictionaries ---
 # These will be populated by data_loader and game_logic functions
@@ -9,10 +9,19 @@ item_data = {}      # Stores details about each item {item_id: {'name': '...', '
 item_textures = {}  # Stores loaded and resized item textures {item_id: pygame.Surface}
 recipes = {}        # Stores crafting recipes {output_item_id: {'ingredients': {...}, 'quantity': ...}}
 
+# --- Current World ---
+# world.World holding the inventory, chests, crafting grid, held item, mining jobs and
+# status message of the world shown on screen. Set by main / the engine before use.
+world = None
+
 # --- Inventory Representation ---
-# Change from dictionary to a list representing slots
 MAX_INVENTORY_SLOTS = 36 # Example size (4 rows of 9)
-inventory = [None] * MAX_INVENTORY_SLOTS # Initialize as a list of empty slots
+inventory_sort_key = constants.INVENTORY_SORT_KEY # Current order used by the inventory "Sort" button
+
+# --- Storage Chests ---
+# The chests themselves are in world.storage_containers
+current_container = 0 # Index of the chest shown on the storage screen
+storage_page = 0 # Page of that chest currently shown
 
 # --- Pygame Specific ---
 screen = None
@@ -22,7 +31,6 @@ clock = None # Initialize in main
 # --- Game State ---
 running = True
 current_screen = constants.SELECT_WORLD # Start at the world selection screen
-current_world_id = None # Track the loaded world slot (1 to MAX_SAVE_SLOTS)
 
 # --- Game Data ---
 mine_speeds = {}
@@ -32,12 +40,12 @@ tool_headers = [] # Stores tool names from the header
 item_name_to_id = {} # Added: Map item names back to IDs {name: id}
 item_id_to_name = {} # *** ADDED: Map item IDs back to names {id: name} ***
 tool_stats = {} # Added: Store tool stats
+tool_name_to_id = {} # Tool IDs used as mining_times columns {tool_name: id}, 0 means "no tool"
+mining_times = [] # Seconds per block, indexed [block_id][tool_id] (NumPy array if available), built by data_loader
 
 # --- Crafting State --- Added Section
 CRAFTING_GRID_SIZE = 2 # 2x2 grid
-crafting_grid = [[None for _ in range(CRAFTING_GRID_SIZE)] for _ in range(CRAFTING_GRID_SIZE)] # Holds ItemStacks or None
-crafting_result_slot = None # Holds the resulting ItemStack or None
-held_item = None # Holds the ItemStack being dragged by the mouse, or None
+# The grid, result slot and held item are in world.World
 
 # --- Dynamic UI Elements ---
 title_font = None
@@ -52,44 +60,63 @@ copyright_rect = None
 buttons = [] # Holds currently active buttons
 input_field_rect = None # Rectangle for the quantity input field
 accumulated_input = "" # For quantity input
+search_text = "" # Item search box text (inventory screen / mining menu)
+search_field_rect = None # Rectangle for the item search box
 crafting_grid_rects = [[None for _ in range(CRAFTING_GRID_SIZE)] for _ in range(CRAFTING_GRID_SIZE)] # Rects for grid slots
 crafting_result_rect = None # Rect for the result slot
 inventory_display_rects = [] # Rects for showing inventory items on crafting screen
 
 
 # --- Status & Mining ---
-status_message = "" # For displaying info like "Mined X blocks" or errors
-selected_block_for_mining = None
-mining_quantity = 0
-mining_start_time = 0
-mining_duration = 0
-mining_progress_text = ""
+# Status messages are per world (world.status_message)
+error_message = "" # Shown on the error screen when game data fails to load
+selected_block_for_mining = None # Block chosen in the mining menu (asked for a quantity next)
+# Running/waiting mining jobs are kept in world.mining_jobs (see mining_jobs.py)
 
 
 # --- Item Representation Class --- Added Class
 # (Could be in game_logic.py or its own file too)
 class ItemStack:
     """Represents a stack of items."""
+    # Fixed attribute layout (no per-stack __dict__), stacks can exist in large numbers
+    __slots__ = ("item_id", "item_type", "_owner", "_quantity")
     #default max stack size
-    DEFAULT_MAX_STACK = 64
+    DEFAULT_MAX_STACK = item_registry.DEFAULT_MAX_STACK
     def __init__(self, item_id: int, quantity: int):
         if not isinstance(item_id, int) or item_id == 0: # Ensure valid ID
              raise ValueError(f"Invalid item_id: {item_id}")
         if not isinstance(quantity, int) or quantity <= 0:
              raise ValueError(f"Invalid quantity: {quantity}")
 
+        # Container currently holding this stack (e.g. the inventory), told about quantity
+        # changes so it can keep its per-item totals up to date. None when not in a container.
+        self._owner = None
         self.item_id = item_id
-        self.quantity = quantity
-        # *** FIX: Use item_id_to_name map for name lookup ***
-        self.name = item_id_to_name.get(item_id, f"ID:{item_id}") # Fallback to ID if name not found
-        # TODO: Get max stack size from item_data if it varies per item
-        self.max_stack_size = ItemStack.DEFAULT_MAX_STACK
+        self._quantity = quantity
+        # Shared ItemType holding the name, max stack size, texture etc. (no per-stack copies)
+        self.item_type = item_registry.get_type(item_id)
+
+    @property
+    def name(self) -> str:
+        return self.item_type.name
+
+    @property
+    def max_stack_size(self) -> int:
+        return self.item_type.max_stack
+
+    @property
+    def quantity(self) -> int:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value: int):
+        if self._owner is not None:
+            self._owner._on_quantity_change(self, value - self._quantity)
+        self._quantity = value
 
     def get_name(self) -> str:
         """Returns the item name."""
-        # Refresh name if map could change (unlikely here unless data reloaded)
-        # self.name = item_id_to_name.get(self.item_id, f"ID:{self.item_id}")
-        return self.name
+        return self.item_type.name
     
     def can_add(self, amount: int) -> int:
         """Returns how many of the given amount can be added to this stack."""
@@ -0,0 +1,86 @@
+# hot_reload.py
+# Development mode: picks up changes to the item data while the game (or game server) runs.
+#
+# DataWatcher checks the modification times of mine_speeds.py, tool_stats.py, the item
+# catalogs and the texture files every constants.HOT_RELOAD_INTERVAL seconds. When one
+# changed, only the difference is applied (data_loader.reload_item_data): the changed rows
+# of the item registry and mining time matrix, new item IDs, the mine list, the recipes and
+# the textures of the affected items. Item IDs, inventories, chests and mining jobs are kept.
+# Mining jobs that are already running keep the mining time they started with.
+#
+# Turned on with constants.HOT_RELOAD_DATA (off by default). The compiled data bundle is not
+# rewritten by a hot reload; the next start rebuilds it from the changed files.
+import logging
+import os
+import time
+import constants
+import game_state
+import game_logic
+import data_loader
+import data_bundle
+import item_catalog
+
+logger = logging.getLogger(__name__)
+
+
+class DataWatcher:
+    """Polls the item data files by modification time and applies changes."""
+    def __init__(self, interval=None, load_textures=False):
+        self.interval = constants.HOT_RELOAD_INTERVAL if interval is None else interval
+        self.load_textures = load_textures # Only when pygame has a display (not headless)
+        self._next_check = 0.0
+        self._data_mtimes = self._scan_data()
+        self._texture_mtimes = self._scan_textures()
+
+    def _scan_data(self) -> dict:
+        paths = [os.path.join(data_bundle.BUNDLE_DIR, name) for name in ("mine_speeds.py", "tool_stats.py")]
+        return {path: _mtime(path) for path in paths + item_catalog.catalog_paths()}
+
+    def _scan_textures(self) -> dict:
+        if not os.path.isdir(constants.TEXTURES_DIR):
+            return {}
+        with os.scandir(constants.TEXTURES_DIR) as entries:
+            return {entry.name: entry.stat().st_mtime_ns for entry in entries if entry.is_file()}
+
+    def poll(self, now) -> bool:
+        """Checks the files if 'interval' seconds passed since the last check. Returns True if anything was reloaded."""
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.interval
+        data_mtimes = self._scan_data()
+        texture_mtimes = self._scan_textures() if self.load_textures else self._texture_mtimes
+        if data_mtimes == self._data_mtimes and texture_mtimes == self._texture_mtimes:
+            return False
+
+        start = time.perf_counter()
+        texture_ids = set()
+        if data_mtimes != self._data_mtimes:
+            changes = data_loader.reload_item_data()
+            if changes is None:
+                # Keep the old data; try again once the files change again (e.g. a syntax error was fixed)
+                self._data_mtimes = data_mtimes
+                return False
+            if changes["added"]:
+                game_logic.initialize_recipes() # Recipes are defined by item name; new items may complete them
+            texture_ids.update(changes["added"])
+            logger.info(f"Hot reload: {len(changes['added'])} item(s) added, {len(changes['changed'])} changed"
+                        f"{', tools changed' if changes['tools_changed'] else ''}.")
+        for filename, mtime in texture_mtimes.items():
+            if self._texture_mtimes.get(filename) != mtime:
+                item_id = game_state.item_name_to_id.get(os.path.splitext(filename)[0])
+                if item_id is not None:
+                    texture_ids.add(item_id)
+        if self.load_textures and texture_ids:
+            data_loader.load_textures(sorted(texture_ids))
+
+        self._data_mtimes = data_mtimes
+        self._texture_mtimes = texture_mtimes
+        logger.info(f"Hot reload applied in {(time.perf_counter() - start) * 1000:.1f} ms.")
+        return True
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None # Missing file (a change when it appears)
@@ -0,0 +1,544 @@
+# inventory_store.py
+# Inventory storage backends.
+#
+# The default inventory is a SlotInventory: a fixed-size list of ItemStack objects (or None).
+# For very large inventories (tens of thousands of slots) the optional
+# CompactInventory keeps two parallel arrays instead:
+#   _ids[i]        -> item_id in slot i (0 means the slot is empty)
+#   _quantities[i] -> quantity in slot i
+# ItemStack "views" are only created when something asks for a slot
+# (e.g. the UI drawing a visible slot), so memory stays flat.
+#
+# Both backends keep a running total per item_id ({item_id: quantity}), updated on every
+# slot assignment and every stack quantity change, so "how many X do I have" is O(1).
+from array import array
+import weakref
+import game_state
+import constants
+import transactions
+import item_registry
+
+# NumPy is optional - used to speed up bulk operations when available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Array typecode for IDs and quantities (unsigned int, 4 bytes on all common platforms)
+SLOT_TYPECODE = 'I'
+# Only use NumPy views of the arrays if the item size matches uint32
+_USE_NUMPY = np is not None and array(SLOT_TYPECODE).itemsize == 4
+
+
+def _adjust_total(totals, item_id, delta):
+    """Applies a quantity change to a {item_id: total} table, dropping items that reach zero."""
+    if not item_id or not delta:
+        return
+    total = totals.get(item_id, 0) + delta
+    if total:
+        totals[item_id] = total
+    else:
+        del totals[item_id]
+
+
+class SlotInventory(list):
+    """
+    The default inventory: a fixed-size list of ItemStack objects (or None).
+    Assigning a slot registers the inventory as the stack's owner, so later quantity
+    changes on the stack (stacking, splitting, consuming) update the running totals.
+    NOTE: Use slot assignment only (inv[i] = ...), the list should not be resized,
+    and a stack object should only be in one slot at a time.
+    A compact inventory view placed in a slot is stored as a plain ItemStack copy
+    (its data lives in the compact arrays, so it could not report quantity changes).
+    """
+    def __init__(self, size: int):
+        super().__init__([None] * size)
+        self._totals = {} # Running {item_id: total quantity}
+
+    def __setitem__(self, index, stack):
+        old_stack = list.__getitem__(self, index)
+        if old_stack is not None:
+            old_stack._owner = None
+            _adjust_total(self._totals, old_stack.item_id, -old_stack.quantity)
+        if isinstance(stack, InventorySlotView):
+            stack = game_state.ItemStack(stack.item_id, stack.quantity)
+        list.__setitem__(self, index, stack)
+        if stack is not None:
+            stack._owner = self
+            _adjust_total(self._totals, stack.item_id, stack.quantity)
+
+    def _on_quantity_change(self, stack, delta):
+        """Called by an owned ItemStack (just before) its quantity changes by 'delta'."""
+        _adjust_total(self._totals, stack.item_id, delta)
+
+    def item_count(self, item_id: int) -> int:
+        """Returns the total quantity of an item across all slots (O(1))."""
+        return self._totals.get(item_id, 0)
+
+    def totals(self) -> dict:
+        """Returns a copy of the running {item_id: total quantity} table."""
+        return dict(self._totals)
+
+
+class InventorySlotView(game_state.ItemStack):
+    """
+    An ItemStack that reads/writes its data directly from a CompactInventory slot.
+    Behaves like a normal ItemStack for the rest of the game (drawing, stacking, crafting).
+    When its slot is overwritten the view is 'detached' and keeps its last values,
+    exactly like an ItemStack object that was removed from a list slot.
+    """
+    def __init__(self, inventory, index):
+        # NOTE: Does not call ItemStack.__init__ - all data lives in the inventory arrays
+        self._inventory = inventory
+        self._index = index
+        self._detached_id = 0
+        self._detached_quantity = 0
+
+    # --- Slot Backed Properties ---
+    @property
+    def item_id(self):
+        if self._inventory is None:
+            return self._detached_id
+        return self._inventory._ids[self._index]
+
+    @item_id.setter
+    def item_id(self, value):
+        if self._inventory is None:
+            self._detached_id = value
+        else:
+            inventory = self._inventory
+            quantity = inventory._quantities[self._index]
+            _adjust_total(inventory._totals, inventory._ids[self._index], -quantity)
+            _adjust_total(inventory._totals, value, quantity)
+            inventory._ids[self._index] = value
+
+    @property
+    def quantity(self):
+        if self._inventory is None:
+            return self._detached_quantity
+        return self._inventory._quantities[self._index]
+
+    @quantity.setter
+    def quantity(self, value):
+        value = max(0, value) # Arrays are unsigned, a stack can never go below zero
+        if self._inventory is None:
+            self._detached_quantity = value
+        else:
+            inventory = self._inventory
+            _adjust_total(inventory._totals, inventory._ids[self._index], value - inventory._quantities[self._index])
+            inventory._quantities[self._index] = value
+
+    @property
+    def item_type(self):
+        return item_registry.get_type(self.item_id)
+
+    @property
+    def name(self):
+        return item_registry.get_type(self.item_id).name
+
+    @property
+    def max_stack_size(self):
+        return item_registry.max_stack(self.item_id)
+
+    # --- Attachment Helpers (used by CompactInventory) ---
+    def _detach(self):
+        """Copies the slot values into the view and unlinks it from the inventory."""
+        if self._inventory is not None:
+            self._detached_id = self._inventory._ids[self._index]
+            self._detached_quantity = self._inventory._quantities[self._index]
+            self._inventory = None
+
+    def _attach(self, inventory, index):
+        """Links a detached view to a (new) inventory slot."""
+        self._inventory = inventory
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"InventorySlotView(slot={self._index}, id={self.item_id}, name='{self.name}', qty={self.quantity})"
+
+
+class CompactInventory:
+    """
+    Array-backed inventory. Supports the same slot access as the list inventory:
+    len(inv), inv[i], inv[i] = ItemStack/None and iteration.
+    """
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError(f"Invalid inventory size: {size}")
+        self._ids = array(SLOT_TYPECODE, bytes(array(SLOT_TYPECODE).itemsize * size))
+        self._quantities = array(SLOT_TYPECODE, bytes(array(SLOT_TYPECODE).itemsize * size))
+        # Views handed out for slots, so the same slot always gives the same object while it is alive
+        self._views = weakref.WeakValueDictionary()
+        self._totals = {} # Running {item_id: total quantity}
+
+    # --- List-like Slot Access ---
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._ids)
+        if self._ids[index] == 0: # Raises IndexError for invalid indexes, like a list
+            return None
+        view = self._views.get(index)
+        if view is None:
+            view = InventorySlotView(self, index)
+            self._views[index] = view
+        return view
+
+    def __setitem__(self, index, stack):
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("inventory slot index out of range")
+
+        # Read the new values first (the stack could be a view of this same slot)
+        if stack is None:
+            new_id, new_quantity = 0, 0
+        else:
+            new_id, new_quantity = stack.item_id, stack.quantity
+
+        # Any view currently showing this slot keeps its old values (like a removed list item)
+        old_view = self._views.pop(index, None)
+        if old_view is not None and old_view is not stack:
+            old_view._detach()
+
+        _adjust_total(self._totals, self._ids[index], -self._quantities[index])
+        self._ids[index] = new_id
+        self._quantities[index] = new_quantity if new_id else 0
+        _adjust_total(self._totals, new_id, self._quantities[index])
+
+        # A detached view being placed back becomes the live view of its new slot
+        if isinstance(stack, InventorySlotView) and stack._inventory is None:
+            stack._attach(self, index)
+            self._views[index] = stack
+        elif stack is not None and stack is old_view:
+            self._views[index] = stack
+
+    def __iter__(self):
+        for index in range(len(self._ids)):
+            yield self[index]
+
+    # --- Bulk Operations ---
+    def find_first_empty(self) -> int:
+        """Returns the index of the first empty slot, or -1 if full."""
+        try:
+            return self._ids.index(0) # C-level scan of the ID array
+        except ValueError:
+            return -1
+
+    def item_count(self, item_id: int) -> int:
+        """Returns the total quantity of an item across all slots (O(1))."""
+        return self._totals.get(item_id, 0)
+
+    def totals(self) -> dict:
+        """Returns a copy of the running {item_id: total quantity} table."""
+        return dict(self._totals)
+
+    def recount_totals(self) -> dict:
+        """Rebuilds the running totals from the arrays (e.g. to verify them). Returns the new table."""
+        totals = {}
+        if _USE_NUMPY and self._ids:
+            ids = np.frombuffer(self._ids, dtype=np.uint32)
+            quantities = np.frombuffer(self._quantities, dtype=np.uint32)
+            summed = np.bincount(ids, weights=quantities)
+            for item_id in np.flatnonzero(summed):
+                if item_id != 0:
+                    totals[int(item_id)] = int(summed[item_id])
+        else:
+            for item_id, quantity in zip(self._ids, self._quantities):
+                if item_id and quantity:
+                    totals[item_id] = totals.get(item_id, 0) + quantity
+        self._totals = totals
+        return dict(totals)
+
+    def sort_slots(self, key=None):
+        """
+        Reorders the slots. Default order is by item ID (empty slots last).
+        'key' can be a function taking (item_id, quantity) for a custom order.
+        Stacks are not merged here - only moved.
+        """
+        for view in list(self._views.values()):
+            view._detach() # Slot contents are about to move
+        self._views = weakref.WeakValueDictionary()
+
+        if key is None and _USE_NUMPY:
+            ids = np.frombuffer(self._ids, dtype=np.uint32)
+            # Empty slots (ID 0) sort last by treating them as the largest value
+            order = np.argsort(np.where(ids == 0, np.iinfo(np.uint32).max, ids), kind='stable')
+            new_ids = ids[order]
+            new_quantities = np.frombuffer(self._quantities, dtype=np.uint32)[order]
+            self._ids = array(SLOT_TYPECODE, new_ids.astype(np.uint32).tobytes())
+            self._quantities = array(SLOT_TYPECODE, new_quantities.astype(np.uint32).tobytes())
+            return
+
+        occupied = [(item_id, quantity) for item_id, quantity in zip(self._ids, self._quantities) if item_id]
+        occupied.sort(key=(lambda pair: pair[0]) if key is None else (lambda pair: key(*pair)))
+        empty_count = len(self._ids) - len(occupied)
+        self._ids = array(SLOT_TYPECODE, [item_id for item_id, _ in occupied] + [0] * empty_count)
+        self._quantities = array(SLOT_TYPECODE, [quantity for _, quantity in occupied] + [0] * empty_count)
+
+    def deposit(self, remaining: dict) -> dict:
+        """
+        Batch deposit working directly on the arrays (see deposit_items).
+        'remaining' is {item_id: quantity} and is updated in place with what did not fit.
+        """
+        # Largest max stack of the wanted items, used to pre-filter partial stacks
+        max_stack = max(item_registry.max_stack(item_id) for item_id in remaining)
+        ids, quantities = self._ids, self._quantities
+
+        # Find partial stacks of the wanted items and the empty slots in one pass
+        if _USE_NUMPY:
+            np_ids = np.frombuffer(ids, dtype=np.uint32)
+            np_quantities = np.frombuffer(quantities, dtype=np.uint32)
+            wanted = np.fromiter(remaining.keys(), dtype=np.uint32, count=len(remaining))
+            partial_slots = np.flatnonzero(np.isin(np_ids, wanted) & (np_quantities < max_stack)).tolist()
+            empty_slots = np.flatnonzero(np_ids == 0).tolist()
+        else:
+            partial_slots = []
+            empty_slots = []
+            for i, (item_id, quantity) in enumerate(zip(ids, quantities)):
+                if item_id == 0:
+                    empty_slots.append(i)
+                elif item_id in remaining and quantity < max_stack:
+                    partial_slots.append(i)
+
+        journal = transactions.current() # Record changed slots if a transaction is open
+
+        # Top up partial stacks first
+        for i in partial_slots:
+            item_id = ids[i]
+            need = remaining[item_id]
+            if need:
+                if journal is not None:
+                    journal.record(self, i, (item_id, quantities[i]), use_snapshot=True)
+                added = max(0, min(need, item_registry.max_stack(item_id) - quantities[i]))
+                quantities[i] += added
+                remaining[item_id] = need - added
+                _adjust_total(self._totals, item_id, added)
+
+        # Then fill empty slots with full stacks plus a remainder stack
+        empty_iter = iter(empty_slots)
+        for item_id, need in remaining.items():
+            max_stack = item_registry.max_stack(item_id)
+            while need > 0:
+                i = next(empty_iter, None)
+                if i is None:
+                    break # Inventory full
+                if journal is not None:
+                    journal.record(self, i, None, use_snapshot=True)
+                stack_qty = min(need, max_stack)
+                ids[i] = item_id
+                quantities[i] = stack_qty
+                need -= stack_qty
+                _adjust_total(self._totals, item_id, stack_qty)
+            remaining[item_id] = need
+        return remaining
+
+    def rebuild(self, ordered_totals) -> int:
+        """Array version of rebuild_inventory (see below)."""
+        journal = transactions.current()
+        if journal is not None: # Every slot may change
+            for i, (item_id, quantity) in enumerate(zip(self._ids, self._quantities)):
+                journal.record(self, i, (item_id, quantity) if item_id else None, use_snapshot=True)
+        for view in list(self._views.values()):
+            view._detach() # Slot contents are about to be rewritten
+        self._views = weakref.WeakValueDictionary()
+
+        size = len(self._ids)
+        new_ids = array(SLOT_TYPECODE, bytes(self._ids.itemsize * size))
+        new_quantities = array(SLOT_TYPECODE, bytes(self._quantities.itemsize * size))
+        self._totals = {}
+        slot = 0
+        lost = 0
+        for item_id, total in ordered_totals:
+            max_stack = item_registry.max_stack(item_id)
+            full_stacks, remainder = divmod(total, max_stack)
+            stack_count = full_stacks + (1 if remainder else 0)
+            fit = min(stack_count, size - slot)
+            if fit < stack_count:
+                # Out of slots - keep as many full stacks as fit
+                lost += total - fit * max_stack
+                full_stacks, remainder = fit, 0
+            new_ids[slot:slot + fit] = array(SLOT_TYPECODE, [item_id]) * fit
+            new_quantities[slot:slot + full_stacks] = array(SLOT_TYPECODE, [max_stack]) * full_stacks
+            if remainder:
+                new_quantities[slot + full_stacks] = remainder
+            _adjust_total(self._totals, item_id, full_stacks * max_stack + remainder)
+            slot += fit
+        self._ids = new_ids
+        self._quantities = new_quantities
+        return lost
+
+    def to_save_list(self) -> list:
+        """Serializes to the save format: a list of {'item_id', 'quantity'} dicts or None."""
+        return [
+            {"item_id": item_id, "quantity": quantity} if item_id else None
+            for item_id, quantity in zip(self._ids.tolist(), self._quantities.tolist())
+        ]
+
+    def __repr__(self) -> str:
+        used = len(self._ids) - self._ids.count(0)
+        return f"CompactInventory(slots={len(self._ids)}, used={used})"
+
+
+# --- Backend Helpers ---
+# These work with both the list inventory and CompactInventory
+
+def create_inventory(size=None):
+    """Creates an empty inventory using the backend selected in constants."""
+    if size is None:
+        size = game_state.MAX_INVENTORY_SLOTS
+    if constants.USE_COMPACT_INVENTORY:
+        return CompactInventory(size)
+    return SlotInventory(size)
+
+
+def find_first_empty(inventory) -> int:
+    """Returns the index of the first empty slot in the inventory, or -1 if full."""
+    if isinstance(inventory, CompactInventory):
+        return inventory.find_first_empty()
+    for i, slot in enumerate(inventory):
+        if slot is None:
+            return i
+    return -1
+
+
+def deposit_items(inventory, items: dict) -> dict:
+    """
+    Adds several item types to the inventory in a single traversal.
+    Partial stacks of each item are topped up first, then empty slots are filled.
+    'items' is {item_id: quantity}. Returns {item_id: quantity that did NOT fit} for every
+    requested item (0 if everything fit). Invalid IDs/quantities are ignored.
+    """
+    remaining = {
+        item_id: quantity for item_id, quantity in items.items()
+        if isinstance(item_id, int) and item_id > 0 and isinstance(quantity, int) and quantity > 0
+    }
+    if not remaining:
+        return {}
+    if isinstance(inventory, CompactInventory):
+        return inventory.deposit(remaining)
+
+    # --- Single pass: top up matching stacks and remember empty slots ---
+    empty_slots = []
+    for i, stack in enumerate(inventory):
+        if stack is None:
+            empty_slots.append(i)
+        else:
+            need = remaining.get(stack.item_id)
+            if need and stack.quantity < stack.max_stack_size:
+                transactions.record(inventory, i)
+                remaining[stack.item_id] = need - stack.add(need)
+
+    # --- Fill empty slots with new stacks ---
+    empty_iter = iter(empty_slots)
+    for item_id, need in remaining.items():
+        max_stack = item_registry.max_stack(item_id)
+        while need > 0:
+            i = next(empty_iter, None)
+            if i is None:
+                break # Inventory full
+            stack_qty = min(need, max_stack)
+            transactions.record(inventory, i)
+            inventory[i] = game_state.ItemStack(item_id, stack_qty)
+            need -= stack_qty
+        remaining[item_id] = need
+    return remaining
+
+
+def withdraw_items(inventory, items: dict) -> bool:
+    """
+    Removes several item types from the inventory, taking from the last slots first.
+    'items' is {item_id: quantity}. All or nothing: returns False (inventory unchanged)
+    if any item is short, which is checked with the running totals before touching a slot.
+    """
+    remaining = {item_id: quantity for item_id, quantity in items.items() if quantity > 0}
+    if any(item_count(inventory, item_id) < quantity for item_id, quantity in remaining.items()):
+        return False
+
+    for i in range(len(inventory) - 1, -1, -1):
+        if not remaining:
+            break
+        stack = inventory[i]
+        if stack is None:
+            continue
+        item_id = stack.item_id
+        need = remaining.get(item_id)
+        if not need:
+            continue
+        transactions.record(inventory, i)
+        if stack.quantity <= need:
+            need -= stack.quantity
+            inventory[i] = None
+        else:
+            stack.quantity -= need
+            need = 0
+        if need:
+            remaining[item_id] = need
+        else:
+            del remaining[item_id]
+    return True
+
+
+def rebuild_inventory(inventory, ordered_totals) -> int:
+    """
+    Rewrites the inventory as tightly packed stacks.
+    'ordered_totals' is a list of (item_id, total quantity) in the order the items should appear.
+    Each item becomes full stacks followed by one remainder stack; trailing slots are emptied.
+    Returns the number of items that did not fit (0 unless the totals exceed the inventory).
+    """
+    if isinstance(inventory, CompactInventory):
+        return inventory.rebuild(ordered_totals)
+
+    new_stacks = []
+    lost = 0
+    for item_id, total in ordered_totals:
+        max_stack = item_registry.max_stack(item_id)
+        full_stacks, remainder = divmod(total, max_stack)
+        new_stacks.extend(game_state.ItemStack(item_id, max_stack) for _ in range(full_stacks))
+        if remainder:
+            new_stacks.append(game_state.ItemStack(item_id, remainder))
+    if len(new_stacks) > len(inventory):
+        lost = sum(stack.quantity for stack in new_stacks[len(inventory):])
+        del new_stacks[len(inventory):]
+
+    for i in range(len(inventory)):
+        transactions.record(inventory, i)
+        inventory[i] = new_stacks[i] if i < len(new_stacks) else None
+    return lost
+
+
+def used_slot_count(inventory) -> int:
+    """Returns the number of occupied slots."""
+    if isinstance(inventory, CompactInventory):
+        return len(inventory._ids) - inventory._ids.count(0)
+    return sum(1 for stack in inventory if stack is not None)
+
+
+def item_count(inventory, item_id: int) -> int:
+    """Returns how many of an item the inventory holds (O(1) for SlotInventory/CompactInventory)."""
+    if isinstance(inventory, (SlotInventory, CompactInventory)):
+        return inventory.item_count(item_id)
+    return inventory_totals(inventory).get(item_id, 0) # Plain list: count by scanning
+
+
+def inventory_totals(inventory) -> dict:
+    """Returns {item_id: total quantity} for the inventory."""
+    if isinstance(inventory, (SlotInventory, CompactInventory)):
+        return inventory.totals()
+    totals = {}
+    for stack in inventory:
+        if stack:
+            totals[stack.item_id] = totals.get(stack.item_id, 0) + stack.quantity
+    return totals
+
+
+def serialize_inventory(inventory) -> list:
+    """Converts the inventory to the save format (list of dicts or None)."""
+    if isinstance(inventory, CompactInventory):
+        return inventory.to_save_list()
+    return [
+        None if stack is None else {"item_id": stack.item_id, "quantity": stack.quantity}
+        for stack in inventory
+    ]
@@ -0,0 +1,212 @@
+# item_catalog.py
+# External item catalogs: extra items loaded from JSON Lines (.jsonl) or CSV (.csv) files
+# in the "catalogs" folder (constants.ITEM_CATALOG_DIR), on top of MINING_DATA in mine_speeds.py.
+#
+# Files are read one record at a time and each record is checked on its own, so a large
+# catalog never has to fit in memory as text and one bad record does not stop the load:
+# bad records are skipped and all problems are reported together at the end.
+#
+# JSON Lines: one item per line, the same fields as a MINING_DATA entry plus its name:
+#   {"name": "Birch log", "hardness": 2.0, "tool": "axe", "is_mineable": true, "speeds": {"default": 3.0, "wooden": 1.5}}
+# CSV: one item per row, speeds in "speed_<tier>" columns (empty cell = no speed):
+#   name,hardness,tool,is_mineable,max_stack,speed_default,speed_wooden
+#   Birch log,2.0,axe,true,64,3.0,1.5
+#
+# Fields: name (required), speeds.default (required, seconds per block), other speeds (tiers
+# from TOOL_HEADERS, None = no special speed), tool, is_mineable, max_stack, hardness.
+# An item name that already exists (in mine_speeds.py or an earlier record) is an error;
+# the first definition is kept. Files are loaded in name order.
+import csv
+import json
+import logging
+import math
+import os
+import sys
+import constants
+
+CATALOG_EXTENSIONS = (".jsonl", ".csv")
+CSV_SPEED_PREFIX = "speed_"
+RECORD_FIELDS = {"name", "hardness", "tool", "is_mineable", "max_stack", "speeds"}
+_TRUE_TEXT = {"true", "yes", "1", "y"}
+_FALSE_TEXT = {"false", "no", "0", "n", ""}
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogError(ValueError):
+    """A catalog record is invalid (the message says why)."""
+
+
+class CatalogReport:
+    """Outcome of loading catalogs: how many items were added and what went wrong."""
+    def __init__(self):
+        self.loaded = 0
+        self.error_count = 0
+        self.errors = [] # First constants.MAX_REPORTED_CATALOG_ERRORS messages ("file:line: problem")
+
+    def add_error(self, filename, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < constants.MAX_REPORTED_CATALOG_ERRORS:
+            self.errors.append(f"{filename}:{line_number}: {message}")
+
+    def log_summary(self):
+        if self.error_count == 0:
+            if self.loaded:
+                logger.info(f"Item catalogs: {self.loaded} items loaded.")
+            return
+        lines = [f"Item catalogs: {self.loaded} items loaded, {self.error_count} bad record(s) skipped:"]
+        lines += [f"  - {message}" for message in self.errors]
+        if self.error_count > len(self.errors):
+            lines.append(f"  - ... and {self.error_count - len(self.errors)} more")
+        logger.warning("\n".join(lines)) # One message, so the list is not interleaved with other output
+
+
+def catalog_paths(catalog_dir=None) -> list:
+    """Catalog files in the catalog folder, in name order ([] if there is no folder)."""
+    catalog_dir = catalog_dir or constants.ITEM_CATALOG_DIR
+    if not os.path.isdir(catalog_dir):
+        return []
+    return [os.path.join(catalog_dir, filename) for filename in sorted(os.listdir(catalog_dir))
+            if filename.lower().endswith(CATALOG_EXTENSIONS)]
+
+
+# --- Reading ---
+def iter_records(path):
+    """
+    Yields (line number, raw record) for each item in a catalog file, reading one line at a time.
+    A line that cannot be parsed is yielded as (line number, CatalogError).
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as catalog_file:
+            reader = csv.DictReader(catalog_file)
+            try:
+                for row in reader:
+                    yield reader.line_num, _csv_row_to_record(row)
+            except csv.Error as e:
+                yield reader.line_num, CatalogError(f"CSV error, rest of the file skipped: {e}")
+    else:
+        with open(path, "r", encoding="utf-8") as catalog_file:
+            for line_number, line in enumerate(catalog_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, CatalogError(f"Invalid JSON: {e}")
+
+
+def _csv_row_to_record(row) -> dict:
+    """Turns a CSV row (all text) into a record shaped like a JSON Lines one."""
+    if None in row:
+        return CatalogError("Row has more cells than the header.")
+    record = {"speeds": {}}
+    for column, text in row.items():
+        text = (text or "").strip()
+        if column.startswith(CSV_SPEED_PREFIX):
+            record["speeds"][column[len(CSV_SPEED_PREFIX):]] = _parse_number(text, column) if text else None
+        elif column == "is_mineable":
+            lowered = text.lower()
+            if lowered not in _TRUE_TEXT | _FALSE_TEXT:
+                return CatalogError(f"is_mineable must be true or false, not {text!r}.")
+            record[column] = lowered in _TRUE_TEXT
+        elif column in ("hardness", "max_stack"):
+            if text:
+                record[column] = _parse_number(text, column)
+        elif text or column == "name":
+            record[column] = text
+    for value in record["speeds"].values():
+        if isinstance(value, CatalogError):
+            return value
+    for column in ("hardness", "max_stack"):
+        if isinstance(record.get(column), CatalogError):
+            return record[column]
+    return record
+
+
+def _parse_number(text, column):
+    try:
+        return int(text) if text.lstrip("-").isdigit() else float(text)
+    except ValueError:
+        return CatalogError(f"{column} must be a number, not {text!r}.")
+
+
+# --- Checking ---
+def validate_record(record, tool_headers) -> tuple:
+    """
+    Checks one raw record and returns (name, entry), with the entry shaped like a MINING_DATA
+    value. Raises CatalogError describing the first problem found.
+    """
+    if isinstance(record, CatalogError):
+        raise record
+    if not isinstance(record, dict):
+        raise CatalogError("A record must be an object.")
+    unknown = set(record) - RECORD_FIELDS
+    if unknown:
+        raise CatalogError(f"Unknown field(s): {', '.join(sorted(unknown))}.")
+
+    name = record.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise CatalogError("Missing item name.")
+    name = name.strip()
+
+    speeds = record.get("speeds")
+    if not isinstance(speeds, dict):
+        raise CatalogError(f"'{name}': speeds must be an object.")
+    checked_speeds = {}
+    for tier, seconds in speeds.items():
+        if tier not in tool_headers:
+            raise CatalogError(f"'{name}': unknown speed tier {tier!r}.")
+        if seconds is None:
+            continue # No special speed for this tier
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not math.isfinite(seconds) or seconds <= 0:
+            raise CatalogError(f"'{name}': speed for {tier!r} must be a positive, finite number.")
+        checked_speeds[sys.intern(tier)] = float(seconds)
+    if "default" not in checked_speeds:
+        raise CatalogError(f"'{name}': a 'default' speed is required.")
+
+    tool = record.get("tool")
+    if tool is not None and not isinstance(tool, str):
+        raise CatalogError(f"'{name}': tool must be text.")
+    is_mineable = record.get("is_mineable", False)
+    if not isinstance(is_mineable, bool):
+        raise CatalogError(f"'{name}': is_mineable must be true or false.")
+
+    entry = {"tool": sys.intern(tool) if tool else None, "is_mineable": is_mineable, "speeds": checked_speeds}
+    if "hardness" in record:
+        hardness = record["hardness"]
+        if isinstance(hardness, bool) or not isinstance(hardness, (int, float)) or not math.isfinite(hardness) or hardness < 0:
+            raise CatalogError(f"'{name}': hardness must be a finite number of 0 or more.")
+        entry["hardness"] = float(hardness)
+    if "max_stack" in record:
+        max_stack = record["max_stack"]
+        if isinstance(max_stack, bool) or not isinstance(max_stack, int) or max_stack < 1:
+            raise CatalogError(f"'{name}': max_stack must be a whole number of 1 or more.")
+        entry["max_stack"] = max_stack
+    return name, entry
+
+
+# --- Loading ---
+def load_catalogs(item_properties: dict, tool_headers, paths=None) -> CatalogReport:
+    """
+    Adds every valid item from the catalog files to 'item_properties' ({name: entry}, normally
+    a copy of MINING_DATA). Bad records are skipped and listed in the returned report.
+    """
+    report = CatalogReport()
+    tool_headers = set(tool_headers or ())
+    for path in (catalog_paths() if paths is None else paths):
+        filename = os.path.basename(path)
+        try:
+            for line_number, record in iter_records(path):
+                try:
+                    name, entry = validate_record(record, tool_headers)
+                except CatalogError as e:
+                    report.add_error(filename, line_number, str(e))
+                    continue
+                if name in item_properties:
+                    report.add_error(filename, line_number, f"Item '{name}' is already defined.")
+                    continue
+                item_properties[name] = entry
+                report.loaded += 1
+        except (IOError, UnicodeDecodeError) as e:
+            report.add_error(filename, 0, f"Could not read the file: {e}")
+    return report
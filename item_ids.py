@@ -0,0 +1,106 @@
+# item_ids.py
+# Persistent item ID registry: item_ids.json pins the ID of every item name ever loaded.
+#
+# IDs used to come from the sorted item names, so adding one item could renumber the others
+# and saves (which store raw item IDs) would then point at the wrong items. Now:
+#   - the ID of a name is its position in the "names" list (ID = index + 1, 0 is "Back")
+#   - the list is append-only: new items are added at the end, nothing is ever removed or
+#     moved, so an ID keeps meaning the same item forever (removed items keep their ID)
+#   - the registry version is the number of names; saves store the version they were made with
+# Saves made before this registry existed ("legacy" saves, no version) used IDs 1.. over the
+# sorted names of the items shipped then. The first LEGACY_REGISTRY_VERSION names of the
+# shipped item_ids.json are exactly those names in that order, so a legacy save is read as a
+# save of that registry version. Since the registry is append-only, the IDs of every save
+# (legacy or versioned) still mean the same items: loading never translates item IDs.
+import json
+import logging
+import os
+
+REGISTRY_DIR = os.path.dirname(os.path.abspath(__file__)) # Next to the save files
+REGISTRY_FILENAME = "item_ids.json"
+REGISTRY_FORMAT = 1
+LEGACY_REGISTRY_VERSION = 4 # Items that existed before the registry (Crafting Table .. Stick)
+
+logger = logging.getLogger(__name__)
+
+_names = []       # Index + 1 = item ID
+_name_to_id = {}
+_loaded = False
+
+
+def registry_path() -> str:
+    return os.path.join(REGISTRY_DIR, REGISTRY_FILENAME)
+
+
+def load() -> bool:
+    """(Re)reads the registry file. Returns False if it exists but could not be read."""
+    global _names, _name_to_id, _loaded
+    _names, _name_to_id, _loaded = [], {}, True
+    if not os.path.exists(registry_path()):
+        return True
+    try:
+        with open(registry_path(), "r", encoding="utf-8") as registry_file:
+            data = json.load(registry_file)
+        names = data["names"]
+        if data.get("format") != REGISTRY_FORMAT or not all(isinstance(name, str) for name in names):
+            raise ValueError("unknown format")
+        if len(set(names)) != len(names):
+            raise ValueError("duplicate item names")
+        _names = list(names)
+        _name_to_id = {name: i + 1 for i, name in enumerate(_names)}
+        return True
+    except (IOError, ValueError, KeyError, TypeError, AttributeError) as e:
+        # Do not overwrite a damaged registry (it is the only record of which ID is which item)
+        _loaded = False
+        logger.error(f"Could not read item ID registry '{REGISTRY_FILENAME}': {e}")
+        return False
+
+
+def _save():
+    temp_path = f"{registry_path()}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as registry_file:
+        json.dump({"format": REGISTRY_FORMAT, "names": _names}, registry_file, indent=1)
+    os.replace(temp_path, registry_path())
+
+
+def version() -> int:
+    """Registry version: the number of IDs handed out so far."""
+    if not _loaded:
+        load()
+    return len(_names)
+
+
+def assign_ids(names) -> dict:
+    """
+    Returns {name: item ID} for the given item names. Names without an ID get the next IDs
+    (in sorted order) and are written to the registry file right away.
+    Raises ValueError if the registry file is damaged.
+    """
+    if not _loaded and not load():
+        raise ValueError(f"Item ID registry '{REGISTRY_FILENAME}' is damaged. Fix or restore it before starting the game.")
+    new_names = sorted(set(name for name in names if name not in _name_to_id))
+    if new_names:
+        for name in new_names:
+            _names.append(name)
+            _name_to_id[name] = len(_names)
+        _save()
+        logger.info(f"Item ID registry: {len(new_names)} new item ID(s) added (version {len(_names)}).")
+    return {name: _name_to_id[name] for name in names}
+
+
+def check_save_version(save_version) -> bool:
+    """
+    Checks that the registry knows every ID of a save made with registry version
+    'save_version' (None = legacy save, i.e. LEGACY_REGISTRY_VERSION). IDs are append-only,
+    so the saved IDs of any older version are used as they are; there is nothing to translate.
+    Returns False (and warns) if the save is newer than the registry.
+    """
+    if not _loaded:
+        load()
+    if save_version is None:
+        save_version = LEGACY_REGISTRY_VERSION
+    if save_version > len(_names):
+        logger.warning(f"Save uses item ID registry version {save_version}, but '{REGISTRY_FILENAME}' only has "
+                       f"{len(_names)} IDs. Unknown items will be skipped.")
+        return False
+    return True
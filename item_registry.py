@@ -0,0 +1,150 @@
+# item_registry.py
+# Central registry of item properties, built once by data_loader.load_mining_data().
+#
+# Properties are stored in dense tuples indexed directly by item ID (index 0 is "Back"
+# and holds a placeholder), so a lookup is a single tuple index instead of a dict lookup:
+#   names[item_id], max_stacks[item_id], mineable[item_id], tool_types[item_id], textures[item_id]
+#
+# Each item also has one shared ItemType object (a "flyweight"): every ItemStack of that
+# item points to the same ItemType instead of copying the name/max stack into each stack.
+# NOTE: This module must not import game_state (game_state.ItemStack imports this module).
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_STACK = 64
+
+
+class ItemType:
+    """Shared, read-only description of one item. One instance per item ID."""
+    __slots__ = ("item_id", "name", "max_stack", "mineable", "tool_type", "texture")
+
+    def __init__(self, item_id, name, max_stack=DEFAULT_MAX_STACK, mineable=False, tool_type=None):
+        self.item_id = item_id
+        self.name = name
+        self.max_stack = max_stack
+        self.mineable = mineable
+        self.tool_type = tool_type # e.g. "axe", "pickaxe" or None
+        self.texture = None        # pygame.Surface, set by set_texture() once textures are loaded
+
+    def __repr__(self) -> str:
+        return f"ItemType(id={self.item_id}, name='{self.name}')"
+
+
+# --- Dense Property Tables (index = item ID) ---
+item_types = ()
+names = ()
+max_stacks = ()
+mineable = ()
+tool_types = ()
+textures = [] # List (not tuple) so textures can be added after pygame has started
+
+# Types handed out for IDs that are not in the registry (e.g. data from an old save)
+_unknown_types = {}
+
+
+def build_registry(item_id_to_name: dict, item_properties: dict):
+    """
+    Builds the dense tables from the {item_id: name} map and the per-name item properties
+    (the MINING_DATA dictionary from mine_speeds.py). Replaces any previous registry.
+    """
+    global textures
+    size = max(item_id_to_name, default=0) + 1
+    types = [None] * size
+    for item_id, name in item_id_to_name.items():
+        types[item_id] = ItemType(item_id, name)
+        _set_properties(types[item_id], item_properties.get(name, {}))
+
+    _set_tables(types)
+    textures = [None] * size
+    _unknown_types.clear()
+    logger.info(f"Item registry built ({size - 1} item IDs).")
+
+
+def update_items(updated: dict, item_properties: dict):
+    """
+    Updates or adds the items in {item_id: name} (hot reload) without touching the others.
+    Existing ItemTypes are changed in place, so stacks already in inventories see the new
+    properties; textures of existing items are kept.
+    """
+    global textures
+    size = max(len(item_types), max(updated, default=0) + 1)
+    types = list(item_types) + [None] * (size - len(item_types))
+    for item_id, name in updated.items():
+        if types[item_id] is None:
+            types[item_id] = _unknown_types.pop(item_id, None) or ItemType(item_id, name)
+        types[item_id].name = name
+        _set_properties(types[item_id], item_properties.get(name, {}))
+    _set_tables(types)
+    textures = textures + [None] * (size - len(textures))
+
+
+def _set_properties(item_type, properties):
+    item_type.max_stack = properties.get("max_stack", DEFAULT_MAX_STACK)
+    item_type.mineable = bool(properties.get("is_mineable", False))
+    item_type.tool_type = properties.get("tool")
+
+
+def _set_tables(types):
+    """Rebuilds the dense property tuples from a list of ItemTypes (None for unused IDs)."""
+    global item_types, names, max_stacks, mineable, tool_types
+    item_types = tuple(types)
+    names = tuple(t.name if t else "" for t in types)
+    max_stacks = tuple(t.max_stack if t else DEFAULT_MAX_STACK for t in types)
+    mineable = tuple(t.mineable if t else False for t in types)
+    tool_types = tuple(t.tool_type if t else None for t in types)
+
+
+def export_tables() -> dict:
+    """Returns the registry tables for the compiled data bundle (textures are not included)."""
+    return {"item_types": item_types, "names": names, "max_stacks": max_stacks, "mineable": mineable, "tool_types": tool_types}
+
+
+def import_tables(tables: dict):
+    """Replaces the registry with tables from export_tables() (textures are loaded afterwards)."""
+    global item_types, names, max_stacks, mineable, tool_types, textures
+    item_types = tables["item_types"]
+    names = tables["names"]
+    max_stacks = tables["max_stacks"]
+    mineable = tables["mineable"]
+    tool_types = tables["tool_types"]
+    textures = [None] * len(item_types)
+    _unknown_types.clear()
+
+
+def clear_registry():
+    """Empties the registry (used when item data fails to load)."""
+    build_registry({}, {})
+
+
+def get_type(item_id: int) -> ItemType:
+    """Returns the shared ItemType for an item ID (a placeholder type for unknown IDs)."""
+    if 0 < item_id < len(item_types):
+        item_type = item_types[item_id]
+        if item_type is not None:
+            return item_type
+    item_type = _unknown_types.get(item_id)
+    if item_type is None:
+        item_type = _unknown_types[item_id] = ItemType(item_id, f"ID:{item_id}")
+    return item_type
+
+
+def max_stack(item_id: int) -> int:
+    """Returns the max stack size of an item."""
+    if 0 < item_id < len(max_stacks):
+        return max_stacks[item_id]
+    return DEFAULT_MAX_STACK
+
+
+def set_texture(item_id: int, texture):
+    """Stores the loaded texture for an item (in the table and on its ItemType)."""
+    if 0 < item_id < len(textures):
+        textures[item_id] = texture
+    get_type(item_id).texture = texture
+
+
+def texture(item_id: int):
+    """Returns the texture for an item, or None if it has none."""
+    if 0 < item_id < len(textures):
+        return textures[item_id]
+    return None
@@ -0,0 +1,78 @@
+# item_search.py
+# Prefix index for type-to-filter item search (inventory screen and mining menu).
+#
+# The index is a sorted list of lowercase search keys with a parallel list of item IDs.
+# Each item is indexed by its full name and by every word suffix of its name,
+# so "oak" and "log" both find "Oak log". A lookup is two binary searches
+# (bisect) plus the matching slice, instead of a substring scan over every name.
+import bisect
+import logging
+import game_state
+
+logger = logging.getLogger(__name__)
+
+# --- Index Data ---
+# Populated by build_search_index() after item data is loaded
+_search_keys = [] # Sorted lowercase keys
+_search_ids = []  # Item ID for each key (same order as _search_keys)
+
+# Sorts after any character that can appear in a name, used as the upper bound of a prefix range
+_PREFIX_END = chr(0x10FFFF)
+
+
+def build_search_index():
+    """
+    Builds the prefix index from game_state.item_name_to_id.
+    Should be called once after item data (names/IDs) has been loaded.
+    """
+    global _search_keys, _search_ids
+    entries = []
+    for name, item_id in game_state.item_name_to_id.items():
+        words = name.lower().split()
+        # Full name plus each word suffix: "oak log" -> "oak log", "log"
+        for i in range(len(words)):
+            entries.append((" ".join(words[i:]), item_id))
+    entries.sort()
+    _search_keys = [key for key, _ in entries]
+    _search_ids = [item_id for _, item_id in entries]
+    logger.info(f"Item search index built ({len(_search_keys)} keys for {len(game_state.item_name_to_id)} items).")
+
+
+def add_items(name_to_id: dict):
+    """Adds new items to the prefix index without rebuilding it (hot reload)."""
+    for name, item_id in name_to_id.items():
+        words = name.lower().split()
+        for i in range(len(words)):
+            index = bisect.bisect_left(_search_keys, " ".join(words[i:]))
+            _search_keys.insert(index, " ".join(words[i:]))
+            _search_ids.insert(index, item_id)
+
+
+def export_index() -> dict:
+    """Returns the prefix index for the compiled data bundle."""
+    return {"keys": _search_keys, "ids": _search_ids}
+
+
+def import_index(index: dict):
+    """Replaces the prefix index with one from export_index()."""
+    global _search_keys, _search_ids
+    _search_keys = index["keys"]
+    _search_ids = index["ids"]
+
+
+def search_item_ids(prefix: str):
+    """
+    Returns the set of item IDs whose name (or a word in it) starts with 'prefix'.
+    Returns None for an empty prefix, meaning "no filter".
+    """
+    prefix = " ".join(prefix.lower().split()) # Normalise case and spacing like the keys
+    if not prefix:
+        return None
+    start = bisect.bisect_left(_search_keys, prefix)
+    end = bisect.bisect_left(_search_keys, prefix + _PREFIX_END, lo=start)
+    return set(_search_ids[start:end])
+
+
+def active_filter():
+    """Returns the set of item IDs matching the current search text, or None if not searching."""
+    return search_item_ids(game_state.search_text)
@@ -0,0 +1,186 @@
+# mining_jobs.py
+# Mining job queue: several mining jobs can run at the same time while the player
+# keeps using the other screens. Each world has its own MiningQueue (world.mining_jobs).
+#
+# Up to constants.MAX_PARALLEL_MINING_JOBS jobs run at once; more jobs wait in a FIFO
+# queue and start as soon as a running job finishes. Running jobs are kept in a min-heap
+# ordered by the time their next block is ready, so checking for due blocks each frame
+# only looks at the top of the heap instead of at every job.
+#
+# Blocks are delivered progressively: a job mines one block every 'seconds_per_block',
+# and how many are done is worked out from the elapsed time (not by counting frames),
+# so a slow frame simply delivers a few blocks at once.
+#
+# Game time (the 'now' passed in, from game_clock.now()) only runs while the game is open.
+# To keep mining while the game is closed, the save stores each running job's start as a
+# wall-clock timestamp (game_clock.wall_time()); on load the job is placed back that far in the past and the next
+# collect_due_blocks() call works out everything mined in between in one step.
+import collections
+import heapq
+import itertools
+import logging
+import constants
+
+logger = logging.getLogger(__name__)
+
+
+class MiningJob:
+    """One mining order: mine 'quantity' blocks of 'block_id' with 'tool_name'."""
+    __slots__ = ("job_id", "block_id", "quantity", "tool_name", "seconds_per_block", "start_time", "deadline",
+                 "delivered", "lost")
+
+    def __init__(self, job_id, block_id, quantity, tool_name, seconds_per_block):
+        self.job_id = job_id
+        self.block_id = block_id
+        self.quantity = quantity
+        self.tool_name = tool_name # None = bare hands
+        self.seconds_per_block = seconds_per_block
+        self.start_time = None # Set when the job starts running
+        self.deadline = None   # Time the last block is ready
+        self.delivered = 0     # Blocks handed to the inventory so far
+        self.lost = 0          # Delivered blocks that did not fit in the inventory
+
+    @property
+    def duration(self) -> float:
+        return self.seconds_per_block * self.quantity
+
+    def blocks_done(self, now: float) -> int:
+        """Number of blocks mined by time 'now' (computed from the elapsed time)."""
+        if self.start_time is None or now < self.start_time:
+            return 0
+        if self.seconds_per_block <= 0:
+            return self.quantity
+        return min(self.quantity, int((now - self.start_time) / self.seconds_per_block))
+
+    def next_block_time(self) -> float:
+        """Time the next undelivered block is ready."""
+        return self.start_time + (self.delivered + 1) * self.seconds_per_block
+
+    def progress(self, now: float) -> float:
+        """Fraction of the job done at time 'now' (0.0 while waiting)."""
+        if self.start_time is None or self.duration <= 0:
+            return 0.0
+        return min(1.0, max(0.0, (now - self.start_time) / self.duration))
+
+    def __repr__(self) -> str:
+        return f"MiningJob(id={self.job_id}, block={self.block_id}, qty={self.quantity}, deadline={self.deadline})"
+
+
+# --- Job Queue ---
+
+class MiningQueue:
+    """The running and waiting mining jobs of one world (see world.World)."""
+    def __init__(self):
+        self._running = [] # Heap of (next block time, job_id, job)
+        self._waiting = collections.deque() # Jobs waiting for a free slot, in order
+        self._job_ids = itertools.count(1)
+
+    def _start_job(self, job, start_time):
+        job.start_time = start_time
+        job.deadline = start_time + job.duration
+        heapq.heappush(self._running, (job.next_block_time(), job.job_id, job))
+
+    def add_job(self, block_id, quantity, seconds_per_block, tool_name, now):
+        """
+        Adds a mining job. It starts right away if a slot is free, otherwise it waits.
+        Returns the new MiningJob, or None if the queue is full.
+        """
+        if self.is_full():
+            return None
+        job = MiningJob(next(self._job_ids), block_id, quantity, tool_name, seconds_per_block)
+        if len(self._running) < constants.MAX_PARALLEL_MINING_JOBS:
+            self._start_job(job, now)
+        else:
+            self._waiting.append(job)
+        return job
+
+    def collect_due_blocks(self, now) -> list:
+        """
+        Returns [(job, block count), ...] for every running job with blocks ready by 'now'
+        and marks them as delivered. A job is finished when job.delivered == job.quantity;
+        it is then removed, and a waiting job takes over the slot from the moment the
+        finished job ended (not from 'now'), so no time is lost between frames.
+        """
+        due = []
+        running = self._running
+        while running and running[0][0] <= now:
+            _, job_id, job = heapq.heappop(running)
+            # At least one block is ready (its time passed), even if float rounding says otherwise
+            count = max(1, job.blocks_done(now) - job.delivered)
+            count = min(count, job.quantity - job.delivered)
+            job.delivered += count
+            due.append((job, count))
+            if job.delivered < job.quantity:
+                heapq.heappush(running, (job.next_block_time(), job_id, job))
+            elif self._waiting:
+                self._start_job(self._waiting.popleft(), job.deadline)
+        return due
+
+    def next_block_time(self):
+        """Time the next block of any running job is ready, or None if nothing is running."""
+        return self._running[0][0] if self._running else None
+
+    def running_jobs(self) -> list:
+        """Running jobs, soonest to finish first."""
+        return sorted((job for _, _, job in self._running), key=lambda job: job.deadline)
+
+    def waiting_jobs(self) -> list:
+        return list(self._waiting)
+
+    def job_count(self) -> int:
+        return len(self._running) + len(self._waiting)
+
+    def is_full(self) -> bool:
+        """True if no more jobs can be added (every running and waiting place is taken)."""
+        return self.job_count() >= constants.MAX_PARALLEL_MINING_JOBS + constants.MAX_WAITING_MINING_JOBS
+
+    def clear_jobs(self):
+        """Drops every running and waiting job."""
+        self._running.clear()
+        self._waiting.clear()
+
+    # --- Saving / Loading ---
+
+    def to_save_list(self, now, wall_now) -> list:
+        """
+        Converts every job to the save format (list of dicts), running jobs first.
+        'wall_now' is game_clock.wall_time(); running jobs store their start as a wall-clock timestamp.
+        """
+        saved = []
+        for job in self.running_jobs() + self.waiting_jobs():
+            saved.append({
+                "block_id": job.block_id,
+                "quantity": job.quantity,
+                "tool": job.tool_name,
+                "seconds_per_block": job.seconds_per_block,
+                "delivered": job.delivered,
+                "lost": job.lost,
+                # None = still waiting for a free slot
+                "start_wall": None if job.start_time is None else wall_now - (now - job.start_time),
+            })
+        return saved
+
+    def restore_jobs(self, saved: list, now, wall_now) -> int:
+        """
+        Replaces the queue with jobs from a save. Time passed since a job started (including
+        while the game was closed) counts as mining time, so the next collect_due_blocks(now)
+        delivers every block finished in the meantime without simulating the frames in between.
+        Returns the number of jobs restored.
+        """
+        self.clear_jobs()
+        for data in saved:
+            try:
+                job = MiningJob(next(self._job_ids), int(data["block_id"]), int(data["quantity"]),
+                                data.get("tool"), float(data["seconds_per_block"]))
+                job.delivered = min(job.quantity, max(0, int(data.get("delivered", 0))))
+                job.lost = max(0, int(data.get("lost", 0)))
+                start_wall = data.get("start_wall")
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Ignoring invalid saved mining job: {data}")
+                continue
+            if start_wall is not None and len(self._running) < constants.MAX_PARALLEL_MINING_JOBS:
+                # A clock set backwards must not make the job go back in time
+                self._start_job(job, now - max(0.0, wall_now - float(start_wall)))
+            else:
+                self._waiting.append(job)
+        return self.job_count()
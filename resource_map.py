@@ -0,0 +1,205 @@
+# resource_map.py
+# Per-world resource maps: how many of each mineable block are left in a world.
+#
+# Every saved world (save slot) has a seeded map of RESOURCE_MAP_CHUNKS x RESOURCE_MAP_CHUNKS
+# chunks per block type. A chunk is a RESOURCE_CHUNK_SIZE x RESOURCE_CHUNK_SIZE grid of
+# cells, each holding a number of blocks (patchy: rich and poor areas). Mining takes blocks
+# out of the chunks in order, so a world eventually runs out of a block.
+#
+# Chunks are generated with NumPy from (seed, block ID, chunk position) the first time they
+# are touched and never before, so an untouched world has no chunk files at all.
+# Chunk files are .npy arrays in the "savegame_N_map" folder next to savegame_N.dat and are
+# opened as copy-on-write memory maps: only the pages that are read come into memory, and
+# changes stay in memory until the world is saved. Saving writes only the changed chunks
+# (like the storage pages in save_manager.py) plus a small map.json with the seed.
+#
+# Worlds without a save slot (headless/simulations) have no map and unlimited blocks.
+# Without NumPy, resource maps are disabled (unlimited blocks).
+import collections
+import json
+import logging
+import os
+import secrets
+import constants
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+MAP_FORMAT_VERSION = 1
+META_FILENAME = "map.json"
+CHUNK_FILENAME_TEMPLATE = "chunk_{}_{}_{}.npy" # block_id, chunk x, chunk y
+CHUNK_DTYPE = "<u2" # Blocks per cell (0-65535)
+PATCH_SIZE = 8 # Cells per side of an area with the same richness
+
+
+class ResourceMap:
+    """The remaining blocks of one world, stored in chunk files in 'map_dir'."""
+    def __init__(self, map_dir, seed=None):
+        self.map_dir = map_dir
+        self.seed = seed if seed is not None else secrets.randbits(63)
+        self.chunk_size = constants.RESOURCE_CHUNK_SIZE
+        self.chunks_per_side = constants.RESOURCE_MAP_CHUNKS
+        self.cursors = {} # block_id -> index of the first chunk that may still have that block
+        self._chunks = collections.OrderedDict() # (block_id, chunk index) -> array, least recently used first
+        self.dirty_chunks = set() # Chunks changed since the last save (kept in memory until then)
+
+    # --- Opening ---
+    @classmethod
+    def open(cls, map_dir, fresh=False):
+        """
+        Opens the map in 'map_dir', or starts a new one (new seed) if there is none or 'fresh'
+        is True (old chunk files are deleted then). Returns None if NumPy is not available.
+        """
+        if np is None:
+            return None
+        meta = None
+        meta_path = os.path.join(map_dir, META_FILENAME)
+        if not fresh and os.path.exists(meta_path):
+            try:
+                with open(meta_path, "r", encoding="utf-8") as meta_file:
+                    meta = json.load(meta_file)
+                if meta.get("version") != MAP_FORMAT_VERSION or \
+                   meta.get("chunk_size") != constants.RESOURCE_CHUNK_SIZE or \
+                   meta.get("chunks_per_side") != constants.RESOURCE_MAP_CHUNKS:
+                    logger.info(f"Resource map in '{os.path.basename(map_dir)}' has an old layout. Generating a new map.")
+                    meta = None
+            except (IOError, ValueError, AttributeError) as e:
+                logger.error(f"Could not read resource map info '{meta_path}': {e}. Generating a new map.")
+                meta = None
+
+        if meta is None:
+            _remove_map_files(map_dir)
+            return cls(map_dir)
+        resource_map = cls(map_dir, int(meta["seed"]))
+        resource_map.cursors = {int(block_id): int(index) for block_id, index in meta.get("cursors", {}).items()}
+        return resource_map
+
+    # --- Chunks ---
+    def chunk_count(self) -> int:
+        return self.chunks_per_side * self.chunks_per_side
+
+    def _chunk_path(self, block_id, index):
+        chunk_x, chunk_y = divmod(index, self.chunks_per_side)
+        return os.path.join(self.map_dir, CHUNK_FILENAME_TEMPLATE.format(block_id, chunk_x, chunk_y))
+
+    def _generate_chunk(self, block_id, index):
+        """Cell counts of a chunk that was never touched (same result for the same seed)."""
+        chunk_x, chunk_y = divmod(index, self.chunks_per_side)
+        rng = np.random.default_rng([self.seed, block_id, chunk_x, chunk_y])
+        patches = -(-self.chunk_size // PATCH_SIZE)
+        # Richness per patch (mean 1.0), spread over its cells
+        richness = rng.gamma(2.0, 0.5, size=(patches, patches))
+        richness = np.kron(richness, np.ones((PATCH_SIZE, PATCH_SIZE)))[:self.chunk_size, :self.chunk_size]
+        cells = rng.poisson(constants.RESOURCE_MEAN_PER_CELL * richness)
+        return np.minimum(cells, np.iinfo(CHUNK_DTYPE).max).astype(CHUNK_DTYPE)
+
+    def _get_chunk(self, block_id, index):
+        """Returns a chunk, memory-mapping its file (or generating it) the first time it is used."""
+        key = (block_id, index)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        path = self._chunk_path(block_id, index)
+        chunk = None
+        if os.path.exists(path):
+            try:
+                chunk = np.load(path, mmap_mode="c") # Copy-on-write: the file only changes on save
+                if chunk.shape != (self.chunk_size, self.chunk_size):
+                    logger.warning(f"Resource chunk '{os.path.basename(path)}' has the wrong size. Regenerating it.")
+                    chunk = None
+            except (IOError, ValueError) as e:
+                logger.error(f"Could not read resource chunk '{os.path.basename(path)}': {e}. Regenerating it.")
+        if chunk is None:
+            chunk = self._generate_chunk(block_id, index)
+        self._chunks[key] = chunk
+        self._unload_old_chunks()
+        return chunk
+
+    def _unload_old_chunks(self):
+        """Drops the least recently used unchanged chunks beyond RESOURCE_MAX_OPEN_CHUNKS."""
+        if len(self._chunks) <= constants.RESOURCE_MAX_OPEN_CHUNKS:
+            return
+        for key in list(self._chunks):
+            if len(self._chunks) <= constants.RESOURCE_MAX_OPEN_CHUNKS:
+                break
+            if key not in self.dirty_chunks: # Changed chunks stay until they are saved
+                del self._chunks[key]
+
+    # --- Mining ---
+    def take(self, block_id, quantity) -> int:
+        """
+        Removes up to 'quantity' blocks from the map, starting at the first chunk that still
+        has some. Returns how many were taken (less than asked when the world runs out).
+        """
+        taken = 0
+        index = self.cursors.get(block_id, 0)
+        while taken < quantity and index < self.chunk_count():
+            cells = self._get_chunk(block_id, index).reshape(-1)
+            # Running total over the cells: everything up to the cell that covers the rest is taken
+            running = np.cumsum(cells, dtype=np.int64)
+            wanted = quantity - taken
+            if running[-1] <= wanted:
+                taken += int(running[-1])
+                if running[-1]:
+                    cells[:] = 0
+                    self.dirty_chunks.add((block_id, index))
+                index += 1
+                continue
+            last = int(np.searchsorted(running, wanted)) # First cell where the running total reaches 'wanted'
+            before = int(running[last - 1]) if last else 0
+            cells[:last] = 0
+            cells[last] -= wanted - before
+            self.dirty_chunks.add((block_id, index))
+            taken = quantity
+        self.cursors[block_id] = index
+        return taken
+
+    def remaining(self, block_id) -> int:
+        """Blocks of a type left in the whole map (reads every chunk not yet mined out)."""
+        start = self.cursors.get(block_id, 0)
+        return sum(int(self._get_chunk(block_id, index).sum(dtype=np.int64)) for index in range(start, self.chunk_count()))
+
+    # --- Saving ---
+    def save(self) -> int:
+        """Writes the changed chunks and map.json. Returns the number of chunks written."""
+        os.makedirs(self.map_dir, exist_ok=True)
+        chunks_written = 0
+        for block_id, index in sorted(self.dirty_chunks):
+            path = self._chunk_path(block_id, index)
+            # Copy out of the old file and drop its memory map before replacing the file
+            # (a mapped file cannot be replaced on Windows). The copy stays in use in memory;
+            # the new file is mapped again after the chunk is unloaded.
+            data = np.array(self._chunks[(block_id, index)])
+            self._chunks[(block_id, index)] = data
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as chunk_file:
+                np.save(chunk_file, data)
+            os.replace(temp_path, path)
+            chunks_written += 1
+        self.dirty_chunks.clear()
+        self._unload_old_chunks()
+
+        meta = {
+            "version": MAP_FORMAT_VERSION,
+            "seed": self.seed,
+            "chunk_size": self.chunk_size,
+            "chunks_per_side": self.chunks_per_side,
+            "cursors": {str(block_id): index for block_id, index in self.cursors.items()},
+        }
+        with open(os.path.join(self.map_dir, META_FILENAME), "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+        return chunks_written
+
+
+def _remove_map_files(map_dir):
+    """Deletes the files of an old map so a new seed does not mix with them."""
+    if not os.path.isdir(map_dir):
+        return
+    for filename in os.listdir(map_dir):
+        if filename == META_FILENAME or (filename.startswith("chunk_") and filename.endswith((".npy", ".npy.tmp"))):
+            os.remove(os.path.join(map_dir, filename))
@@ -2,20 +2,35 @@
 import os
 import json
 import base64
+import logging
 from cryptography.fernet import Fernet, InvalidToken
 import game_state
+import inventory_store
+import storage
+import item_registry
+import game_logic
+import game_clock
+import resource_map
+import item_ids
 import constants # To potentially access constants if needed later
 
+logger = logging.getLogger(__name__)
+
 # --- Constants ---
 SAVE_FILENAME_TEMPLATE = "savegame_{}.dat"
 KEY_FILENAME_TEMPLATE = "save_{}.key"
+# Storage chests are saved one page per file, so unchanged pages are never rewritten
+STORAGE_DIRNAME_TEMPLATE = "savegame_{}_storage"
+STORAGE_PAGE_FILENAME_TEMPLATE = "chest{}_page{}.dat"
+# Resource map chunks (memory-mapped .npy files, see resource_map.py)
+MAP_DIRNAME_TEMPLATE = "savegame_{}_map"
 SAVE_DIR = os.path.dirname(__file__) # Save in the same directory as the script
 
 # --- Helper Functions ---
 def _get_save_file_path(slot_id):
     """Returns the full path for the save file of a given slot."""
     if not (1 <= slot_id <= constants.MAX_SAVE_SLOTS):
-        print(f"Error: Invalid slot_id '{slot_id}' requested.")
+        logger.error(f"Invalid slot_id '{slot_id}' requested.")
         return None
     filename = SAVE_FILENAME_TEMPLATE.format(slot_id)
     return os.path.join(SAVE_DIR, filename)
@@ -23,11 +38,25 @@ def _get_save_file_path(slot_id):
 def _get_key_file_path(slot_id):
     """Returns the full path for the key file of a given slot."""
     if not (1 <= slot_id <= constants.MAX_SAVE_SLOTS):
-        print(f"Error: Invalid slot_id '{slot_id}' requested.")
+        logger.error(f"Invalid slot_id '{slot_id}' requested.")
         return None
     filename = KEY_FILENAME_TEMPLATE.format(slot_id)
     return os.path.join(SAVE_DIR, filename)
 
+def _get_storage_dir(slot_id):
+    """Returns the folder holding the storage page files of a given slot."""
+    if not (1 <= slot_id <= constants.MAX_SAVE_SLOTS):
+        logger.error(f"Invalid slot_id '{slot_id}' requested.")
+        return None
+    return os.path.join(SAVE_DIR, STORAGE_DIRNAME_TEMPLATE.format(slot_id))
+
+def _get_map_dir(slot_id):
+    """Returns the folder holding the resource map chunks of a given slot."""
+    if not (1 <= slot_id <= constants.MAX_SAVE_SLOTS):
+        logger.error(f"Invalid slot_id '{slot_id}' requested.")
+        return None
+    return os.path.join(SAVE_DIR, MAP_DIRNAME_TEMPLATE.format(slot_id))
+
 def get_save_slot_exists(slot_id):
     """Checks if a save file exists for the given slot."""
     save_path = _get_save_file_path(slot_id)
@@ -43,10 +72,10 @@ def _generate_key(slot_id):
     try:
         with open(key_path, "wb") as key_file: # Write bytes
             key_file.write(key)
-        print(f"Encryption key generated and saved to {os.path.basename(key_path)}")
+        logger.info(f"Encryption key generated and saved to {os.path.basename(key_path)}")
         return key
     except IOError as e:
-        print(f"Error: Could not write key file '{key_path}': {e}")
+        logger.error(f"Could not write key file '{key_path}': {e}")
         return None
 
 def _load_key(slot_id):
@@ -55,7 +84,7 @@ def _load_key(slot_id):
     if not key_path: return None
 
     if not os.path.exists(key_path):
-        print(f"Key file '{os.path.basename(key_path)}' not found. Generating a new key.")
+        logger.info(f"Key file '{os.path.basename(key_path)}' not found. Generating a new key.")
         return _generate_key(slot_id)
     else:
         try:
@@ -63,21 +92,100 @@ def _load_key(slot_id):
                 key = key_file.read()
             # Basic check: Fernet keys are base64 encoded and have a specific length
             if len(base64.urlsafe_b64decode(key)) != 32:
-                 print(f"Warning: Invalid key format in {os.path.basename(key_path)}. Generating a new key.")
+                 logger.warning(f"Invalid key format in {os.path.basename(key_path)}. Generating a new key.")
                  # Optionally backup the old key file here
                  return _generate_key(slot_id)
             return key
         except (IOError, ValueError, TypeError) as e:
-            print(f"Error reading key file '{key_path}': {e}. Generating a new key.")
+            logger.error(f"Error reading key file '{key_path}': {e}. Generating a new key.")
             # Optionally backup the old key file here
             return _generate_key(slot_id)
 
 
+# --- Storage Pages ---
+def _save_storage_pages(slot_id, fernet, world):
+    """
+    Writes the changed (dirty) pages of every storage chest to their own encrypted files.
+    Empty pages are stored by deleting their file. Returns the number of pages written.
+    """
+    storage_dir = _get_storage_dir(slot_id)
+    if not storage_dir: return 0
+    os.makedirs(storage_dir, exist_ok=True)
+
+    pages_written = 0
+    for container_index, container in enumerate(world.storage_containers):
+        for page in sorted(container.dirty_pages):
+            page_path = os.path.join(storage_dir, STORAGE_PAGE_FILENAME_TEMPLATE.format(container_index, page))
+            page_slots = container.page_to_save_list(page)
+            if all(slot is None for slot in page_slots):
+                if os.path.exists(page_path):
+                    os.remove(page_path)
+            else:
+                page_data = {"start": page * container.page_size, "slots": page_slots}
+                with open(page_path, "wb") as page_file:
+                    page_file.write(base64.urlsafe_b64encode(fernet.encrypt(json.dumps(page_data).encode('utf-8'))))
+                pages_written += 1
+        container.dirty_pages.clear()
+    return pages_written
+
+
+def _load_storage_pages(slot_id, fernet, manifest, world):
+    """
+    Fills the storage chests from their page files. Chest contents are placed by slot
+    index ("start" of each page), so a changed page size still loads correctly.
+    Returns the number of item stacks loaded.
+    """
+    storage_dir = _get_storage_dir(slot_id)
+    if not storage_dir or not os.path.isdir(storage_dir):
+        return 0
+
+    if not isinstance(manifest, dict):
+        manifest = {}
+    loaded_count = 0
+    saved_page_counts = manifest.get("pages")
+    if not isinstance(saved_page_counts, list):
+        saved_page_counts = []
+    for container_index, container in enumerate(world.storage_containers):
+        saved_pages = saved_page_counts[container_index] if container_index < len(saved_page_counts) else None
+        if not isinstance(saved_pages, int):
+            saved_pages = container.page_count()
+        for page in range(saved_pages):
+            page_path = os.path.join(storage_dir, STORAGE_PAGE_FILENAME_TEMPLATE.format(container_index, page))
+            if not os.path.exists(page_path):
+                continue # Empty page
+            try:
+                with open(page_path, "rb") as page_file:
+                    page_data = json.loads(fernet.decrypt(base64.urlsafe_b64decode(page_file.read())).decode('utf-8'))
+                start = page_data["start"]
+                for offset, item_data in enumerate(page_data["slots"]):
+                    index = start + offset
+                    if item_data is None or index >= len(container):
+                        continue
+                    item_id = item_data.get("item_id")
+                    quantity = item_data.get("quantity")
+                    if isinstance(item_id, int) and item_id in game_state.item_id_to_name and \
+                       isinstance(quantity, int) and quantity > 0:
+                        container[index] = game_state.ItemStack(item_id, min(quantity, item_registry.max_stack(item_id)))
+                        loaded_count += 1
+                    else:
+                        logger.warning(f"Invalid item data in storage page '{os.path.basename(page_path)}': {item_data}. Ignoring.")
+            except (InvalidToken, base64.binascii.Error, json.JSONDecodeError, KeyError, TypeError, AttributeError, IOError) as e:
+                logger.error(f"Could not load storage page '{os.path.basename(page_path)}': {e}. Page skipped.")
+
+        if manifest.get("page_size") == container.page_size:
+            container.dirty_pages.clear() # Pages on disk already match
+        else:
+            # Page layout changed: rewrite every page on the next save and drop files past the new last page
+            container.dirty_pages = set(range(max(saved_pages, container.page_count())))
+    return loaded_count
+
+
 # --- Save/Load Logic ---
-def save_game(slot_id):
-    """Saves the current inventory to an encrypted file for the given slot."""
+def save_game(slot_id, world=None):
+    """Saves a world (default: the current one) to an encrypted file for the given slot."""
+    world = world or game_state.world
     if slot_id is None or not (1 <= slot_id <= constants.MAX_SAVE_SLOTS):
-        print("Error: Cannot save game without a valid world slot selected.")
+        logger.error("Cannot save game without a valid world slot selected.")
         return False
 
     save_path = _get_save_file_path(slot_id)
@@ -85,27 +193,28 @@ def save_game(slot_id):
 
     key = _load_key(slot_id) # Use the key specific to this slot
     if not key:
-        print(f"Error: Cannot save game for slot {slot_id} without a valid encryption key.")
+        logger.error(f"Cannot save game for slot {slot_id} without a valid encryption key.")
         return False
 
     fernet = Fernet(key)
 
     try:
         # 1. Prepare inventory data for saving
-        inventory_to_save = []
-        for stack in game_state.inventory:
-            if stack is None:
-                inventory_to_save.append(None)
-            else:
-                # Save as a dictionary {id: ..., qty: ...}
-                inventory_to_save.append({
-                    "item_id": stack.item_id,
-                    "quantity": stack.quantity
-                })
+        # Each slot is saved as a dictionary {id: ..., qty: ...} or None (works for both inventory backends)
+        inventory_to_save = inventory_store.serialize_inventory(world.inventory)
 
         # Include other game state data if needed in the future
         save_data = {
-            "inventory": inventory_to_save
+            "inventory": inventory_to_save,
+            # Storage chest contents live in per-page files, only the layout is stored here
+            "storage": {
+                "page_size": constants.STORAGE_PAGE_SLOTS,
+                "pages": [container.page_count() for container in world.storage_containers],
+            },
+            # Item IDs in this save are those of this item ID registry version (see item_ids.py)
+            "item_ids_version": item_ids.version(),
+            # Mining jobs keep running while the game is closed (start times are wall-clock)
+            "mining_jobs": world.mining_jobs.to_save_list(game_clock.now(), game_clock.wall_time()),
             # Add other things like player position, equipped items, etc. here
         }
 
@@ -122,41 +231,62 @@ def save_game(slot_id):
         with open(save_path, "wb") as save_file:
             save_file.write(base64.urlsafe_b64encode(encrypted_data))
 
-        print(f"Game saved successfully to {os.path.basename(save_path)}")
+        # 6. Write changed storage pages
+        pages_written = _save_storage_pages(slot_id, fernet, world)
+
+        # 7. Write changed resource map chunks
+        chunks_written = world.resource_map.save() if world.resource_map is not None else 0
+
+        logger.info(f"Game saved successfully to {os.path.basename(save_path)} ({pages_written} storage page(s), {chunks_written} map chunk(s) written)")
         return True
 
     except IOError as e:
-        print(f"Error: Could not write save file '{save_path}': {e}")
+        logger.error(f"Could not write save file '{save_path}': {e}")
     except TypeError as e:
-        print(f"Error: Could not serialize game data for saving: {e}")
+        logger.error(f"Could not serialize game data for saving: {e}")
     except Exception as e:
-        print(f"An unexpected error occurred during saving: {e}")
+        logger.error(f"An unexpected error occurred during saving: {e}")
 
     return False
 
 
-def load_game(slot_id):
-    """Loads the inventory from the encrypted save file for the given slot."""
+def load_game(slot_id, world=None):
+    """
+    Loads the save file of a slot into a world (default: the current one).
+    Everything in the world is replaced; a missing save file gives a fresh, empty world.
+    """
+    world = world or game_state.world
     if not (1 <= slot_id <= constants.MAX_SAVE_SLOTS):
-        print(f"Error: Invalid slot_id '{slot_id}' for loading.")
+        logger.error(f"Invalid slot_id '{slot_id}' for loading.")
         return False
 
     save_path = _get_save_file_path(slot_id)
     save_filename = os.path.basename(save_path) if save_path else f"slot {slot_id}"
 
-    # --- Reset Inventory Before Loading/Starting Fresh ---
-    # Initialize with None for all slots
-    game_state.inventory = [None] * game_state.MAX_INVENTORY_SLOTS
-    print(f"Inventory reset for world slot {slot_id}.")
+    # --- Reset World Before Loading/Starting Fresh ---
+    world.world_id = slot_id
+    world.inventory = inventory_store.create_inventory()
+    world.storage_containers = storage.create_containers()
+    world.mining_jobs.clear_jobs()
+    world.resource_map = None
+    world.held_item = None
+    world.clear_crafting()
+    game_state.current_container = 0
+    game_state.storage_page = 0
+    logger.info(f"Inventory reset for world slot {slot_id}.")
 
     if not os.path.exists(save_path):
-        print(f"No save file found ('{save_filename}'). Starting fresh world {slot_id}.")
-        # Inventory is already reset above.
+        logger.info(f"No save file found ('{save_filename}'). Starting fresh world {slot_id}.")
+        # Inventory is already reset above. A new world also gets a new resource map (new seed).
+        world.resource_map = resource_map.ResourceMap.open(_get_map_dir(slot_id), fresh=True)
         return True # Indicate success in setting up a fresh world state
 
+    # Chunks are only read when mining touches them
+    world.resource_map = resource_map.ResourceMap.open(_get_map_dir(slot_id))
+
     key = _load_key(slot_id)
     if not key:
-        print(f"Error: Cannot load game for slot {slot_id} without a valid encryption key.")
+        logger.error(f"Cannot load game for slot {slot_id} without a valid encryption key.")
         return False # Keep the fresh inventory state
 
     fernet = Fernet(key)
@@ -178,20 +308,23 @@ def load_game(slot_id):
         # 5. Parse JSON
         loaded_data = json.loads(data_string)
 
+        # Item IDs are append-only (item_ids.py), so saved IDs are used as they are
+        item_ids.check_save_version(loaded_data.get("item_ids_version"))
+
         # 6. Load inventory data
         loaded_inventory_list = loaded_data.get("inventory")
         if not isinstance(loaded_inventory_list, list):
-             print(f"Error: Save file '{save_filename}' has invalid inventory format. Starting fresh.")
-             game_state.inventory = [None] * game_state.MAX_INVENTORY_SLOTS # Ensure reset
+             logger.error(f"Save file '{save_filename}' has invalid inventory format. Starting fresh.")
+             world.inventory = inventory_store.create_inventory() # Ensure reset
              return False # Indicate load failure
 
         loaded_count = 0
         error_count = 0
         # Recreate the inventory list from saved data
-        new_inventory = [None] * game_state.MAX_INVENTORY_SLOTS
+        new_inventory = inventory_store.create_inventory()
         for i, item_data in enumerate(loaded_inventory_list):
             if i >= len(new_inventory): # Prevent loading more slots than currently defined
-                print(f"Warning: Save file contains more inventory slots ({len(loaded_inventory_list)}) than current max ({len(new_inventory)}). Ignoring extra slots.")
+                logger.warning(f"Save file contains more inventory slots ({len(loaded_inventory_list)}) than current max ({len(new_inventory)}). Ignoring extra slots.")
                 break
 
             if item_data is None:
@@ -206,46 +339,60 @@ def load_game(slot_id):
                     try:
                         # Create ItemStack, ensuring quantity doesn't exceed max stack size on load
                         # (though saving should ideally prevent this)
-                        max_stack = game_state.ItemStack.DEFAULT_MAX_STACK # Use item-specific later if needed
+                        max_stack = item_registry.max_stack(item_id)
                         valid_quantity = min(quantity, max_stack)
                         if quantity > valid_quantity:
-                             print(f"Warning: Loaded quantity {quantity} for item ID {item_id} exceeds max stack size {max_stack}. Clamping to {valid_quantity}.")
+                             logger.warning(f"Loaded quantity {quantity} for item ID {item_id} exceeds max stack size {max_stack}. Clamping to {valid_quantity}.")
 
                         new_inventory[i] = game_state.ItemStack(item_id, valid_quantity)
                         loaded_count += 1
                     except ValueError as e:
-                        print(f"Error creating ItemStack from save data (slot {i}): {e}. Ignoring item.")
+                        logger.error(f"Error creating ItemStack from save data (slot {i}): {e}. Ignoring item.")
                         error_count += 1
                 else:
-                    print(f"Warning: Invalid item data in save file (slot {i}): {item_data}. Ignoring.")
+                    logger.warning(f"Invalid item data in save file (slot {i}): {item_data}. Ignoring.")
                     error_count += 1
             else:
-                 print(f"Warning: Unexpected data format in saved inventory (slot {i}): {item_data}. Ignoring.")
+                 logger.warning(f"Unexpected data format in saved inventory (slot {i}): {item_data}. Ignoring.")
                  error_count += 1
 
-        game_state.inventory = new_inventory # Assign the newly loaded inventory
+        world.inventory = new_inventory # Assign the newly loaded inventory
+
+        # 7. Load storage chest pages
+        storage_count = _load_storage_pages(slot_id, fernet, loaded_data.get("storage") or {}, world)
+
+        # 8. Restore mining jobs and deliver everything mined while the game was closed
+        saved_jobs = loaded_data.get("mining_jobs")
+        job_count = 0
+        if isinstance(saved_jobs, list) and saved_jobs:
+            job_count = world.mining_jobs.restore_jobs(saved_jobs, game_clock.now(), game_clock.wall_time())
+            finished_jobs = game_logic.update_mining(game_clock.now(), world)
+            if finished_jobs:
+                world.status_message = f"{len(finished_jobs)} mining job(s) finished while you were away."
 
-        print(f"Game loaded successfully from {save_filename}.")
+        logger.info(f"Game loaded successfully from {save_filename} ({storage_count} stored stacks, {job_count} mining jobs).")
         if error_count > 0:
-            print(f"  ({loaded_count} items loaded, {error_count} errors encountered during item loading)")
+            logger.warning(f"{loaded_count} items loaded, {error_count} errors encountered during item loading.")
         # Load other game state data here if added to save_data
 
         return True
 
     except FileNotFoundError:
-        print(f"Save file '{save_filename}' not found during load attempt.")
+        logger.info(f"Save file '{save_filename}' not found during load attempt.")
     except (InvalidToken, base64.binascii.Error):
-        print(f"Error: Could not decrypt save file '{save_filename}'. It might be corrupted or the key is wrong.")
+        logger.error(f"Could not decrypt save file '{save_filename}'. It might be corrupted or the key is wrong.")
     except json.JSONDecodeError:
-        print(f"Error: Could not parse save file '{save_filename}'. It might be corrupted.")
+        logger.error(f"Could not parse save file '{save_filename}'. It might be corrupted.")
     except IOError as e:
-        print(f"Error: Could not read save file '{save_path}': {e}")
+        logger.error(f"Could not read save file '{save_path}': {e}")
     except Exception as e:
-        print(f"An unexpected error occurred during loading: {e}")
+        logger.error(f"An unexpected error occurred during loading: {e}")
 
     # If loading failed after file existence check, keep the fresh inventory
-    print(f"Proceeding with fresh inventory for world {slot_id} due to load error.")
-    game_state.inventory = [None] * game_state.MAX_INVENTORY_SLOTS # Ensure reset
+    logger.warning(f"Proceeding with fresh inventory for world {slot_id} due to load error.")
+    world.inventory = inventory_store.create_inventory() # Ensure reset
+    world.storage_containers = storage.create_containers()
+    world.mining_jobs.clear_jobs()
     return False # Indicate loading failed, but state is fresh
 
 
@@ -0,0 +1,167 @@
+# storage.py
+# Chest-style storage containers (several per world, thousands of slots each).
+#
+# A StorageContainer is a SlotInventory (so it keeps running per-item totals) with two
+# extra indexes that make moving items in O(moved stacks) instead of O(chest size):
+#   _free    -> min-heap of slot indexes that were emptied (lowest slot is filled first)
+#   _partial -> {item_id: set of slot indexes} whose stack may still have room
+# Both are "lazy": an entry can be out of date (the slot was filled/emptied by a click since),
+# so every entry is checked when it is used and dropped if it no longer fits.
+#
+# The chest is split into pages of constants.STORAGE_PAGE_SLOTS slots. The storage screen
+# shows one page at a time, and each page is saved as its own file, so only pages that
+# changed (dirty_pages) are written when the game is saved (see save_manager.py).
+import heapq
+import constants
+import game_state
+import inventory_store
+import item_registry
+import transactions
+
+
+class StorageContainer(inventory_store.SlotInventory):
+    """A storage chest: fixed number of slots, viewed and saved one page at a time."""
+    def __init__(self, size: int, page_size: int = constants.STORAGE_PAGE_SLOTS):
+        super().__init__(size)
+        self.page_size = page_size
+        self.dirty_pages = set() # Pages changed since the last save/load
+        self._index_of = {}      # id(stack) -> slot index, to find the slot of a stack whose quantity changed
+        self._free = list(range(size)) # Already a valid heap (sorted)
+        self._partial = {}
+
+    # --- Slot Changes (keep indexes and dirty pages up to date) ---
+    def __setitem__(self, index, stack):
+        old_stack = list.__getitem__(self, index)
+        if old_stack is not None:
+            self._index_of.pop(id(old_stack), None)
+        super().__setitem__(index, stack)
+        stack = list.__getitem__(self, index) # The stored stack (a compact inventory view is copied)
+        if stack is None:
+            heapq.heappush(self._free, index)
+            if len(self._free) > 2 * len(self):
+                self._rebuild_free_heap() # Too many stale entries from repeated clicks
+        else:
+            self._index_of[id(stack)] = index
+            if stack.quantity < stack.max_stack_size:
+                self._partial.setdefault(stack.item_id, set()).add(index)
+        self.dirty_pages.add(index // self.page_size)
+
+    def _on_quantity_change(self, stack, delta):
+        super()._on_quantity_change(stack, delta)
+        index = self._index_of.get(id(stack))
+        if index is not None:
+            self.dirty_pages.add(index // self.page_size)
+            if delta < 0: # Stack now has room
+                self._partial.setdefault(stack.item_id, set()).add(index)
+
+    def _rebuild_free_heap(self):
+        self._free = [i for i, stack in enumerate(self) if stack is None]
+
+    def _pop_free_slot(self) -> int:
+        """Returns the lowest empty slot index, or -1 if the chest is full."""
+        while self._free:
+            index = heapq.heappop(self._free)
+            if list.__getitem__(self, index) is None:
+                return index
+        return -1
+
+    # --- Transfers ---
+    def deposit(self, item_id: int, quantity: int) -> int:
+        """
+        Adds items to the chest: tops up partial stacks of the item first, then uses empty slots.
+        Only touches the slots it fills. Returns the quantity that did NOT fit.
+        """
+        candidates = self._partial.get(item_id)
+        while quantity > 0 and candidates:
+            index = candidates.pop()
+            stack = list.__getitem__(self, index)
+            if stack is None or stack.item_id != item_id or stack.quantity >= stack.max_stack_size:
+                continue # Stale entry
+            transactions.record(self, index)
+            quantity -= stack.add(quantity)
+            if stack.quantity < stack.max_stack_size:
+                candidates.add(index) # Still has room (everything fit)
+
+        max_stack = item_registry.max_stack(item_id)
+        while quantity > 0:
+            index = self._pop_free_slot()
+            if index < 0:
+                break # Chest full
+            stack_qty = min(quantity, max_stack)
+            transactions.record(self, index)
+            self[index] = game_state.ItemStack(item_id, stack_qty)
+            quantity -= stack_qty
+        return quantity
+
+    # --- Pages ---
+    def page_count(self) -> int:
+        return (len(self) + self.page_size - 1) // self.page_size
+
+    def page_range(self, page: int) -> range:
+        """Slot indexes shown on a page."""
+        start = page * self.page_size
+        return range(start, min(start + self.page_size, len(self)))
+
+    def page_to_save_list(self, page: int) -> list:
+        """Converts one page to the save format (list of dicts or None, like the inventory)."""
+        return [
+            None if stack is None else {"item_id": stack.item_id, "quantity": stack.quantity}
+            for stack in (list.__getitem__(self, i) for i in self.page_range(page))
+        ]
+
+
+# --- Helpers ---
+
+def create_containers() -> list:
+    """Creates the empty storage chests for a world (world.storage_containers)."""
+    return [StorageContainer(constants.STORAGE_CONTAINER_SLOTS) for _ in range(constants.STORAGE_CONTAINER_COUNT)]
+
+
+def current_container():
+    """Returns the chest shown on the storage screen, or None if no world is loaded."""
+    containers = game_state.world.storage_containers
+    if 0 <= game_state.current_container < len(containers):
+        return containers[game_state.current_container]
+    return None
+
+
+def store_slot(container, inv_index: int, world=None) -> int:
+    """Moves the stack in a player inventory slot into the chest. Returns the quantity moved."""
+    inventory = (world or game_state.world).inventory
+    stack = inventory[inv_index]
+    if stack is None:
+        return 0
+    transactions.record(inventory, inv_index)
+    leftover = container.deposit(stack.item_id, stack.quantity)
+    moved = stack.quantity - leftover
+    if leftover > 0:
+        stack.quantity = leftover # Chest full, the rest stays in the inventory
+    else:
+        inventory[inv_index] = None
+    return moved
+
+
+def take_slot(container, index: int, world=None) -> int:
+    """Moves the stack in a chest slot into the player inventory. Returns the quantity moved."""
+    stack = container[index]
+    if stack is None:
+        return 0
+    transactions.record(container, index)
+    inventory = (world or game_state.world).inventory
+    leftover = inventory_store.deposit_items(inventory, {stack.item_id: stack.quantity}).get(stack.item_id, 0)
+    moved = stack.quantity - leftover
+    if leftover > 0:
+        stack.quantity = leftover # Inventory full, the rest stays in the chest
+    else:
+        container[index] = None
+    return moved
+
+
+def store_all(container, world=None) -> int:
+    """Moves every stack in the player inventory into the chest. Returns the quantity moved."""
+    world = world or game_state.world
+    moved = 0
+    for inv_index in range(len(world.inventory)):
+        if world.inventory[inv_index] is not None:
+            moved += store_slot(container, inv_index, world)
+    return moved
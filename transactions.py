@@ -0,0 +1,217 @@
+# transactions.py
+# Lightweight journaled transactions for inventory / crafting slot changes.
+#
+# A "slot" is any (container, key) pair where container[key] holds an ItemStack or None:
+#   (world.inventory, index)      - an inventory slot
+#   (world.crafting_grid[r], c)   - a crafting grid slot (one row list + column)
+#   (held_slot(world), None)      - the item held by the mouse in a world
+#
+# Code that changes a slot calls record(container, key) just BEFORE the first change.
+# While a transaction is open the slot's old contents are written to its undo journal
+# (only the first time each slot is touched). rollback() puts every recorded slot back.
+# Committing just drops the journal, so a successful operation costs only the journal writes.
+# With no transaction open, record() does nothing.
+#
+# Undo/Redo: a top-level transaction opened with history=True is also pushed onto the
+# bounded undo stack of its world (World.history) when it commits. Each entry only holds
+# the changed slots as (container, key, before, after) snapshots, so memory depends on how
+# many slots an action touched, not on the size of the inventory, and undo is O(changed slots).
+# Every World has its own held slot and history, so worlds in one process never share them.
+import collections
+import contextlib
+import game_state
+import constants
+
+
+class HeldSlot:
+    """Makes a world's held_item look like a one-slot container (the key is ignored)."""
+    __slots__ = ("world",)
+
+    def __init__(self, world):
+        self.world = world
+
+    def __getitem__(self, key):
+        return self.world.held_item
+
+    def __setitem__(self, key, stack):
+        self.world.held_item = stack
+
+    def __repr__(self):
+        return f"HeldSlot(world={self.world.world_id})"
+
+
+class History:
+    """Undo/Redo steps of one world: lists of (container, key, before_snapshot, after_snapshot)."""
+    def __init__(self):
+        self.undo_stack = collections.deque(maxlen=constants.UNDO_HISTORY_LIMIT)
+        self.redo_stack = []
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+
+def held_slot(world=None):
+    """The held item slot of a world (game_state.world by default). Use as record(held_slot(), None)."""
+    return (world or game_state.world).held_slot
+
+
+# Stack of open transactions (innermost last)
+_active = []
+
+
+def snapshot_stack(stack):
+    """Compact, immutable copy of a slot's contents: (item_id, quantity) or None."""
+    if stack is None or stack.quantity <= 0:
+        return None
+    return (stack.item_id, stack.quantity)
+
+
+def restore_stack(snapshot):
+    """Creates a new ItemStack from a snapshot (or None)."""
+    if snapshot is None:
+        return None
+    return game_state.ItemStack(snapshot[0], snapshot[1])
+
+
+class Transaction:
+    """Undo journal for one operation. Use through the transaction() context manager."""
+    def __init__(self):
+        self.journal = []     # [(container, key, snapshot before the change), ...] in touch order
+        self._touched = set() # (id(container), key) of slots already in the journal
+
+    def record(self, container, key, snapshot=None, use_snapshot=False):
+        """
+        Saves the slot's current contents to the journal (first touch only).
+        Callers that already know the contents can pass 'snapshot' with use_snapshot=True.
+        """
+        slot_key = (id(container), key)
+        if slot_key in self._touched:
+            return
+        self._touched.add(slot_key)
+        if not use_snapshot:
+            snapshot = snapshot_stack(container[key])
+        self.journal.append((container, key, snapshot))
+
+    def rollback(self):
+        """Restores every recorded slot to its state before the transaction, newest first."""
+        for container, key, snapshot in reversed(self.journal):
+            container[key] = restore_stack(snapshot)
+        self.journal = []
+        self._touched = set()
+
+    def _merge_into(self, outer):
+        """Hands this (committed) journal to the enclosing transaction so it can still roll back."""
+        for container, key, snapshot in self.journal:
+            outer.record(container, key, snapshot, use_snapshot=True)
+
+    def _changes(self):
+        """Returns [(container, key, before, after), ...] for slots whose contents actually changed."""
+        changes = []
+        for container, key, before in self.journal:
+            after = snapshot_stack(container[key])
+            if after != before:
+                changes.append((container, key, before, after))
+        return changes
+
+    def __len__(self):
+        return len(self.journal)
+
+
+@contextlib.contextmanager
+def transaction(history=False, world=None):
+    """
+    Opens a transaction. Any exception inside the block rolls back every recorded
+    slot change and is re-raised. The block may also call txn.rollback() itself
+    to undo its changes on a normal failure (e.g. not enough ingredients).
+    Transactions can be nested; a committed inner transaction joins the outer one.
+    history=True (top-level only) makes the committed changes undoable in 'world'
+    (game_state.world by default).
+    """
+    txn = Transaction()
+    _active.append(txn)
+    try:
+        yield txn
+    except BaseException:
+        txn.rollback()
+        raise
+    finally:
+        _active.pop()
+    # Committed
+    if _active:
+        txn._merge_into(_active[-1])
+    elif history:
+        changes = txn._changes()
+        if changes:
+            world_history = (world or game_state.world).history
+            world_history.undo_stack.append(changes)
+            world_history.redo_stack.clear() # A new action invalidates the redo chain
+
+
+def current():
+    """Returns the innermost open transaction, or None."""
+    return _active[-1] if _active else None
+
+
+def record(container, key):
+    """Journals a slot before it is changed (no-op when no transaction is open)."""
+    if _active:
+        _active[-1].record(container, key)
+
+
+# --- Undo / Redo ---
+
+def _apply_history_entry(changes, from_index, to_index):
+    """
+    Moves the slots in 'changes' from one side of the entry to the other
+    (before -> after for redo, after -> before for undo).
+    Refuses (returns False) if any slot no longer matches, e.g. items were mined
+    into the inventory since the action; applying old snapshots would lose items.
+    """
+    for change in changes:
+        container, key = change[0], change[1]
+        if snapshot_stack(container[key]) != change[from_index]:
+            return False
+    for change in reversed(changes):
+        container, key = change[0], change[1]
+        container[key] = restore_stack(change[to_index])
+    return True
+
+
+def undo(world=None) -> bool:
+    """Undoes the most recent recorded action of a world. Returns True on success."""
+    world = world or game_state.world
+    history = world.history
+    if not history.undo_stack:
+        world.status_message = "Nothing to undo."
+        return False
+    changes = history.undo_stack.pop()
+    if not _apply_history_entry(changes, 3, 2):
+        history.clear()
+        world.status_message = "Cannot undo: the inventory has changed since then."
+        return False
+    history.redo_stack.append(changes)
+    world.status_message = "Undone."
+    return True
+
+
+def redo(world=None) -> bool:
+    """Re-applies the most recently undone action of a world. Returns True on success."""
+    world = world or game_state.world
+    history = world.history
+    if not history.redo_stack:
+        world.status_message = "Nothing to redo."
+        return False
+    changes = history.redo_stack.pop()
+    if not _apply_history_entry(changes, 2, 3):
+        history.clear()
+        world.status_message = "Cannot redo: the inventory has changed since then."
+        return False
+    history.undo_stack.append(changes)
+    world.status_message = "Redone."
+    return True
+
+
+def clear_history(world=None):
+    """Forgets all undo/redo steps of a world (e.g. when the crafting grid is cleared)."""
+    (world or game_state.world).history.clear()
@@ -1,10 +1,13 @@
 # ui_manager/display_manager.py
+import logging
 import pygame
 import time # For cursor blink
 import game_state
 import constants
 import save_manager # Needed for world select screen
 
+logger = logging.getLogger(__name__)
+
 # --- Constants for Layout (can be adjusted) ---
 # These are now primarily defined/used in layout_calculator.py
 # Keep only those needed specifically for drawing if any.
@@ -92,7 +95,7 @@ def _draw_item_stack(surface, item_stack, rect):
 
 def _draw_held_item():
     """Draws the item stack held by the mouse cursor."""
-    if game_state.held_item and isinstance(game_state.held_item, game_state.ItemStack):
+    if game_state.world.held_item and isinstance(game_state.world.held_item, game_state.ItemStack):
         mouse_pos = pygame.mouse.get_pos()
         # Use a rect based on slot size for the item representation
         item_rect = pygame.Rect(0, 0, GRID_SLOT_SIZE, GRID_SLOT_SIZE)
@@ -104,7 +107,7 @@ def _draw_held_item():
         # game_state.screen.blit(bg_surf, item_rect)
 
         # Draw the item stack itself (texture and quantity)
-        _draw_item_stack(game_state.screen, game_state.held_item, item_rect)
+        _draw_item_stack(game_state.screen, game_state.world.held_item, item_rect)
 
 
 # --- Screen Drawing Functions ---
@@ -166,7 +169,7 @@ def draw_ask_quantity_screen(width, height):
     game_state.screen.fill(constants.WHITE)
     # Prompt Text
     block_name = game_state.item_id_to_name.get(game_state.selected_block_for_mining, "Unknown Block")
-    prompt_text = f"How many {block_name}(s) to mine? (1-64)"
+    prompt_text = f"How many {block_name}(s) to mine? (1-{constants.MAX_MINING_QUANTITY:,})"
     if game_state.button_font:
         prompt_surf = game_state.button_font.render(prompt_text, True, constants.BLACK)
         prompt_rect = prompt_surf.get_rect(center=(width // 2, height // 2 - 60)) # Adjusted position
@@ -255,8 +258,8 @@ def draw_inventory_screen(width, height):
             pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1) # Border
 
             # Draw item stack if present
-            if 0 <= inv_index < len(game_state.inventory):
-                item_stack = game_state.inventory[inv_index]
+            if 0 <= inv_index < len(game_state.world.inventory):
+                item_stack = game_state.world.inventory[inv_index]
                 if item_stack:
                     _draw_item_stack(game_state.screen, item_stack, rect)
             else:
@@ -289,7 +292,7 @@ def draw_crafting_screen(width, height):
                     if rect:
                         pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, rect)
                         pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1)
-                        item_stack = game_state.crafting_grid[r][c]
+                        item_stack = game_state.world.crafting_grid[r][c]
                         if item_stack:
                             _draw_item_stack(game_state.screen, item_stack, rect)
 
@@ -298,7 +301,7 @@ def draw_crafting_screen(width, height):
     if result_rect:
         pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, result_rect)
         pygame.draw.rect(game_state.screen, constants.BLACK, result_rect, 1)
-        result_stack = game_state.crafting_result_slot
+        result_stack = game_state.world.crafting_result_slot
         if result_stack:
             _draw_item_stack(game_state.screen, result_stack, result_rect)
 
@@ -315,7 +318,7 @@ def draw_crafting_screen(width, height):
                 pygame.draw.line(game_state.screen, constants.BLACK, (arrow_end_x, arrow_y), (arrow_end_x - 8, arrow_y - 5), 3)
                 pygame.draw.line(game_state.screen, constants.BLACK, (arrow_end_x, arrow_y), (arrow_end_x - 8, arrow_y + 5), 3)
         except (IndexError, AttributeError, TypeError) as e:
-             print(f"Warning: Could not draw crafting arrow - layout elements missing or invalid? {e}")
+             logger.warning(f"Could not draw crafting arrow - layout elements missing or invalid? {e}")
 
 
     # --- Draw Inventory Slots ---
@@ -337,8 +340,8 @@ def draw_crafting_screen(width, height):
             inv_index = slot_info["inv_index"]
             pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, rect)
             pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1)
-            if 0 <= inv_index < len(game_state.inventory):
-                item_stack = game_state.inventory[inv_index]
+            if 0 <= inv_index < len(game_state.world.inventory):
+                item_stack = game_state.world.inventory[inv_index]
                 if item_stack:
                     _draw_item_stack(game_state.screen, item_stack, rect)
 
@@ -353,7 +356,7 @@ def draw_crafting_screen(width, height):
 def draw_error_screen(width, height):
     """Draws an error message screen."""
     game_state.screen.fill((255, 100, 100)) # Reddish background
-    error_text = game_state.status_message or "An unspecified error occurred."
+    error_text = game_state.world.status_message or "An unspecified error occurred."
     if game_state.title_font:
         error_surf = game_state.title_font.render("Error", True, constants.BLACK)
         error_rect = error_surf.get_rect(center=(width // 2, height // 3))
@@ -371,8 +374,8 @@ def draw_error_screen(width, height):
 
 def _draw_status_bar(width, height):
     """Draws the status message at the bottom."""
-    if game_state.status_message and game_state.text_font:
-        status_surf = game_state.text_font.render(game_state.status_message, True, constants.DARK_GREEN)
+    if game_state.world.status_message and game_state.text_font:
+        status_surf = game_state.text_font.render(game_state.world.status_message, True, constants.DARK_GREEN)
         # Position near bottom center, slightly above absolute bottom
         status_rect = status_surf.get_rect(center=(width // 2, height - STATUS_BAR_HEIGHT))
         game_state.screen.blit(status_surf, status_rect)
@@ -404,7 +407,7 @@ def draw_screen():
         try:
             draw_func(width, height)
         except Exception as e:
-            print(f"ERROR drawing screen {game_state.current_screen}: {e}")
+            logger.error(f"Error drawing screen {game_state.current_screen}: {e}")
             # Attempt to draw a fallback error message directly
             try:
                  game_state.screen.fill(constants.BLACK)
@@ -413,7 +416,7 @@ def draw_screen():
                  err_rect = err_surf.get_rect(center=(width//2, height//2))
                  game_state.screen.blit(err_surf, err_rect)
             except Exception as fallback_e:
-                 print(f"FATAL: Error drawing fallback error screen: {fallback_e}")
+                 logger.error(f"Error drawing fallback error screen: {fallback_e}")
 
     else:
         # Fallback for unknown state
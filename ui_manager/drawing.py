@@ -1,10 +1,15 @@
 # ui_manager/drawing.py
+import logging
 import pygame
 import time # For cursor blink
 import game_state
 import constants
+import item_registry
+import game_clock
 import save_manager # Needed for world select screen
 
+logger = logging.getLogger(__name__)
+
 # --- Constants for Layout (can be adjusted) ---
 PADDING = constants.PADDING # Use constant
 STATUS_BAR_HEIGHT = 30
@@ -53,7 +58,7 @@ def _draw_item_stack(surface, item_stack, rect):
         return # Nothing to draw
 
     # Draw Item Texture
-    texture = game_state.item_textures.get(item_stack.item_id)
+    texture = item_registry.texture(item_stack.item_id)
     if texture:
         # Scale texture to fit slot size if needed, or use pre-scaled textures
         # For now, assume textures are loaded at appropriate size or scale here
@@ -71,7 +76,7 @@ def _draw_item_stack(surface, item_stack, rect):
             texture_rect = scaled_texture.get_rect(center=rect.center)
             surface.blit(scaled_texture, texture_rect)
         except Exception as e:
-             print(f"Error scaling/drawing texture for item {item_stack.item_id}: {e}")
+             logger.error(f"Error scaling/drawing texture for item {item_stack.item_id}: {e}")
              # Draw placeholder on error
              pygame.draw.rect(surface, constants.DARK_GREEN, rect.inflate(-4, -4))
 
@@ -97,9 +102,31 @@ def _draw_item_stack(surface, item_stack, rect):
 
         surface.blit(qty_surf, qty_rect)
 
+def _draw_search_field():
+    """Draws the item search box (inventory screen / mining menu)."""
+    rect = game_state.search_field_rect
+    if not rect or not game_state.small_button_font:
+        return
+    pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, rect)
+    pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1) # Border
+
+    if game_state.search_text:
+        text_surf = game_state.small_button_font.render(game_state.search_text, True, constants.BLACK)
+    else:
+        text_surf = game_state.small_button_font.render("Type to search...", True, constants.GRAY)
+    text_rect = text_surf.get_rect(midleft=(rect.left + 8, rect.centery))
+    game_state.screen.blit(text_surf, text_rect)
+
+    # Blinking cursor after the typed text
+    if game_state.search_text and (pygame.time.get_ticks() // constants.CURSOR_BLINK_RATE) % 2 == 0:
+        cursor_x = text_rect.right + 2
+        cursor_height = game_state.small_button_font.get_height() * 0.8
+        pygame.draw.line(game_state.screen, constants.BLACK, (cursor_x, rect.centery - cursor_height // 2), (cursor_x, rect.centery + cursor_height // 2), 2)
+
+
 def _draw_held_item():
     """Draws the item stack held by the mouse cursor."""
-    if game_state.held_item and isinstance(game_state.held_item, game_state.ItemStack):
+    if game_state.world.held_item and isinstance(game_state.world.held_item, game_state.ItemStack):
         mouse_pos = pygame.mouse.get_pos()
         # Use a rect based on slot size for the item representation
         # Use constant for slot size
@@ -107,7 +134,7 @@ def _draw_held_item():
         item_rect.center = mouse_pos # Center on cursor
 
         # Draw the item stack itself (texture and quantity)
-        _draw_item_stack(game_state.screen, game_state.held_item, item_rect)
+        _draw_item_stack(game_state.screen, game_state.world.held_item, item_rect)
 
 
 # --- Screen Drawing Functions ---
@@ -157,6 +184,8 @@ def draw_mining_menu(width, height):
         title_rect = title_surf.get_rect(center=(width // 2, int(height * 0.15)))
         game_state.screen.blit(title_surf, title_rect)
 
+    _draw_search_field()
+
     # Draw Buttons (now laid out vertically)
     for button in game_state.buttons:
         _draw_button(button)
@@ -169,7 +198,7 @@ def draw_ask_quantity_screen(width, height):
     game_state.screen.fill(constants.WHITE)
     # Prompt Text (Positioned relative to input field)
     block_name = game_state.item_id_to_name.get(game_state.selected_block_for_mining, "Unknown Block")
-    prompt_text = f"How many {block_name}(s) to mine? (1-64)"
+    prompt_text = f"How many {block_name}(s) to mine? (1-{constants.MAX_MINING_QUANTITY:,})"
     if game_state.button_font and game_state.input_field_rect: # Check if input rect exists
         prompt_surf = game_state.button_font.render(prompt_text, True, constants.BLACK)
         # Position prompt above the input field
@@ -207,34 +236,59 @@ def draw_ask_quantity_screen(width, height):
 
 
 def draw_mining_inprogress_screen(width, height):
-    """Draws the mining progress screen."""
+    """Draws the mining jobs overview: a progress bar per running job, then the waiting jobs."""
     game_state.screen.fill(constants.WHITE)
-    # Progress Text
+    # Title
     if game_state.title_font:
-        progress_surf = game_state.title_font.render(game_state.mining_progress_text, True, constants.BLACK)
-        progress_rect = progress_surf.get_rect(center=(width // 2, height // 2 - 50))
-        game_state.screen.blit(progress_surf, progress_rect)
+        title_surf = game_state.title_font.render("Mining Jobs", True, constants.BLACK)
+        title_rect = title_surf.get_rect(center=(width // 2, int(height * 0.15)))
+        game_state.screen.blit(title_surf, title_rect)
+
+    now = game_clock.now()
+    running = game_state.world.mining_jobs.running_jobs()
+    waiting = game_state.world.mining_jobs.waiting_jobs()
 
-    # Progress Bar
     bar_width = width * 0.6
     bar_height = 30
     bar_x = (width - bar_width) // 2
-    bar_y = height // 2 + 20
-    bar_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-
-    # Calculate progress
-    progress = 0.0
-    if game_state.mining_duration > 0 and game_state.mining_start_time > 0:
-        current_time = pygame.time.get_ticks() / 1000.0
-        elapsed_time = max(0, current_time - game_state.mining_start_time)
-        progress = min(1.0, elapsed_time / game_state.mining_duration)
-
-    # Draw bar
-    pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, bar_rect, border_radius=5)
-    fill_width = int(bar_width * progress)
-    fill_rect = pygame.Rect(bar_x, bar_y, fill_width, bar_height)
-    pygame.draw.rect(game_state.screen, constants.DARK_GREEN, fill_rect, border_radius=5)
-    pygame.draw.rect(game_state.screen, constants.BLACK, bar_rect, 2, border_radius=5)
+    row_y = int(height * 0.27)
+
+    if not running and not waiting and game_state.text_font:
+        msg_surf = game_state.text_font.render("No mining jobs running.", True, constants.GRAY)
+        game_state.screen.blit(msg_surf, msg_surf.get_rect(center=(width // 2, height // 2)))
+
+    for job in running:
+        block_name = game_state.item_id_to_name.get(job.block_id, f"ID {job.block_id}")
+        progress = job.progress(now)
+        if game_state.button_font:
+            remaining = max(0.0, job.deadline - now)
+            label_surf = game_state.button_font.render(f"{block_name}: {job.delivered}/{job.quantity} mined - {remaining:.1f}s left", True, constants.BLACK)
+            game_state.screen.blit(label_surf, label_surf.get_rect(midbottom=(width // 2, row_y)))
+
+        # Progress Bar
+        bar_rect = pygame.Rect(bar_x, row_y + 4, bar_width, bar_height)
+        pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, bar_rect, border_radius=5)
+        fill_rect = pygame.Rect(bar_x, row_y + 4, int(bar_width * progress), bar_height)
+        pygame.draw.rect(game_state.screen, constants.DARK_GREEN, fill_rect, border_radius=5)
+        pygame.draw.rect(game_state.screen, constants.BLACK, bar_rect, 2, border_radius=5)
+        row_y += bar_height + PADDING * 3
+
+    if waiting and game_state.text_font:
+        line_height = game_state.text_font.get_height() + PADDING // 4
+        last_row_y = height - STATUS_BAR_HEIGHT - PADDING * 3 - line_height # Keep clear of the Back button/status bar
+        for i, job in enumerate(waiting):
+            if row_y > last_row_y and i < len(waiting) - 1:
+                more_surf = game_state.text_font.render(f"... and {len(waiting) - i} more waiting", True, constants.GRAY)
+                game_state.screen.blit(more_surf, more_surf.get_rect(midtop=(width // 2, row_y)))
+                break
+            block_name = game_state.item_id_to_name.get(job.block_id, f"ID {job.block_id}")
+            wait_surf = game_state.text_font.render(f"Waiting: {job.quantity} {block_name}(s)", True, constants.GRAY)
+            game_state.screen.blit(wait_surf, wait_surf.get_rect(midtop=(width // 2, row_y)))
+            row_y += line_height
+
+    # Draw Back Button
+    for button in game_state.buttons:
+        _draw_button(button)
 
     _draw_status_bar(width, height)
 
@@ -253,10 +307,13 @@ def draw_inventory_screen(width, height):
         title_rect = title_surf.get_rect(center=(width // 2, title_y))
         game_state.screen.blit(title_surf, title_rect)
 
+    _draw_search_field()
+
     # --- Draw Inventory Slots (Grid) ---
     if not game_state.inventory_display_rects:
-        if game_state.text_font: # Show a message if rects aren't ready
-             msg_surf = game_state.text_font.render("Calculating inventory layout...", True, constants.GRAY)
+        if game_state.text_font: # Show a message if rects aren't ready (or nothing matches the search)
+             message = "No matching items." if game_state.search_text else "Calculating inventory layout..."
+             msg_surf = game_state.text_font.render(message, True, constants.GRAY)
              msg_rect = msg_surf.get_rect(center=(width//2, height//2))
              game_state.screen.blit(msg_surf, msg_rect)
     else:
@@ -269,8 +326,8 @@ def draw_inventory_screen(width, height):
             pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1) # Border
 
             # Draw item stack if present
-            if 0 <= inv_index < len(game_state.inventory):
-                item_stack = game_state.inventory[inv_index]
+            if 0 <= inv_index < len(game_state.world.inventory):
+                item_stack = game_state.world.inventory[inv_index]
                 if item_stack:
                     _draw_item_stack(game_state.screen, item_stack, rect)
             # No need for error indicator if index is out of bounds, just draw empty
@@ -305,8 +362,8 @@ def draw_crafting_screen(width, height):
                         pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, rect)
                         pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1)
                         # Ensure grid data structure is also valid
-                        if r < len(game_state.crafting_grid) and c < len(game_state.crafting_grid[r]):
-                             item_stack = game_state.crafting_grid[r][c]
+                        if r < len(game_state.world.crafting_grid) and c < len(game_state.world.crafting_grid[r]):
+                             item_stack = game_state.world.crafting_grid[r][c]
                              if item_stack:
                                  _draw_item_stack(game_state.screen, item_stack, rect)
 
@@ -315,7 +372,7 @@ def draw_crafting_screen(width, height):
     if result_rect:
         pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, result_rect)
         pygame.draw.rect(game_state.screen, constants.BLACK, result_rect, 1)
-        result_stack = game_state.crafting_result_slot
+        result_stack = game_state.world.crafting_result_slot
         if result_stack:
             _draw_item_stack(game_state.screen, result_stack, result_rect)
 
@@ -339,7 +396,7 @@ def draw_crafting_screen(width, height):
                 pygame.draw.line(game_state.screen, constants.BLACK, (arrow_end_x, arrow_y), (arrow_end_x - 8, arrow_y - 5), 3)
                 pygame.draw.line(game_state.screen, constants.BLACK, (arrow_end_x, arrow_y), (arrow_end_x - 8, arrow_y + 5), 3)
         except (IndexError, AttributeError, TypeError) as e:
-             print(f"Warning: Could not draw crafting arrow - layout elements missing or invalid? {e}")
+             logger.warning(f"Could not draw crafting arrow - layout elements missing or invalid? {e}")
 
 
     # --- Draw Inventory Slots ---
@@ -362,8 +419,8 @@ def draw_crafting_screen(width, height):
             inv_index = slot_info["inv_index"]
             pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, rect)
             pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1)
-            if 0 <= inv_index < len(game_state.inventory):
-                item_stack = game_state.inventory[inv_index]
+            if 0 <= inv_index < len(game_state.world.inventory):
+                item_stack = game_state.world.inventory[inv_index]
                 if item_stack:
                     _draw_item_stack(game_state.screen, item_stack, rect)
 
@@ -375,10 +432,54 @@ def draw_crafting_screen(width, height):
     _draw_held_item() # Draw held item last
 
 
+def draw_storage_screen(width, height):
+    """Draws the storage chest screen: one page of the chest above the player inventory."""
+    game_state.screen.fill(constants.WHITE)
+    # Title
+    if game_state.title_font:
+        title_surf = game_state.title_font.render("Storage", True, constants.BLACK)
+        title_rect = title_surf.get_rect(center=(width // 2, int(height * 0.15)))
+        game_state.screen.blit(title_surf, title_rect)
+
+    # Chest slots carry their container in the slot info, inventory slots don't
+    chest_slots = [slot_info for slot_info in game_state.inventory_display_rects if slot_info.get("container") is not None]
+    inventory_slots = [slot_info for slot_info in game_state.inventory_display_rects if slot_info.get("container") is None]
+
+    # --- Grid Labels ---
+    if game_state.button_font:
+        container = chest_slots[0]["container"] if chest_slots else None
+        if container is not None:
+            chest_label = f"Chest {game_state.current_container + 1} - Page {game_state.storage_page + 1}/{container.page_count()}"
+            label_surf = game_state.button_font.render(chest_label, True, constants.BLACK)
+            game_state.screen.blit(label_surf, label_surf.get_rect(midbottom=(width // 2, chest_slots[0]["rect"].top - PADDING // 4)))
+        if inventory_slots:
+            label_surf = game_state.button_font.render("Inventory", True, constants.BLACK)
+            game_state.screen.blit(label_surf, label_surf.get_rect(midbottom=(width // 2, inventory_slots[0]["rect"].top - PADDING // 4)))
+
+    # --- Draw Slots ---
+    for slot_info in game_state.inventory_display_rects:
+        rect = slot_info["rect"]
+        inv_index = slot_info["inv_index"]
+        container = slot_info.get("container", game_state.world.inventory)
+        pygame.draw.rect(game_state.screen, constants.LIGHT_GRAY, rect)
+        pygame.draw.rect(game_state.screen, constants.BLACK, rect, 1)
+        if 0 <= inv_index < len(container):
+            item_stack = container[inv_index]
+            if item_stack:
+                _draw_item_stack(game_state.screen, item_stack, rect)
+
+    # Draw Buttons
+    for button in game_state.buttons:
+        _draw_button(button)
+
+    _draw_status_bar(width, height)
+    _draw_held_item() # Draw held item last
+
+
 def draw_error_screen(width, height):
     """Draws an error message screen."""
     game_state.screen.fill((255, 100, 100)) # Reddish background
-    error_text = game_state.status_message or "An unspecified error occurred."
+    error_text = game_state.error_message or "An unspecified error occurred."
     if game_state.title_font:
         error_surf = game_state.title_font.render("Error", True, constants.BLACK)
         error_rect = error_surf.get_rect(center=(width // 2, height // 3))
@@ -396,8 +497,8 @@ def draw_error_screen(width, height):
 
 def _draw_status_bar(width, height):
     """Draws the status message at the bottom."""
-    if game_state.status_message and game_state.text_font:
-        status_surf = game_state.text_font.render(game_state.status_message, True, constants.DARK_GREEN)
+    if game_state.world.status_message and game_state.text_font:
+        status_surf = game_state.text_font.render(game_state.world.status_message, True, constants.DARK_GREEN)
         # Position near bottom center, slightly above absolute bottom
         status_rect = status_surf.get_rect(center=(width // 2, height - STATUS_BAR_HEIGHT // 2 - PADDING // 4)) # Adjusted Y slightly
         game_state.screen.blit(status_surf, status_rect)
@@ -416,6 +517,7 @@ def draw_screen():
         constants.MINING_INPROGRESS: draw_mining_inprogress_screen,
         constants.INVENTORY_SCREEN: draw_inventory_screen,
         constants.CRAFTING_SCREEN: draw_crafting_screen,
+        constants.STORAGE_SCREEN: draw_storage_screen,
         constants.ERROR_STATE: draw_error_screen,
     }
 
@@ -443,7 +545,7 @@ def draw_screen():
             # Held item is drawn within specific screen functions (inventory, crafting) that need it
 
         except Exception as e:
-            print(f"ERROR drawing screen {game_state.current_screen}: {e}")
+            logger.error(f"Error drawing screen {game_state.current_screen}: {e}")
             # Attempt to draw a fallback error message directly
             try:
                  game_state.screen.fill(constants.BLACK)
@@ -452,7 +554,7 @@ def draw_screen():
                  err_rect = err_surf.get_rect(center=(width//2, height//2))
                  game_state.screen.blit(err_surf, err_rect)
             except Exception as fallback_e:
-                 print(f"FATAL: Error drawing fallback error screen: {fallback_e}")
+                 logger.error(f"Error drawing fallback error screen: {fallback_e}")
 
     else:
         # Fallback for unknown state
@@ -1,7 +1,11 @@
 # ui_manager/element_creator.py
+import logging
 import pygame
 import constants
 import game_state
+from .fonts import get_default_font
+
+logger = logging.getLogger(__name__)
 
 def add_button(rect, text, action, data=None, font=None, color=constants.GRAY):
     """Helper to create and add a button dictionary to game_state.buttons."""
@@ -9,14 +13,14 @@ def add_button(rect, text, action, data=None, font=None, color=constants.GRAY):
 
     # Ensure font is loaded before rendering
     if not font:
-        print(f"Warning: Font not loaded for button '{text}'. Using default from constants.")
-        font = constants.DEFAULT_FONT
+        logger.warning(f"Font not loaded for button '{text}'. Using default from constants.")
+        font = get_default_font()
         if not font:
-             print("Critical: constants.DEFAULT_FONT also failed. Using Pygame default.")
+             logger.error("The default font also failed. Using Pygame default.")
              font = pygame.font.Font(None, 30)
 
     if not font:
-        print(f"CRITICAL ERROR: Could not load any font for button '{text}'. Skipping button.")
+        logger.error(f"Could not load any font for button '{text}'. Skipping button.")
         return
 
     text_surf = font.render(text, True, constants.BLACK)
@@ -1,8 +1,25 @@
 # ui_manager/fonts.py
+import logging
 import pygame
 import constants
 import game_state
 
+logger = logging.getLogger(__name__)
+
+_default_font = None # Loaded by get_default_font()
+
+def get_default_font():
+    """Returns the fallback UI font (constants.FONT_PATH at DEFAULT_FONT_SIZE), loading it on first use."""
+    global _default_font
+    if _default_font is None:
+        try:
+            _default_font = pygame.font.Font(constants.FONT_PATH, constants.DEFAULT_FONT_SIZE)
+        except pygame.error as e:
+            logger.error(f"Error loading font '{constants.FONT_PATH}': {e}")
+            # Fallback to default pygame font if custom font fails
+            _default_font = pygame.font.Font(None, constants.DEFAULT_FONT_SIZE)
+    return _default_font
+
 def initialize_fonts():
     """Initializes fonts using the custom font path and stores them in game_state."""
     # Use default sizes initially, update_layout will resize them
@@ -13,9 +30,9 @@ def initialize_fonts():
         game_state.small_button_font = pygame.font.Font(constants.FONT_PATH, 24)
         game_state.text_font = pygame.font.Font(constants.FONT_PATH, 24)
         game_state.copyright_font = pygame.font.Font(constants.FONT_PATH, 18)
-        print("Custom fonts initialized.")
+        logger.info("Custom fonts initialized.")
     except pygame.error as e:
-        print(f"Error loading custom font '{constants.FONT_PATH}': {e}. Using Pygame default.")
+        logger.error(f"Error loading custom font '{constants.FONT_PATH}': {e}. Using Pygame default.")
         # Fallback to pygame default font if custom font fails
         game_state.title_font = pygame.font.Font(None, 36)
         game_state.button_font = pygame.font.Font(None, 30)
@@ -39,7 +56,7 @@ def resize_fonts(width, height):
         game_state.text_font = pygame.font.Font(constants.FONT_PATH, text_font_size)
         game_state.copyright_font = pygame.font.Font(constants.FONT_PATH, copyright_font_size)
     except pygame.error as e:
-        print(f"Error resizing custom font '{constants.FONT_PATH}': {e}. Using previous sizes or Pygame default.")
+        logger.error(f"Error resizing custom font '{constants.FONT_PATH}': {e}. Using previous sizes or Pygame default.")
         # Keep existing fonts if resizing fails, or fallback if they don't exist yet
         if not game_state.title_font: game_state.title_font = pygame.font.Font(None, title_font_size)
         if not game_state.button_font: game_state.button_font = pygame.font.Font(None, button_font_size)
@@ -1,8 +1,15 @@
 # ui_manager/layout_calculator.py
+import logging
 import pygame
 import constants # Use constants module
 import game_state
 import save_manager # Needed for checking world slots
+import inventory_store # Needed for item counts on buttons
+import item_search # Needed for filtering slots/buttons by the search box
+import storage # Needed for the storage chest pages
+from .fonts import get_default_font # Fallback when the UI fonts are not loaded yet
+
+logger = logging.getLogger(__name__)
 
 # --- Constants ---
 PADDING = 20
@@ -12,8 +19,10 @@ BUTTON_WIDTH_SMALL = 150
 # GRID_SLOT_SIZE = 50 # Removed - Use constants.GRID_SLOT_SIZE
 # GRID_SPACING = 10 # Removed - Use constants.GRID_SPACING
 INVENTORY_COLS = 9
-# Recalculate INVENTORY_ROWS based on MAX_INVENTORY_SLOTS
-INVENTORY_ROWS = (game_state.MAX_INVENTORY_SLOTS + INVENTORY_COLS - 1) // INVENTORY_COLS
+
+def _grid_rows(slot_count):
+    """Number of INVENTORY_COLS wide rows needed to show 'slot_count' slots."""
+    return (slot_count + INVENTORY_COLS - 1) // INVENTORY_COLS
 
 # --- Button Creation Helper ---
 def _add_button(rect, text, action, data=None, font=None, color=constants.GRAY):
@@ -21,9 +30,8 @@ def _add_button(rect, text, action, data=None, font=None, color=constants.GRAY):
     font = font or game_state.button_font # Use font from game_state
 
     if not font:
-        print(f"Warning: Font not loaded for button '{text}'. Using default.")
-        # Use constants.DEFAULT_FONT if available, else pygame default
-        font = constants.DEFAULT_FONT if constants.DEFAULT_FONT else pygame.font.Font(None, 24)
+        logger.warning(f"Font not loaded for button '{text}'. Using default.")
+        font = get_default_font()
 
     text_surf = font.render(text, True, constants.BLACK)
     # Simple pressed color calculation
@@ -59,6 +67,7 @@ def update_layout(width, height):
     game_state.crafting_grid_rects = [[None for _ in range(game_state.CRAFTING_GRID_SIZE)] for _ in range(game_state.CRAFTING_GRID_SIZE)]
     game_state.crafting_result_rect = None
     game_state.input_field_rect = None # Reset input field rect
+    game_state.search_field_rect = None # Reset search box rect
 
     # --- Common Elements ---
     dynamic_padding = max(10, int(height * 0.02))
@@ -67,6 +76,10 @@ def update_layout(width, height):
     title_area_top_margin = int(height * 0.05) # Space above title
     title_area_bottom_margin = int(height * 0.18) # Estimated bottom Y coordinate of title area
 
+    # Search box size (used on searchable screens)
+    search_field_width = max(200, int(width * 0.35))
+    search_field_height = max(30, int(height * 0.05))
+
     # Back Button (Bottom Left) - Defined here for reuse
     back_button_rect = pygame.Rect(
         dynamic_padding,
@@ -102,8 +115,8 @@ def update_layout(width, height):
 
 
     elif game_state.current_screen == constants.MAIN_MENU:
-        button_texts = ["Mine Blocks", "View Inventory", "Craft Items", "Save and Exit"]
-        button_actions = ["goto_mining", "goto_inventory", "goto_crafting", "save_and_exit_to_select"]
+        button_texts = ["Mine Blocks", "View Inventory", "Craft Items", "Open Storage", "Save and Exit"]
+        button_actions = ["goto_mining", "goto_inventory", "goto_crafting", "goto_storage", "save_and_exit_to_select"]
         num_buttons = len(button_texts)
 
         button_width = int(width * 0.5)
@@ -121,18 +134,26 @@ def update_layout(width, height):
 
     elif game_state.current_screen == constants.MINING_MENU:
         mineable_ids = sorted([item_id for item_id in game_state.mine_list if item_id != 0], key=lambda id: game_state.mine_list[id]) # Sort by name
+        # Narrow the list to blocks matching the search box
+        search_matches = item_search.active_filter()
+        if search_matches is not None:
+            mineable_ids = [item_id for item_id in mineable_ids if item_id in search_matches]
         num_buttons = len(mineable_ids)
 
+        # Search box just below the title area, buttons go below the search box
+        game_state.search_field_rect = pygame.Rect(width // 2 - search_field_width // 2, title_area_bottom_margin, search_field_width, search_field_height)
+        buttons_area_top = game_state.search_field_rect.bottom + dynamic_padding
+
         button_width = int(width * 0.5) # Consistent width like main menu
         button_height = max(40, int(height * 0.07)) # Slightly smaller buttons maybe
         total_buttons_height = num_buttons * button_height + (num_buttons - 1) * dynamic_padding
 
         # Calculate vertical starting position, considering space for title and back button
-        # Use title_area_bottom_margin defined earlier
+        # Use buttons_area_top (below title and search box)
         back_button_area_height = dynamic_button_height_small + dynamic_padding * 2
-        available_height = height - title_area_bottom_margin - back_button_area_height
-        start_y = title_area_bottom_margin + (available_height - total_buttons_height) // 2
-        start_y = max(start_y, title_area_bottom_margin + dynamic_padding) # Ensure padding below title
+        available_height = height - buttons_area_top - back_button_area_height
+        start_y = buttons_area_top + (available_height - total_buttons_height) // 2
+        start_y = max(start_y, buttons_area_top + dynamic_padding) # Ensure padding below search box
 
         button_x = width // 2 - button_width // 2
 
@@ -142,16 +163,23 @@ def update_layout(width, height):
 
             # Optional: Add check if buttons go off bottom of screen
             if button_top_y + button_height > height - back_button_area_height:
-                 print("Warning: Not enough space for all mining buttons vertically.")
+                 logger.warning("Not enough space for all mining buttons vertically.")
                  # Could add scroll logic here later
                  break
 
             rect = pygame.Rect(button_x, button_top_y, button_width, button_height)
-            _add_button(rect, item_name, "select_block", data=item_id, font=game_state.button_font) # Use standard button font
+            owned = inventory_store.item_count(game_state.world.inventory, item_id) # Running total, no inventory scan
+            button_text = f"{item_name} ({owned})" if owned else item_name
+            _add_button(rect, button_text, "select_block", data=item_id, font=game_state.button_font) # Use standard button font
 
         # Add Back button (using the common rect)
         _add_button(back_button_rect, "Back", "goto_main", font=game_state.small_button_font)
 
+        # Mining jobs overview (Bottom Right)
+        jobs_button_rect = back_button_rect.copy()
+        jobs_button_rect.right = width - dynamic_padding
+        _add_button(jobs_button_rect, "Mining Jobs", "goto_mining_jobs", font=game_state.small_button_font)
+
 
     elif game_state.current_screen == constants.ASK_QUANTITY:
         # Keep this layout simple, less likely to overlap
@@ -175,22 +203,37 @@ def update_layout(width, height):
 
 
     elif game_state.current_screen == constants.MINING_INPROGRESS:
-        pass # No buttons
+        # Job rows are drawn from the live job list, only the Back button is laid out here
+        _add_button(back_button_rect, "Back", "goto_mining", font=game_state.small_button_font)
 
 
     elif game_state.current_screen == constants.INVENTORY_SCREEN:
         # Use constants for slot size and spacing
         slot_size = constants.GRID_SLOT_SIZE
         spacing = constants.GRID_SPACING
+        inventory_rows = _grid_rows(game_state.MAX_INVENTORY_SLOTS)
         inv_grid_width = INVENTORY_COLS * slot_size + max(0, INVENTORY_COLS - 1) * spacing
-        inv_grid_height = INVENTORY_ROWS * slot_size + max(0, INVENTORY_ROWS - 1) * spacing
+        inv_grid_height = inventory_rows * slot_size + max(0, inventory_rows - 1) * spacing
         inv_start_x = (width - inv_grid_width) // 2
-        # Adjust start_y to be below title area
-        inv_start_y = max(title_area_bottom_margin + dynamic_padding * 2, height // 2 - inv_grid_height // 2)
+        # Adjust start_y to be below title area and the search box
+        inv_start_y = max(title_area_bottom_margin + search_field_height + dynamic_padding * 2, height // 2 - inv_grid_height // 2)
 
-        for i in range(game_state.MAX_INVENTORY_SLOTS):
-            row = i // INVENTORY_COLS
-            col = i % INVENTORY_COLS
+        # Search box above the grid
+        game_state.search_field_rect = pygame.Rect(width // 2 - search_field_width // 2, inv_start_y - search_field_height - dynamic_padding, search_field_width, search_field_height)
+
+        # While searching, only matching slots are shown (packed into the grid in slot order)
+        search_matches = item_search.active_filter()
+        if search_matches is None:
+            visible_indexes = range(game_state.MAX_INVENTORY_SLOTS)
+        else:
+            visible_indexes = [
+                i for i in range(min(game_state.MAX_INVENTORY_SLOTS, len(game_state.world.inventory)))
+                if game_state.world.inventory[i] is not None and game_state.world.inventory[i].item_id in search_matches
+            ]
+
+        for position, i in enumerate(visible_indexes):
+            row = position // INVENTORY_COLS
+            col = position % INVENTORY_COLS
             slot_x = inv_start_x + col * (slot_size + spacing)
             slot_y = inv_start_y + row * (slot_size + spacing)
             slot_rect = pygame.Rect(slot_x, slot_y, slot_size, slot_size)
@@ -199,6 +242,14 @@ def update_layout(width, height):
         # Add Back button
         _add_button(back_button_rect, "Back", "goto_main", font=game_state.small_button_font)
 
+        # Sort buttons (Bottom Right): "Sort" compacts/sorts, the other cycles the sort key
+        sort_button_rect = back_button_rect.copy()
+        sort_button_rect.right = width - dynamic_padding
+        _add_button(sort_button_rect, "Sort", "sort_inventory", font=game_state.small_button_font)
+        sort_key_rect = back_button_rect.copy()
+        sort_key_rect.right = sort_button_rect.left - dynamic_padding
+        _add_button(sort_key_rect, f"By: {game_state.inventory_sort_key.title()}", "cycle_sort_key", font=game_state.small_button_font)
+
 
     elif game_state.current_screen == constants.CRAFTING_SCREEN:
         grid_size = game_state.CRAFTING_GRID_SIZE
@@ -226,8 +277,9 @@ def update_layout(width, height):
         game_state.crafting_result_rect = pygame.Rect(result_x, result_y, slot_size, slot_size)
 
         # Inventory layout below crafting area
+        inventory_rows = _grid_rows(game_state.MAX_INVENTORY_SLOTS)
         inv_grid_width = INVENTORY_COLS * slot_size + max(0, INVENTORY_COLS - 1) * spacing
-        inv_grid_height = INVENTORY_ROWS * slot_size + max(0, INVENTORY_ROWS - 1) * spacing
+        inv_grid_height = inventory_rows * slot_size + max(0, inventory_rows - 1) * spacing
         inv_start_x = (width - inv_grid_width) // 2
         # Position inventory below crafting grid/result, leaving space
         inv_start_y = craft_grid_start_y + (grid_size * slot_size + (grid_size - 1) * spacing) + dynamic_padding * 3
@@ -247,6 +299,54 @@ def update_layout(width, height):
         _add_button(back_button_rect, "Back", "goto_main", font=game_state.small_button_font)
 
 
+    elif game_state.current_screen == constants.STORAGE_SCREEN:
+        # One page of the current chest on top, the player inventory below it
+        container = storage.current_container()
+        storage_slots = container.page_range(game_state.storage_page) if container else range(0)
+        storage_rows = _grid_rows(constants.STORAGE_PAGE_SLOTS)
+        inventory_rows = _grid_rows(game_state.MAX_INVENTORY_SLOTS)
+        spacing = constants.GRID_SPACING
+        label_height = dynamic_padding * 2 # Room for the "Chest"/"Inventory" labels above each grid
+
+        # Shrink the slots if both grids don't fit between the title and the bottom buttons
+        grids_top = title_area_bottom_margin + label_height + dynamic_padding
+        grids_bottom = back_button_rect.top - dynamic_padding
+        available_height = grids_bottom - grids_top - label_height - dynamic_padding
+        slot_pitch = min(constants.GRID_SLOT_SIZE + spacing, available_height // (storage_rows + inventory_rows))
+        slot_size = max(16, slot_pitch - spacing)
+
+        grid_width = INVENTORY_COLS * slot_size + (INVENTORY_COLS - 1) * spacing
+        grid_start_x = (width - grid_width) // 2
+
+        for position, i in enumerate(storage_slots):
+            row = position // INVENTORY_COLS
+            col = position % INVENTORY_COLS
+            slot_rect = pygame.Rect(grid_start_x + col * (slot_size + spacing), grids_top + row * (slot_size + spacing), slot_size, slot_size)
+            game_state.inventory_display_rects.append({"rect": slot_rect, "inv_index": i, "container": container})
+
+        inv_start_y = grids_top + storage_rows * (slot_size + spacing) + label_height + dynamic_padding
+        for i in range(game_state.MAX_INVENTORY_SLOTS):
+            row = i // INVENTORY_COLS
+            col = i % INVENTORY_COLS
+            slot_rect = pygame.Rect(grid_start_x + col * (slot_size + spacing), inv_start_y + row * (slot_size + spacing), slot_size, slot_size)
+            game_state.inventory_display_rects.append({"rect": slot_rect, "inv_index": i})
+
+        # Bottom row: Back | < Prev | Next > ... Chest N | Store All
+        _add_button(back_button_rect, "Back", "goto_main", font=game_state.small_button_font)
+        prev_rect = back_button_rect.copy()
+        prev_rect.left = back_button_rect.right + dynamic_padding
+        _add_button(prev_rect, "< Prev", "storage_prev_page", font=game_state.small_button_font)
+        next_rect = back_button_rect.copy()
+        next_rect.left = prev_rect.right + dynamic_padding
+        _add_button(next_rect, "Next >", "storage_next_page", font=game_state.small_button_font)
+        store_all_rect = back_button_rect.copy()
+        store_all_rect.right = width - dynamic_padding
+        _add_button(store_all_rect, "Store All", "storage_store_all", font=game_state.small_button_font)
+        chest_rect = back_button_rect.copy()
+        chest_rect.right = store_all_rect.left - dynamic_padding
+        _add_button(chest_rect, f"Chest {game_state.current_container + 1}", "cycle_container", font=game_state.small_button_font)
+
+
     elif game_state.current_screen == constants.ERROR_STATE:
         # Only a Quit button, centered
         button_width = int(width * 0.4)
@@ -271,5 +371,5 @@ def update_layout(width, height):
     except ImportError:
         pass # Already warned during initial load if failed
     except Exception as e:
-        print(f"Error recreating title/copyright surfaces during layout update: {e}")
+        logger.error(f"Error recreating title/copyright surfaces during layout update: {e}")
 
@@ -0,0 +1,38 @@
+# world.py
+# Everything that belongs to one loaded world: the player's inventory, storage chests,
+# crafting grid, held item, mining jobs, equipped tool, the last status message, the
+# blocks left to mine (resource map) and the undo/redo history of slot changes.
+#
+# game_logic, storage and save_manager functions take an optional 'world' argument and
+# work on game_state.world (the world shown on screen) when it is not given, so one
+# process can keep several independent World objects (headless simulations, tests).
+# Shared, read-only game data (items, recipes, mining times) stays in game_state.
+import game_state
+import inventory_store
+import mining_jobs
+import transactions
+
+
+class World:
+    """State of one world (save slot). world_id is None for a world that is not loaded from a slot."""
+    def __init__(self, world_id=None):
+        self.world_id = world_id
+        self.inventory = inventory_store.create_inventory()
+        self.storage_containers = [] # storage.StorageContainer objects, created by save_manager.load_game
+        self.crafting_grid = [[None for _ in range(game_state.CRAFTING_GRID_SIZE)] for _ in range(game_state.CRAFTING_GRID_SIZE)]
+        self.crafting_result_slot = None # Holds the resulting ItemStack or None
+        self.held_item = None # ItemStack being dragged by the mouse, or None
+        self.held_slot = transactions.HeldSlot(self) # held_item as a slot for transaction journals
+        self.history = transactions.History() # Undo/Redo steps of this world
+        self.mining_jobs = mining_jobs.MiningQueue()
+        self.equipped_tool_name = None # Key into tool_stats of the tool used for mining, or None for bare hands
+        self.status_message = "" # For displaying info like "Mined X blocks" or errors
+        self.resource_map = None # resource_map.ResourceMap of a saved world, None = unlimited blocks
+
+    def clear_crafting(self):
+        """Empties the crafting grid and result slot (items in them are discarded)."""
+        self.crafting_grid = [[None for _ in range(game_state.CRAFTING_GRID_SIZE)] for _ in range(game_state.CRAFTING_GRID_SIZE)]
+        self.crafting_result_slot = None
+
+    def __repr__(self) -> str:
+        return f"World(id={self.world_id}, jobs={self.mining_jobs.job_count()})"